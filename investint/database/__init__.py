@@ -2,9 +2,15 @@
 This package provides global objects and functions related
 to the usage of SQLAlchemy, such as:
 - functions for engine creation and inspection;
+- functions for creating the database schema;
+- a means to tune SQLite databases for importing;
+- an in-memory database to stage rows before writing them at once;
 - a `Session` that can be used to perform database queries;
 - a `mapper_registry` which may be used to create models.
 """
 
 from investint.database.session import *
-from investint.database.engine  import *
\ No newline at end of file
+from investint.database.engine  import *
+from investint.database.schema  import *
+from investint.database.sqlite  import *
+from investint.database.staging import *
\ No newline at end of file
@@ -0,0 +1,48 @@
+import sqlalchemy as sa
+from investint.database.session import metadata
+
+__all__ = [
+    'createSchema',
+    'createColumns',
+    'createIndexes'
+]
+
+def createSchema(engine: sa.engine.Engine) -> None:
+    """Creates the tables, columns, and indexes of `metadata` that don't exist in `engine`.
+
+    Unlike `metadata.create_all()`, which only creates columns and indexes
+    along with their tables, this also creates columns and indexes missing
+    from existing tables, such as those added to `metadata` after a database
+    was created.
+    """
+
+    metadata.create_all(engine)
+    createColumns(engine)
+    createIndexes(engine)
+
+def createColumns(engine: sa.engine.Engine) -> None:
+    """Adds the columns of `metadata` that don't exist in tables of `engine`.
+
+    Columns are added by `ALTER TABLE ... ADD COLUMN`, so existing rows have
+    them null, and thus columns added to `metadata` after tables were created
+    must be nullable.
+    """
+
+    with engine.begin() as conn:
+        inspector = sa.inspect(conn)
+
+        for table in metadata.sorted_tables:
+            column_names = {column['name'] for column in inspector.get_columns(table.name)}
+
+            for column in table.columns:
+                if column.name not in column_names:
+                    column_ddl = sa.schema.CreateColumn(column).compile(dialect=conn.dialect)
+                    conn.execute(sa.text(f'ALTER TABLE {conn.dialect.identifier_preparer.format_table(table)} ADD COLUMN {column_ddl}'))
+
+def createIndexes(engine: sa.engine.Engine) -> None:
+    """Creates the indexes of `metadata` that don't exist in `engine`."""
+
+    with engine.begin() as conn:
+        for table in metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
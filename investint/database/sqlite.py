@@ -0,0 +1,156 @@
+import typing
+import sqlalchemy as sa
+from investint.database.engine  import createEngineFromUrl, isFileEngine
+from investint.database.session import metadata
+
+__all__ = [
+    'backupDatabase',
+    'SqliteFastImport'
+]
+
+def backupDatabase(src_engine: sa.engine.Engine, dst_engine: sa.engine.Engine) -> None:
+    """Replaces the contents of the SQLite database of `dst_engine`
+    by a copy of the SQLite database of `src_engine`.
+
+    The copy is made page by page by the backup API of SQLite, which
+    is much faster than copying rows. Note that no connection of either
+    engine should be in a transaction while this function is called.
+    """
+
+    src_conn = src_engine.raw_connection()
+
+    try:
+        dst_conn = dst_engine.raw_connection()
+
+        try:
+            src_conn.backup(dst_conn.connection)
+        finally:
+            dst_conn.close()
+    finally:
+        src_conn.close()
+
+class SqliteFastImport:
+    """Tunes a SQLite file database for writing many rows at once.
+
+    Upon `start()`, an engine of its own is created for the database of
+    `engine`, which is returned by `engine()` and should be used to write
+    to the database. Every connection opened by that engine is set to
+    synchronous mode NORMAL, a page cache of `cache_size` KiB, and temporary
+    storage in memory. Thus, commits don't wait for data to be written to
+    disk, although a commit may be lost, but not corrupt the database, if
+    the computer crashes. Other connections to the database, such as those
+    of `engine` itself, keep their settings. The journal mode of the database
+    is set to WAL, though, which applies to every connection to the database.
+
+    Also, the indexes of `metadata` are dropped on tables that are empty,
+    since building an index once after rows are written is faster than
+    updating it for each row written. Tables that already have rows keep
+    their indexes, as rows are looked up by them while importing, so no
+    index is dropped when importing into a database that is not new.
+
+    Upon `stop()`, the dropped indexes are created again, the engine of
+    `self` is disposed of, and the previous journal mode is restored,
+    unless another connection is using the database, in which case the
+    database remains in WAL mode and `stop()` returns `False`.
+
+    Nothing is done if `engine` is not associated with a SQLite file.
+    """
+
+    def __init__(self, engine: sa.engine.Engine, cache_size: int = 256 * 1024) -> None:
+        self._engine          = engine
+        self._fast_engine     = None
+        self._cache_size      = cache_size
+        self._journal_mode    = None
+        self._dropped_indexes: typing.List[sa.Index] = []
+
+    def isStarted(self) -> bool:
+        return self._fast_engine is not None
+
+    def engine(self) -> sa.engine.Engine:
+        """Returns the engine tuned for importing if `isStarted()` is `True`,
+        or the engine given upon construction otherwise.
+        """
+
+        return self._engine if self._fast_engine is None else self._fast_engine
+
+    def journalMode(self) -> typing.Optional[str]:
+        """Returns the journal mode the database had before `start()`, or `None` if it was not called."""
+
+        return self._journal_mode
+
+    def droppedIndexes(self) -> typing.List[sa.Index]:
+        """Returns the indexes dropped by `start()` that were not created again yet."""
+
+        return self._dropped_indexes.copy()
+
+    def start(self) -> None:
+        """Creates the engine tuned for importing into the database of `engine`.
+
+        This should be called while no connection is in a transaction on the database.
+        """
+
+        if self.isStarted() or not isFileEngine(self._engine):
+            return
+
+        fast_engine      = createEngineFromUrl(self._engine.url)
+        fast_engine.echo = self._engine.echo
+
+        sa.event.listen(fast_engine, 'connect', self._onConnect)
+
+        with fast_engine.connect() as conn:
+            self._journal_mode = conn.exec_driver_sql('PRAGMA journal_mode').scalar()
+
+            conn.exec_driver_sql('PRAGMA journal_mode = WAL')
+
+        self._fast_engine = fast_engine
+
+        with fast_engine.begin() as conn:
+            for table in metadata.sorted_tables:
+                if len(table.indexes) == 0 or not sa.inspect(conn).has_table(table.name):
+                    continue
+
+                if conn.execute(sa.select(sa.literal(1)).select_from(table).limit(1)).first() is not None:
+                    continue
+
+                for index in table.indexes:
+                    index.drop(conn, checkfirst=True)
+                    self._dropped_indexes.append(index)
+
+    def stop(self) -> bool:
+        """Creates the indexes dropped by `start()` and restores the journal mode of the database.
+
+        Returns `False` if the journal mode could not be restored because
+        another connection is using the database, and `True` otherwise.
+        """
+
+        if not self.isStarted():
+            return True
+
+        try:
+            with self._fast_engine.begin() as conn:
+                for index in self._dropped_indexes:
+                    index.create(conn, checkfirst=True)
+
+            self._dropped_indexes.clear()
+        finally:
+            try:
+                with self._fast_engine.connect() as conn:
+                    conn.exec_driver_sql(f'PRAGMA journal_mode = {self._journal_mode}')
+
+                    # SQLite doesn't raise an error if the journal mode can't be changed.
+                    is_restored = conn.exec_driver_sql('PRAGMA journal_mode').scalar() == self._journal_mode
+            except sa.exc.OperationalError:
+                # The journal mode can't be changed while another connection is using the database.
+                is_restored = False
+
+            self._fast_engine.dispose()
+            self._fast_engine = None
+
+        return is_restored
+
+    def _onConnect(self, dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA synchronous = NORMAL')
+        cursor.execute(f'PRAGMA cache_size = {-self._cache_size}')
+        cursor.execute('PRAGMA temp_store = MEMORY')
+        cursor.close()
\ No newline at end of file
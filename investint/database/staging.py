@@ -0,0 +1,324 @@
+import typing
+import sqlalchemy as sa
+from investint.database.engine  import createEngineInMemory, isSqliteEngine
+from investint.database.session import metadata
+from investint.database.sqlite  import backupDatabase
+
+__all__ = [
+    'StagingDatabase'
+]
+
+Replacer = typing.Callable[[sa.engine.Connection, sa.engine.Connection], None]
+
+class StagingDatabase:
+    """Holds rows in an in-memory SQLite database to be written to another database at once.
+
+    The class `StagingDatabase` creates the tables of `metadata` in a new
+    in-memory database, `engine()`, to which rows may be written as if it
+    were the target database. Then, `writeTo()` writes all rows of `engine()`
+    to a target database in a single transaction, so that the target is
+    locked, and its indexes and journal updated, only once.
+
+    Rows are written as follows:
+    - Tables whose primary key is generated, such as `statement`, have
+      their primary keys shifted past the greatest primary key found in
+      the target, and so do the foreign keys that reference them.
+    - Foreign keys to tables that have no rows in `engine()` are assumed
+      to reference rows of the target, and are written as is.
+    - Rows of other tables, such as `document`, replace the rows of the
+      target with the same primary key, along with the rows that depend
+      on them through foreign keys, such as its statements and accounts,
+      unless the rows replaced are deleted by the caller of `writeTo()`.
+
+    Thus, no other connection should write to the target while `writeTo()`
+    is writing to it.
+    """
+
+    chunk_size = 500
+
+    def __init__(self) -> None:
+        self._engine = createEngineInMemory()
+
+        metadata.create_all(self._engine)
+
+    def engine(self) -> sa.engine.Engine:
+        return self._engine
+
+    def rowCount(self) -> int:
+        """Returns the number of rows in `engine()`."""
+
+        with self._engine.connect() as conn:
+            return sum(self._rowCount(conn, table) for table in metadata.sorted_tables)
+
+    def writeTo(self, engine: sa.engine.Engine, replace: typing.Optional[Replacer] = None) -> int:
+        """Writes all rows of `engine()` to the database of `engine` and returns the number of rows written.
+
+        If `replace` is not `None`, rows of the target with the same primary
+        key as rows of `engine()`, such as documents, are updated rather than
+        replaced along with the rows that depend on them. Instead, `replace`
+        is called with connections to `engine()` and to the target, in the
+        transaction in which rows are written, to delete whichever rows of
+        the target are replaced, such as only some statements of a document.
+
+        If the database of `engine` is a SQLite database with no rows, it
+        is replaced by a copy of `engine()` made by `backupDatabase()`.
+        """
+
+        if isSqliteEngine(engine) and self._isEmpty(engine):
+            backupDatabase(self._engine, engine)
+            return self.rowCount()
+
+        row_count = 0
+
+        with self._engine.connect() as src_conn, engine.begin() as dst_conn:
+            tables  = [table for table in metadata.sorted_tables if self._rowCount(src_conn, table) != 0]
+            offsets = self._keyOffsets(src_conn, dst_conn, tables)
+
+            if replace is None:
+                for table in tables:
+                    if table not in offsets:
+                        self._deleteReplacedRows(src_conn, dst_conn, table)
+            else:
+                replace(src_conn, dst_conn)
+
+            for table in tables:
+                if replace is not None and table not in offsets and self._replacedKey(table) is not None:
+                    row_count += self._upsertRows(src_conn, dst_conn, table, offsets)
+                else:
+                    row_count += self._copyRows(src_conn, dst_conn, table, offsets)
+
+            if dst_conn.dialect.name == 'postgresql':
+                self._syncSequences(dst_conn, offsets.keys())
+
+        return row_count
+
+    def dispose(self) -> None:
+        """Discards all rows of `engine()`."""
+
+        self._engine.dispose()
+
+    ################################################################################
+    # Private methods
+    ################################################################################
+    def _rowCount(self, conn: sa.engine.Connection, table: sa.Table) -> int:
+        return conn.execute(sa.select(sa.func.count()).select_from(table)).scalar()
+
+    def _isEmpty(self, engine: sa.engine.Engine) -> bool:
+        with engine.connect() as conn:
+            for table in metadata.sorted_tables:
+                if not sa.inspect(conn).has_table(table.name):
+                    return False
+
+                if conn.execute(sa.select(sa.literal(1)).select_from(table).limit(1)).first() is not None:
+                    return False
+
+        return True
+
+    def _generatedKey(self, table: sa.Table) -> typing.Optional[sa.Column]:
+        columns = list(table.primary_key.columns)
+
+        if len(columns) != 1:
+            return None
+
+        column = columns[0]
+
+        if column.autoincrement is False or len(column.foreign_keys) != 0 or not isinstance(column.type, sa.Integer):
+            return None
+
+        return column
+
+    def _keyOffsets(self,
+                    src_conn: sa.engine.Connection,
+                    dst_conn: sa.engine.Connection,
+                    tables: typing.List[sa.Table]
+    ) -> typing.Dict[sa.Table, int]:
+        """Returns how much the generated primary keys of each table in
+        `tables` must be shifted so as not to collide with those of the target.
+        """
+
+        offsets = {}
+
+        for table in tables:
+            column = self._generatedKey(table)
+
+            if column is not None:
+                src_min = src_conn.execute(sa.select(sa.func.min(column))).scalar()
+                dst_max = dst_conn.execute(sa.select(sa.func.coalesce(sa.func.max(column), 0))).scalar()
+
+                offsets[table] = dst_max - src_min + 1
+
+        return offsets
+
+    def _columnOffsets(self, table: sa.Table, offsets: typing.Dict[sa.Table, int]) -> typing.Dict[str, int]:
+        column_offsets = {}
+
+        for column in table.columns:
+            if column.primary_key and table in offsets:
+                column_offsets[column.key] = offsets[table]
+                continue
+
+            # Follow foreign keys up to the table that generates the key,
+            # as in `account.id` -> `base_account.id` -> generated.
+            referenced = column
+
+            while len(referenced.foreign_keys) == 1:
+                referenced = next(iter(referenced.foreign_keys)).column
+
+                if referenced.table in offsets:
+                    column_offsets[column.key] = offsets[referenced.table]
+                    break
+
+        return column_offsets
+
+    def _copyRows(self,
+                  src_conn: sa.engine.Connection,
+                  dst_conn: sa.engine.Connection,
+                  table: sa.Table,
+                  offsets: typing.Dict[sa.Table, int]
+    ) -> int:
+        column_offsets = self._columnOffsets(table, offsets)
+
+        if isSqliteEngine(dst_conn.engine):
+            return self._copyStoredRows(src_conn, dst_conn, table, column_offsets)
+
+        row_count = 0
+        result    = src_conn.execute(sa.select(table))
+
+        for rows in result.mappings().partitions(self.chunk_size):
+            rows = [dict(row) for row in rows]
+
+            for row in rows:
+                for key, offset in column_offsets.items():
+                    if row[key] is not None:
+                        row[key] += offset
+
+            dst_conn.execute(table.insert(), rows)
+            row_count += len(rows)
+
+        return row_count
+
+    def _copyStoredRows(self,
+                        src_conn: sa.engine.Connection,
+                        dst_conn: sa.engine.Connection,
+                        table: sa.Table,
+                        column_offsets: typing.Dict[str, int]
+    ) -> int:
+        # Both databases are SQLite, so values are copied as they're stored,
+        # with keys shifted by SQLite itself, rather than being converted to
+        # Python types and back by SQLAlchemy, which is several times slower.
+        quote   = dst_conn.dialect.identifier_preparer.quote
+        columns = list(table.columns)
+        names   = [quote(column.name) for column in columns]
+
+        selected = [
+            f'{name} + {column_offsets[column.key]}' if column.key in column_offsets else name
+            for name, column in zip(names, columns)
+        ]
+
+        select_sql = f'SELECT {", ".join(selected)} FROM {quote(table.name)}'
+        insert_sql = f'INSERT INTO {quote(table.name)} ({", ".join(names)}) VALUES ({", ".join("?" * len(names))})'
+
+        row_count = 0
+        cursor    = src_conn.connection.cursor()
+
+        try:
+            cursor.execute(select_sql)
+
+            while True:
+                rows = cursor.fetchmany(self.chunk_size)
+
+                if len(rows) == 0:
+                    break
+
+                dst_conn.exec_driver_sql(insert_sql, rows)
+                row_count += len(rows)
+        finally:
+            cursor.close()
+
+        return row_count
+
+    def _replacedKey(self, table: sa.Table) -> typing.Optional[sa.Column]:
+        """Returns the primary key by which rows of `table` replace those of the target, if any."""
+
+        pk_columns = list(table.primary_key.columns)
+
+        if len(pk_columns) != 1:
+            return None
+
+        column = pk_columns[0]
+
+        if len(column.foreign_keys) != 0:
+            # The key is that of the row referenced, as in `account`, so it's not replaced on its own.
+            return None
+
+        return column
+
+    def _upsertRows(self,
+                    src_conn: sa.engine.Connection,
+                    dst_conn: sa.engine.Connection,
+                    table: sa.Table,
+                    offsets: typing.Dict[sa.Table, int]
+    ) -> int:
+        """Updates the rows of the target with the same primary key as rows of `table`, and inserts the other rows."""
+
+        column         = self._replacedKey(table)
+        column_offsets = self._columnOffsets(table, offsets)
+        row_count      = 0
+        result         = src_conn.execute(sa.select(table))
+
+        for rows in result.mappings().partitions(self.chunk_size):
+            rows = [dict(row) for row in rows]
+
+            for row in rows:
+                for key, offset in column_offsets.items():
+                    if row[key] is not None:
+                        row[key] += offset
+
+            existing_keys = set(dst_conn.execute(sa.select(column).where(column.in_([row[column.key] for row in rows]))).scalars())
+            updated_rows  = [{**row, '_key': row[column.key]} for row in rows if row[column.key] in existing_keys]
+            inserted_rows = [row for row in rows if row[column.key] not in existing_keys]
+
+            if len(updated_rows) != 0:
+                dst_conn.execute(table.update().where(column == sa.bindparam('_key')), updated_rows)
+
+            if len(inserted_rows) != 0:
+                dst_conn.execute(table.insert(), inserted_rows)
+
+            row_count += len(rows)
+
+        return row_count
+
+    def _deleteReplacedRows(self, src_conn: sa.engine.Connection, dst_conn: sa.engine.Connection, table: sa.Table):
+        column = self._replacedKey(table)
+
+        if column is None:
+            return
+
+        keys = src_conn.execute(sa.select(column)).scalars().all()
+
+        for start in range(0, len(keys), self.chunk_size):
+            self._deleteCascade(dst_conn, table, column.in_(keys[start:start + self.chunk_size]))
+
+    def _deleteCascade(self, conn: sa.engine.Connection, table: sa.Table, whereclause: sa.sql.ColumnElement):
+        # Rows that reference the rows being deleted are deleted first,
+        # while the rows they reference can still be selected.
+        for child in metadata.sorted_tables:
+            if child is table:
+                continue
+
+            for fk in child.foreign_keys:
+                if fk.column.table is table:
+                    self._deleteCascade(conn, child, fk.parent.in_(sa.select(fk.column).where(whereclause)))
+
+        conn.execute(table.delete().where(whereclause))
+
+    def _syncSequences(self, conn: sa.engine.Connection, tables: typing.Iterable[sa.Table]):
+        # PostgreSQL generates values of autoincrement columns from sequences,
+        # which are not advanced by inserts with explicit primary keys.
+        for table in tables:
+            column = self._generatedKey(table)
+
+            conn.execute(
+                sa.text(f"SELECT setval(pg_get_serial_sequence('{table.name}', '{column.name}'), :next_id, false)"),
+                {'next_id': conn.execute(sa.select(sa.func.max(column))).scalar() + 1}
+            )
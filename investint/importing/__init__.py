@@ -8,10 +8,16 @@ Some workers such as `ZipWorker` and `SqlWorker` don't
 have an importing functionality on their own, but are
 used as a mixin in more specialized classes such as
 `FcaWorker` and `DfpItrWorker`.
+
+Several files may be imported at once with `ImportQueue`,
+which parses them in a process pool and writes them to the
+database from a single thread.
 """
 
-from investint.importing.worker import *
-from investint.importing.zip    import *
-from investint.importing.sql    import *
-from investint.importing.fca    import *
-from investint.importing.dfpitr import *
\ No newline at end of file
+from investint.importing.worker   import *
+from investint.importing.zip      import *
+from investint.importing.sql      import *
+from investint.importing.bulk     import *
+from investint.importing.fca      import *
+from investint.importing.dfpitr   import *
+from investint.importing.parallel import *
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""
+Imports files into a database without a graphical interface.
+
+Usage examples:
+
+    python -O -m investint.importing --database sqlite:///db.sqlite3 fca fca_cia_aberta_2021.zip
+    python -O -m investint.importing --database sqlite:///db.sqlite3 --cnpj 191 dfpitr dfp_cia_aberta_2021.zip
+    python -O -m investint.importing --database sqlite:///db.sqlite3 --statement BPA:con --statement DRE:con dfpitr dfp_cia_aberta_2021.zip
+
+When the import finishes, the throughput and the time spent in each
+phase of importing are printed for each file. The exit status is 0 if
+all files were imported, and 1 otherwise.
+"""
+
+import argparse
+import cvm
+import logging
+import re
+import sys
+import time
+import typing
+import sqlalchemy as sa
+from investint import database, importing
+
+def cnpjDigits(text: str) -> str:
+    """Returns `text` as a CNPJ of digits without leading zeroes, as expected by `DfpItrWorker`."""
+
+    digits = re.sub(r'\D', '', text).lstrip('0')
+
+    if digits == '':
+        raise argparse.ArgumentTypeError(f"invalid CNPJ: '{text}'")
+
+    return digits
+
+def statementTypes(text: str) -> typing.List[typing.Tuple[cvm.StatementType, cvm.BalanceType]]:
+    """Returns the pairs of statement type and balance type described by `text`,
+    which is a statement type optionally followed by ':con' or ':ind'.
+    """
+
+    balance_types = {
+        'con': [cvm.BalanceType.CONSOLIDATED],
+        'ind': [cvm.BalanceType.INDIVIDUAL],
+        '':    [cvm.BalanceType.CONSOLIDATED, cvm.BalanceType.INDIVIDUAL]
+    }
+
+    stmt_name, _, balance_name = text.partition(':')
+
+    try:
+        stmt_type = cvm.StatementType[stmt_name.upper()]
+        return [(stmt_type, balance_type) for balance_type in balance_types[balance_name.lower()]]
+    except KeyError:
+        raise argparse.ArgumentTypeError(f"invalid statement: '{text}'") from None
+
+def createWorker(args: argparse.Namespace, filepath: str) -> importing.Worker:
+    if args.kind == 'fca':
+        return importing.FcaWorker(filepath, commit_interval=args.commit_interval, fast_import=args.fast_import, staging=args.staging)
+    else:
+        return importing.DfpItrWorker(
+            args.cnpj,
+            filepath,
+            bulk            = True,
+            commit_interval = args.commit_interval,
+            skip_imported   = not args.force,
+            statement_types = sum(args.statement, []) or None,
+            fast_import     = args.fast_import,
+            staging         = args.staging
+        )
+
+def printMessage(message: str, level: int):
+    if level >= logging.WARNING:
+        print(f'{logging.getLevelName(level)}: {message}', file=sys.stderr)
+    else:
+        print(message)
+
+def runWorker(worker: importing.Worker, verbose: bool) -> bool:
+    results = []
+
+    def onError(exc_type: typing.Type[BaseException], exc_value: BaseException, exc_tb: str):
+        # The traceback is already logged by `Worker.run()`.
+        print(f'{worker.filepath()}: {exc_type.__name__}: {exc_value}', file=sys.stderr)
+        results.append(False)
+
+    worker.setVerbose(verbose)
+    worker.signals().messaged.connect(printMessage)
+    worker.signals().error.connect(onError)
+    worker.signals().finished.connect(results.append)
+    worker.run()
+
+    return results == [True]
+
+def printReport(worker: importing.Worker, elapsed: float):
+    doc_count = worker.readCount()
+    row_count = worker.rowCount()
+    rate      = lambda count: count / max(elapsed, 1e-9)
+
+    print(
+        f'{worker.filepath()}: {doc_count} documents, {row_count} rows in {elapsed:.2f} s '
+        f'({rate(doc_count):.1f} documents/s, {rate(row_count):.1f} rows/s)'
+    )
+
+    for phase, phase_time in worker.phaseTimes().items():
+        print(f'  {phase:<8} {phase_time:8.2f} s')
+
+def parseArgs(argv: typing.Sequence[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog='python -m investint.importing', description='Imports CVM files into a database.')
+    parser.add_argument('kind', choices=('fca', 'dfpitr'), help='the kind of the files')
+    parser.add_argument('files', nargs='+', help='paths to files to be imported')
+    parser.add_argument('--database', '-d', required=True, help='SQLAlchemy database URL, such as sqlite:///db.sqlite3')
+    parser.add_argument('--cnpj', action='append', default=[], type=cnpjDigits, help='CNPJ of a company to be imported (DFP/ITR only; may be repeated)')
+    parser.add_argument('--statement', action='append', default=[], type=statementTypes, help='statement to be imported, such as BPA, DRE:con, or DFC:ind (DFP/ITR only; may be repeated; default: all)')
+    parser.add_argument('--commit-interval', type=int, default=500, help='number of documents between commits (0 to commit once per file)')
+    parser.add_argument('--fast-import', action='store_true', help='tune SQLite databases for importing, restoring their settings afterwards')
+    parser.add_argument('--staging', action='store_true', help='read each file into an in-memory database, then write it to the database at once (ignores --commit-interval)')
+    parser.add_argument('--force', action='store_true', help='import DFP/ITR documents even if their version is already imported')
+    parser.add_argument('--verbose', '-v', action='store_true', help='print messages about each document read')
+
+    return parser.parse_args(argv)
+
+def main(argv: typing.Sequence[str]) -> int:
+    args = parseArgs(argv)
+
+    engine = database.createEngineFromUrl(sa.engine.make_url(args.database))
+
+    database.createSchema(engine)
+    database.Session.configure(bind=engine)
+
+    succeeded = True
+
+    for filepath in args.files:
+        worker     = createWorker(args, filepath)
+        start_time = time.perf_counter()
+        completed  = runWorker(worker, args.verbose)
+
+        printReport(worker, time.perf_counter() - start_time)
+
+        succeeded = succeeded and completed
+
+    return 0 if succeeded else 1
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,381 @@
+from __future__ import annotations
+import collections
+import cvm
+import sqlalchemy     as sa
+import sqlalchemy.orm as sa_orm
+import typing
+from investint import models
+
+__all__ = [
+    'DocumentRows',
+    'DocumentBulkLoader',
+    'deleteReplacedRows'
+]
+
+Row = typing.Dict[str, typing.Any]
+
+StatementTypes = typing.FrozenSet[typing.Tuple[cvm.StatementType, cvm.BalanceType]]
+
+class DocumentRows:
+    """Holds the table rows of a `models.Document` as plain Python objects.
+
+    The rows of statements and accounts have no primary or foreign keys,
+    which are assigned by `DocumentBulkLoader` upon flushing. Each account
+    is stored as a tuple of its polymorphic identity, its `base_account`
+    row, and its `account` or `dmpl_account` row.
+
+    The attribute `statement_types` holds the pairs of statement type and
+    balance type whose statements replace those of the same document in the
+    database, as passed to `deleteReplacedRows()`, or `None` if all of them
+    are replaced.
+
+    Unlike ORM-mapped objects, instances of this class are cheap to pickle,
+    which allows documents to be converted in another process.
+    """
+
+    __slots__ = ('document', 'statements', 'income_statement', 'balance_sheet', 'statement_types')
+
+    def __init__(self,
+                 document: Row,
+                 statements: typing.List[typing.Tuple[Row, typing.List[typing.Tuple[str, Row, Row]]]],
+                 income_statement: typing.Optional[Row] = None,
+                 balance_sheet: typing.Optional[Row] = None,
+                 statement_types: typing.Optional[StatementTypes] = None
+    ) -> None:
+        self.document         = document
+        self.statements       = statements
+        self.income_statement = income_statement
+        self.balance_sheet    = balance_sheet
+        self.statement_types  = statement_types
+
+    @staticmethod
+    def fromDocument(document: models.Document, statement_types: typing.Optional[StatementTypes] = None) -> DocumentRows:
+        statements = []
+
+        for stmt in document.statements:
+            accounts = []
+
+            for account in stmt.accounts:
+                if isinstance(account, models.DMPLAccount):
+                    account_type = 'dmpl_account'
+                else:
+                    account_type = 'account'
+
+                accounts.append((
+                    account_type,
+                    _tableRow(models.BaseAccount.__table__, account, exclude=('id', 'statement_id', 'type')),
+                    _tableRow(sa.inspect(type(account)).local_table, account, exclude=('id',))
+                ))
+
+            statements.append((_tableRow(models.Statement.__table__, stmt, exclude=('id', 'document_id')), accounts))
+
+        income_statement = None
+        balance_sheet    = None
+
+        if document.income_statement is not None:
+            income_statement = _tableRow(models.IncomeStatement.__table__, document.income_statement, exclude=('id', 'document_id'))
+
+        if document.balance_sheet is not None:
+            balance_sheet = _tableRow(models.BalanceSheet.__table__, document.balance_sheet, exclude=('id', 'document_id'))
+
+        return DocumentRows(_tableRow(models.Document.__table__, document), statements, income_statement, balance_sheet, statement_types)
+
+    @property
+    def id(self) -> int:
+        return self.document['id']
+
+    @property
+    def company_id(self) -> typing.Optional[int]:
+        return self.document['company_id']
+
+    @company_id.setter
+    def company_id(self, company_id: int):
+        self.document['company_id'] = company_id
+
+class DocumentBulkLoader:
+    """Writes documents to a database in batches using Core inserts.
+
+    The class `DocumentBulkLoader` is an alternative to `Session.merge()`
+    for importing large amounts of `models.Document`. Rather than having
+    the ORM look up and flush each object of a document, `add()` collects
+    the rows of a document, its statements, accounts, income statement,
+    and balance sheet, and `flush()` writes them with one `executemany`
+    insert per table. Rows of `BaseAccount`, `Account`, and `DMPLAccount`
+    are written together, since their joined-inheritance tables share
+    the same primary key.
+
+    Documents may also be added as `DocumentRows`, such as those converted
+    in another process.
+
+    Documents that already exist in the database are updated by the ones
+    being added, whose statements replace those of the same statement
+    types, as deleted by `deleteReplacedRows()`. Statements of other types,
+    such as those not selected for importing, are kept.
+
+    Since statements and accounts are inserted in batches, their primary
+    keys are assigned by this class, starting from the greatest primary
+    key found in the database upon the first call to `flush()`. Thus,
+    no other connection should insert statements or accounts while the
+    transaction of `session` is open.
+    """
+
+    def __init__(self, session: sa_orm.Session, batch_size: int = 100) -> None:
+        self._session    = session
+        self._batch_size = batch_size
+
+        self._next_statement_id: typing.Optional[int] = None
+        self._next_account_id:   typing.Optional[int] = None
+
+        self._documents: typing.Dict[int, DocumentRows] = {}
+        self._row_count = 0
+
+    def batchSize(self) -> int:
+        return self._batch_size
+
+    def rowCount(self) -> int:
+        """Returns the number of rows inserted so far."""
+
+        return self._row_count
+
+    def pendingCount(self) -> int:
+        """Returns the number of documents added since the last flush."""
+
+        return len(self._documents)
+
+    def add(self,
+            document: typing.Union[models.Document, DocumentRows],
+            statement_types: typing.Optional[StatementTypes] = None
+    ) -> None:
+        """Schedules `document` to be written.
+
+        If `document` is a `models.Document`, its statements replace those
+        of the types in `statement_types`, or all of them if it's `None`.
+        Otherwise, `document.statement_types` is used.
+
+        Note that `document.company_id` must be set, as relationships of
+        `document` to other persistent objects are not followed. If the
+        number of pending documents reaches `batchSize()`, calls `flush()`.
+        """
+
+        if isinstance(document, models.Document):
+            document = DocumentRows.fromDocument(document, statement_types)
+
+        self._documents[document.id] = document
+
+        if len(self._documents) >= self._batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes all pending documents to the database."""
+
+        if len(self._documents) == 0:
+            return
+
+        documents = list(self._documents.values())
+        self._documents.clear()
+
+        if self._next_statement_id is None:
+            self._next_statement_id = self._maxId(models.Statement.__table__) + 1
+            self._next_account_id   = self._maxId(models.BaseAccount.__table__) + 1
+
+        existing_ids = self._replaceDocuments(documents)
+
+        document_rows         = []
+        statement_rows        = []
+        base_account_rows     = []
+        account_rows          = []
+        dmpl_account_rows     = []
+        income_statement_rows = []
+        balance_sheet_rows    = []
+
+        for doc in documents:
+            if doc.id not in existing_ids:
+                document_rows.append(doc.document)
+
+            for stmt_row, accounts in doc.statements:
+                stmt_id = self._next_statement_id
+                self._next_statement_id += 1
+
+                statement_rows.append({**stmt_row, 'id': stmt_id, 'document_id': doc.id})
+
+                for account_type, base_account_row, account_row in accounts:
+                    account_id = self._next_account_id
+                    self._next_account_id += 1
+
+                    base_account_rows.append({**base_account_row, 'id': account_id, 'statement_id': stmt_id, 'type': account_type})
+
+                    if account_type == 'dmpl_account':
+                        dmpl_account_rows.append({**account_row, 'id': account_id})
+                    else:
+                        account_rows.append({**account_row, 'id': account_id})
+
+            if doc.income_statement is not None:
+                income_statement_rows.append({**doc.income_statement, 'document_id': doc.id})
+
+            if doc.balance_sheet is not None:
+                balance_sheet_rows.append({**doc.balance_sheet, 'document_id': doc.id})
+
+        # Order matters, as parent rows must exist before child rows.
+        inserts = (
+            (models.Document.__table__,        document_rows),
+            (models.Statement.__table__,       statement_rows),
+            (models.BaseAccount.__table__,     base_account_rows),
+            (models.Account.__table__,         account_rows),
+            (models.DMPLAccount.__table__,     dmpl_account_rows),
+            (models.IncomeStatement.__table__, income_statement_rows),
+            (models.BalanceSheet.__table__,    balance_sheet_rows)
+        )
+
+        for table, rows in inserts:
+            if len(rows) != 0:
+                self._session.execute(table.insert(), rows)
+                self._row_count += len(rows)
+
+        self._updateDocuments([doc for doc in documents if doc.id in existing_ids])
+
+        self._syncSequences()
+
+    ################################################################################
+    # Private methods
+    ################################################################################
+    def _maxId(self, table: sa.Table) -> int:
+        return self._session.execute(sa.select(sa.func.coalesce(sa.func.max(table.c.id), 0))).scalar()
+
+    def _replaceDocuments(self, documents: typing.List[DocumentRows]) -> typing.Set[int]:
+        """Deletes the rows replaced by `documents` and returns the ids of those already in the database."""
+
+        D = models.Document.__table__
+
+        existing_ids = set(self._session.execute(sa.select(D.c.id).where(D.c.id.in_([doc.id for doc in documents]))).scalars())
+
+        # Documents are usually imported with the same statement types, so this is a single set of deletes.
+        replaced = collections.defaultdict(list)
+
+        for doc in documents:
+            if doc.id in existing_ids:
+                replaced[doc.statement_types].append((doc.id, doc.income_statement is not None, doc.balance_sheet is not None))
+
+        for statement_types, replaced_documents in replaced.items():
+            deleteReplacedRows(self._session, replaced_documents, statement_types)
+
+        return existing_ids
+
+    def _updateDocuments(self, documents: typing.List[DocumentRows]) -> None:
+        if len(documents) == 0:
+            return
+
+        D = models.Document.__table__
+
+        # Rows are updated rather than deleted and inserted again, as the statements kept still reference them.
+        self._session.execute(
+            D.update().where(D.c.id == sa.bindparam('_id')),
+            [{**doc.document, '_id': doc.id} for doc in documents]
+        )
+
+        self._row_count += len(documents)
+
+    def _syncSequences(self) -> None:
+        # PostgreSQL generates values of autoincrement columns from sequences,
+        # which are not advanced by inserts with explicit primary keys. Move
+        # them forward so that later ORM inserts don't reuse our primary keys.
+        if self._session.get_bind().dialect.name != 'postgresql':
+            return
+
+        sequences = (
+            ('statement',    self._next_statement_id),
+            ('base_account', self._next_account_id)
+        )
+
+        for table_name, next_id in sequences:
+            self._session.execute(
+                sa.text(f"SELECT setval(pg_get_serial_sequence('{table_name}', 'id'), :next_id, false)"),
+                {'next_id': next_id}
+            )
+
+def _tableRow(table: sa.Table, obj: object, exclude: typing.Iterable[str] = ()) -> Row:
+    return {column.key: getattr(obj, column.key) for column in table.columns if column.key not in exclude}
+
+def deleteReplacedRows(connection: typing.Union[sa_orm.Session, sa.engine.Connection],
+                       documents: typing.Iterable[typing.Tuple[int, bool, bool]],
+                       statement_types: typing.Optional[StatementTypes] = None
+) -> None:
+    """Deletes the rows of the database of `connection` that are replaced
+    by importing documents with the statements in `statement_types`, or
+    with all statements if `statement_types` is `None`.
+
+    Each item of `documents` is a tuple of the id of a document and whether
+    an income statement and a balance sheet are imported along with it.
+    The statements of each document whose pair of statement type and balance
+    type is in `statement_types` are deleted, along with their accounts,
+    whereas the document itself and its other statements are kept. Its
+    income statement is deleted if one is imported or if consolidated DRE
+    statements are, and so is its balance sheet if one is imported or if
+    consolidated BPA or BPP statements are.
+
+    This must be called before documents are updated, since statements kept
+    have their `document_version` set to the version of their document if null.
+    """
+
+    S  = models.Statement.__table__
+    BA = models.BaseAccount.__table__
+    IS = models.IncomeStatement.__table__
+    BS = models.BalanceSheet.__table__
+
+    def isConsolidatedReplaced(*stmt_types: cvm.StatementType) -> bool:
+        return statement_types is None or any((stmt_type, cvm.BalanceType.CONSOLIDATED) in statement_types for stmt_type in stmt_types)
+
+    documents = list(documents)
+
+    if len(documents) == 0:
+        return
+
+    is_dre_replaced     = isConsolidatedReplaced(cvm.StatementType.DRE)
+    is_bpa_bpp_replaced = isConsolidatedReplaced(cvm.StatementType.BPA, cvm.StatementType.BPP)
+
+    document_ids        = [document_id for document_id, _, _ in documents]
+    income_document_ids = [document_id for document_id, has_income_statement, _ in documents if has_income_statement or is_dre_replaced]
+    sheet_document_ids  = [document_id for document_id, _, has_balance_sheet in documents if has_balance_sheet or is_bpa_bpp_replaced]
+
+    deletes = []
+
+    if statement_types is None or len(statement_types) != 0:
+        statement_filter = S.c.document_id.in_(document_ids)
+
+        if statement_types is not None:
+            statement_filter = sa.and_(
+                statement_filter,
+                sa.or_(*(
+                    sa.and_(S.c.statement_type == stmt_type, S.c.balance_type == balance_type)
+                    for stmt_type, balance_type in statement_types
+                ))
+            )
+
+        statement_ids = sa.select(S.c.id).where(statement_filter)
+        account_ids   = sa.select(BA.c.id).where(BA.c.statement_id.in_(statement_ids))
+
+        # Rows are deleted before the rows they reference, while those can still be selected.
+        deletes += [
+            models.Account.__table__.delete().where(models.Account.__table__.c.id.in_(account_ids)),
+            models.DMPLAccount.__table__.delete().where(models.DMPLAccount.__table__.c.id.in_(account_ids)),
+            BA.delete().where(BA.c.statement_id.in_(statement_ids)),
+            S.delete().where(statement_filter)
+        ]
+
+    if len(income_document_ids) != 0:
+        deletes.append(IS.delete().where(IS.c.document_id.in_(income_document_ids)))
+
+    if len(sheet_document_ids) != 0:
+        deletes.append(BS.delete().where(BS.c.document_id.in_(sheet_document_ids)))
+
+    for delete_stmt in deletes:
+        connection.execute(delete_stmt)
+
+    # Statements kept were imported from the version of their document being replaced.
+    D = models.Document.__table__
+
+    connection.execute(
+        S.update()
+         .where(S.c.document_id.in_(document_ids))
+         .where(S.c.document_version.is_(None))
+         .values(document_version=sa.select(D.c.version).where(D.c.id == S.c.document_id).scalar_subquery())
+    )
\ No newline at end of file
@@ -1,11 +1,138 @@
 import cvm
+import dataclasses
+import io
+import logging
+import re
 import typing
+import sqlalchemy as sa
 from investint import importing, models
 
 __all__ = [
+    'PreparedDfpItr',
     'DfpItrWorker'
 ]
 
+@dataclasses.dataclass
+class PreparedDfpItr:
+    """Holds a DFP/ITR document converted by `DfpItrWorker.prepareOne()`.
+
+    The attribute `document` is `None` if the document is of an unlisted
+    company. Otherwise, it is either a `models.Document` or `DocumentRows`.
+    The attribute `statement_types` lists the pairs of statement type and
+    balance type of the statements of the document that are imported, even
+    if the document was not converted.
+    """
+
+    id:              int
+    type:            cvm.DocumentType
+    version:         int
+    cnpj:            str
+    company_name:    str
+    statement_types: typing.List[typing.Tuple[cvm.StatementType, cvm.BalanceType]]
+    document:        typing.Union[models.Document, importing.DocumentRows, None]
+
+StatementTypes = typing.Iterable[typing.Tuple[cvm.StatementType, cvm.BalanceType]]
+
+def _statementTypes(dfpitr: cvm.datatypes.DFPITR,
+                    statement_types: typing.Optional[typing.Container[typing.Tuple[cvm.StatementType, cvm.BalanceType]]]
+) -> typing.List[typing.Tuple[cvm.StatementType, cvm.BalanceType]]:
+    # Same statements as those created by `models.Document.fromDfpItr()`, without creating them.
+    found_types = []
+
+    for grouped_collection in dfpitr.grouped_collections():
+        for collection in grouped_collection.collections():
+            for stmt_type in cvm.StatementType:
+                key = (stmt_type, collection.balance_type)
+
+                if key in found_types or (statement_types is not None and key not in statement_types):
+                    continue
+
+                if collection.statement(stmt_type) is not None:
+                    found_types.append(key)
+
+    return found_types
+
+# Matches the names of statement files in a DFP/ITR file, such as "dfp_cia_aberta_DFC_MI_con_2020.csv".
+_statement_file_re = re.compile(r'_(BPA|BPP|DFC_MD|DFC_MI|DMPL|DRA|DRE|DVA)_(con|ind)_\d{4}\.csv$')
+
+class _CsvLineFilter(io.RawIOBase):
+    """Reads the lines of a CSV file whose value at the column `column` is in `values`.
+
+    The header of the CSV file is always read. Lines are matched by a regular
+    expression on blocks of the file, so lines that are filtered out are not
+    decoded or parsed. This assumes that values are not quoted and that no
+    value spans more than one line, which holds for files published by CVM.
+    """
+
+    block_size = 1 << 20
+
+    def __init__(self, file: typing.IO[bytes], column: bytes, values: typing.Iterable[bytes]) -> None:
+        super().__init__()
+
+        self._file      = file
+        self._pending   = file.readline()
+        self._offset    = 0
+        self._remainder = b''
+        self._at_eof    = False
+
+        fields = self._pending.rstrip(b'\r\n').split(b';')
+
+        if column in fields:
+            self._pattern = re.compile(
+                rb'^(?:[^;\n]*;){%d}(?:%s)(?=[;\r\n])[^\n]*\n' % (fields.index(column), b'|'.join(re.escape(value) for value in values)),
+                re.MULTILINE
+            )
+        else:
+            # Let the CSV reader complain about the missing column.
+            self._pattern = None
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while self._offset == len(self._pending):
+            if self._at_eof:
+                return 0
+
+            self._readBlock()
+
+        count = min(len(buffer), len(self._pending) - self._offset)
+
+        buffer[:count] = self._pending[self._offset:self._offset + count]
+        self._offset  += count
+
+        return count
+
+    def close(self) -> None:
+        try:
+            self._file.close()
+        finally:
+            super().close()
+
+    def _readBlock(self):
+        block = self._file.read(self.block_size)
+
+        if block == b'':
+            self._at_eof = True
+            data         = self._remainder
+
+            if data != b'' and not data.endswith(b'\n'):
+                data += b'\n'
+
+            self._remainder = b''
+        else:
+            data = self._remainder + block
+            end  = data.rfind(b'\n') + 1
+
+            self._remainder = data[end:]
+            data            = data[:end]
+
+        if self._pattern is not None:
+            data = b''.join(self._pattern.findall(data))
+
+        self._pending = data
+        self._offset  = 0
+
 class DfpItrWorker(importing.ZipWorker, importing.SqlWorker):
     """Implements a `Worker` that imports data from DFP/ITR files.
     
@@ -21,19 +148,59 @@ class DfpItrWorker(importing.ZipWorker, importing.SqlWorker):
     companies whose CNPJ matches the given CNPJs. Otherwise,
     import all companies.
 
+    Filtering by CNPJ happens in `filterMember()`, which drops lines
+    of other companies from the CSV files in the Zip file before they
+    are parsed, so no DFP/ITR document of those companies is created.
+
     Note that CNPJs are expected to be digit-only strings without
     leading zeroes. For example, "191" rather than "00000000000191".
+
+    If `bulk` is `True`, documents are written by a `DocumentBulkLoader`
+    in batches of `batch_size` documents, rather than merged one by one.
+
+    If `skip_imported` is `True`, documents whose version is older than
+    that of the same document in the database are skipped, and so are
+    documents whose version is the same if all of their statements being
+    imported are already in the database, so that importing a file again
+    only writes documents that changed or statements not imported before.
+
+    If `statement_types` is not `None`, only statements whose pair of
+    statement type and balance type is in `statement_types` are imported.
+    CSV files of other statements are skipped by `filterMember()` without
+    being decompressed, except for BPA and BPP files, which are read for
+    every balance type being imported, as the DFP/ITR reader requires
+    them. Statements of documents already in the database are replaced
+    by type, so statements of other types are kept, as described by
+    `importing.deleteReplacedRows()`.
     """
 
     ################################################################################
     # Initialization
     ################################################################################
-    def __init__(self, listed_cnpjs: typing.Iterable[str], filepath: str) -> None:
-        super().__init__(filepath=filepath)
+    def __init__(self,
+                 listed_cnpjs: typing.Iterable[str],
+                 filepath: str,
+                 bulk: bool = False,
+                 batch_size: int = 100,
+                 commit_interval: int = 0,
+                 skip_imported: bool = True,
+                 statement_types: typing.Optional[StatementTypes] = None,
+                 fast_import: bool = False,
+                 staging: bool = False
+    ) -> None:
+        super().__init__(filepath=filepath, commit_interval=commit_interval, fast_import=fast_import, staging=staging)
 
-        self._listed_cnpjs = set(listed_cnpjs)
-        self._is_filtering = len(self._listed_cnpjs) > 0
-        self._last_cnpj    = None
+        self._listed_cnpjs      = set(listed_cnpjs)
+        self._is_filtering      = len(self._listed_cnpjs) > 0
+        self._is_bulk           = bulk
+        self._batch_size        = batch_size
+        self._bulk_loader       = None
+        self._company_ids       = None
+        self._skip_imported     = skip_imported
+        self._document_versions = None
+        self._stored_types      = None
+        self._missing_companies: typing.Dict[str, typing.Tuple[str, int]] = {}
+        self._statement_types   = frozenset(statement_types) if statement_types is not None else None
 
     ################################################################################
     # Overriden methods
@@ -43,92 +210,421 @@ class DfpItrWorker(importing.ZipWorker, importing.SqlWorker):
 
         return cvm.csvio.dfpitr_reader(file)
 
-    def readOne(self, obj: typing.Any):
-        """Reimplements `Worker.readOne()` to read and import a DFP/ITR document."""
+    def read(self, file: typing.IO, objects: typing.Optional[typing.Iterable[typing.Any]] = None) -> bool:
+        """Reimplements `SqlWorker.read()` to load `companyIds()`,
+        `documentVersions()`, and `storedStatementTypes()` before reading.
+        """
+
+        self.companyIds()
+        self.documentVersions()
+        self.storedStatementTypes()
+
+        return super().read(file, objects)
+
+    def prepareOne(self, obj: typing.Any) -> PreparedDfpItr:
+        """Reimplements `Worker.prepareOne()` to convert a DFP/ITR document
+        by `createDocument()`, unless its CNPJ is not listed.
+
+        If `prepareOne()` is called on the same process as `read()`, which
+        loads `companyIds()` and `documentVersions()`, documents of companies
+        not in the database and documents already imported aren't converted
+        either.
+
+        If `isBulk()` is `True`, the document is converted to `DocumentRows`,
+        which is much cheaper to pickle than ORM-mapped objects.
+        """
 
         dfpitr: cvm.datatypes.DFPITR = obj
 
-        summary = (
-            f"{dfpitr.type.name} id {dfpitr.id} by company '{dfpitr.company_name}' "
-            f"(version: {dfpitr.version})"
+        cnpj            = dfpitr.cnpj.digits()
+        document        = None
+        statement_types = _statementTypes(dfpitr, self._statement_types)
+        is_listed       = not self._is_filtering or cnpj in self._listed_cnpjs
+        is_missing      = self._company_ids is not None and cnpj not in self._company_ids
+        is_imported     = self._document_versions is not None and self.isImported(dfpitr.id, dfpitr.version, statement_types)
+
+        if is_listed and not is_missing and not is_imported:
+            document = self.createDocument(dfpitr)
+
+            if self.isBulk():
+                document = importing.DocumentRows.fromDocument(document, self._statement_types)
+
+        return PreparedDfpItr(
+            id              = dfpitr.id,
+            type            = dfpitr.type,
+            version         = dfpitr.version,
+            cnpj            = cnpj,
+            company_name    = dfpitr.company_name,
+            statement_types = statement_types,
+            document        = document
         )
 
-        self.emitMessage('Reading ' + summary)
+    def readOne(self, obj: typing.Any):
+        """Reimplements `Worker.readOne()` to import a DFP/ITR document."""
+
+        prepared: PreparedDfpItr = obj
+
+        if self.isVerbose():
+            self.emitVerboseMessage(
+                f"Reading {prepared.type.name} id {prepared.id} by company '{prepared.company_name}' "
+                f"(version: {prepared.version})"
+            )
 
-        cnpj = dfpitr.cnpj.digits()
+        cnpj = prepared.cnpj
 
         if self._is_filtering and cnpj not in self._listed_cnpjs:
-            self.emitMessage('...unlisted CNPJ, skipping')
+            self.emitVerboseMessage('...unlisted CNPJ, skipping')
+        elif self.isImported(prepared.id, prepared.version, prepared.statement_types):
+            if self.isVerbose():
+                self.emitVerboseMessage(f'...version {self.documentVersions()[prepared.id]} already imported, skipping')
         else:
-            self.importDocument(dfpitr)
+            self.importDocument(prepared)
+
+    def finish(self, completed: bool):
+        """Reimplements `SqlWorker.finish()` to emit a summary of
+        documents skipped because their company was not found.
+        """
+
+        if len(self._missing_companies) != 0:
+            document_count = sum(count for _, count in self._missing_companies.values())
+            companies      = sorted(self._missing_companies.items(), key=lambda item: item[1][0])
+
+            self.emitMessage(
+                f'{document_count} documents of {len(companies)} companies not found in the database were skipped:\n' +
+                '\n'.join(f"- '{name}' (CNPJ: {cnpj}, documents: {count})" for cnpj, (name, count) in companies),
+                logging.WARNING
+            )
+
+        super().finish(completed)
+
+    def progressLabel(self, obj: typing.Any) -> str:
+        """Reimplements `Worker.progressLabel()` to return the company name of a DFP/ITR document."""
+
+        return obj.company_name
+
+    def commit(self):
+        """Reimplements `SqlWorker.commit()` to flush documents pending
+        on `bulkLoader()` before committing.
+        """
+
+        if self._bulk_loader is not None:
+            self._bulk_loader.flush()
 
-        self._updateListedCnpjs(cnpj)
+        super().commit()
+
+    def rowCount(self) -> int:
+        """Reimplements `SqlWorker.rowCount()` to add rows inserted by `bulkLoader()`."""
+
+        row_count = super().rowCount()
+
+        if self._bulk_loader is not None:
+            row_count += self._bulk_loader.rowCount()
+
+        return row_count
+
+    def filterMember(self, name: str, member: typing.IO[bytes]) -> typing.Optional[typing.IO[bytes]]:
+        """Reimplements `ZipWorker.filterMember()` to skip CSV files of
+        statements not in `statementTypes()` and to drop lines of CSV
+        files whose CNPJ is not listed, if `self` is filtering CNPJs.
+        """
+
+        if not self._isFileRead(name):
+            return None
+
+        if not self._is_filtering:
+            return member
+
+        # CNPJs are written as in "00.000.000/0001-91".
+        cnpjs = [cvm.datatypes.CNPJ(cnpj).to_string(use_separator=True).encode('ascii') for cnpj in self._listed_cnpjs]
+
+        return io.BufferedReader(_CsvLineFilter(member, b'CNPJ_CIA', cnpjs))
+
+    def checkpointSalt(self) -> str:
+        """Reimplements `SqlWorker.checkpointSalt()` to
+        identify checkpoints by the CNPJs being imported.
+        """
+
+        salt = ','.join(sorted(self._listed_cnpjs))
+
+        if self._statement_types is not None:
+            salt += ';' + ','.join(sorted(f'{stmt_type.name}:{balance_type.name}' for stmt_type, balance_type in self._statement_types))
+
+        return salt
+
+    def stagingReplacer(self) -> typing.Callable[[sa.engine.Connection, sa.engine.Connection], None]:
+        """Reimplements `SqlWorker.stagingReplacer()` so that staged documents
+        only replace statements of the same types in the database.
+        """
+
+        return self._replaceStagedRows
 
     ################################################################################
     # Public methods
     ################################################################################
-    def importDocument(self, dfpitr: cvm.datatypes.DFPITR):
-        """First, creates the following ORM-mapped objects:
+    def isBulk(self) -> bool:
+        return self._is_bulk
+
+    def statementTypes(self) -> typing.Optional[typing.FrozenSet[typing.Tuple[cvm.StatementType, cvm.BalanceType]]]:
+        """Returns the pairs of statement type and balance type
+        to be imported, or `None` if all statements are imported.
+        """
+
+        return self._statement_types
+
+    def companyIds(self) -> typing.Dict[str, int]:
+        """Returns a mapping of CNPJ to id of companies in the database.
+
+        The mapping is loaded upon the first call to this method and
+        only has listed CNPJs if `self` is filtering CNPJs. As with
+        `targetSession()`, this method should only be called on the worker thread.
+        """
+
+        if self._company_ids is None:
+            cnpjs = self._listed_cnpjs if self._is_filtering else None
+
+            self._company_ids = models.PublicCompany.idsByCNPJ(cnpjs, self.targetSession())
+
+        return self._company_ids
+
+    def documentVersions(self) -> typing.Dict[int, int]:
+        """Returns a mapping of id to version of documents in the database,
+        or an empty mapping if `skip_imported` was passed as `False`.
+
+        The mapping is loaded upon the first call to this method and only
+        has documents of companies in `companyIds()`. As with `targetSession()`,
+        this method should only be called on the worker thread.
+        """
+
+        if self._document_versions is None:
+            if self._skip_imported:
+                company_ids = self.companyIds().values() if self._is_filtering else None
+
+                self._document_versions = models.Document.versions(company_ids, self.targetSession())
+            else:
+                self._document_versions = {}
+
+        return self._document_versions
+
+    def storedStatementTypes(self) -> typing.Dict[int, typing.Set[typing.Tuple[cvm.StatementType, cvm.BalanceType]]]:
+        """Returns a mapping of id of documents in `documentVersions()` to the
+        pairs of statement type and balance type of their statements that were
+        imported from the version in `documentVersions()`, or an empty mapping
+        if `skip_imported` was passed as `False`.
+
+        As with `documentVersions()`, the mapping is loaded upon the first call
+        to this method, which should only be called on the worker thread.
+        """
+
+        if self._stored_types is None:
+            if self._skip_imported:
+                company_ids = self.companyIds().values() if self._is_filtering else None
+
+                self._stored_types = models.Document.statementTypes(company_ids, self.targetSession())
+            else:
+                self._stored_types = {}
+
+        return self._stored_types
+
+    def isImported(self,
+                   document_id: int,
+                   version: int,
+                   statement_types: typing.Iterable[typing.Tuple[cvm.StatementType, cvm.BalanceType]] = ()
+    ) -> bool:
+        """Returns whether the document `document_id` is in `documentVersions()`
+        with a version greater than `version`, or with the same version and
+        all pairs of statement type and balance type in `statement_types`
+        in `storedStatementTypes()`.
+        """
+
+        stored_version = self.documentVersions().get(document_id, -1)
+
+        if stored_version != version:
+            return stored_version > version
+
+        return self.storedStatementTypes().get(document_id, set()).issuperset(statement_types)
+
+    def missingCompanies(self) -> typing.Dict[str, str]:
+        """Returns a mapping of CNPJ to name of companies whose
+        documents were skipped as they're not in the database.
+        """
+
+        return {cnpj: name for cnpj, (name, _) in self._missing_companies.items()}
+
+    def bulkLoader(self) -> typing.Optional[importing.DocumentBulkLoader]:
+        """Returns the bulk loader bound to `self`, or `None` if `isBulk()` is `False`.
+
+        As with `session()`, this method should only be called on the worker thread.
+        """
+
+        if self._is_bulk and self._bulk_loader is None:
+            self._bulk_loader = importing.DocumentBulkLoader(self.session(), self._batch_size)
+
+        return self._bulk_loader
+
+    def createDocument(self, dfpitr: cvm.datatypes.DFPITR) -> models.Document:
+        """Creates the following ORM-mapped objects:
         - `models.Document` from `dfpitr`;
         - `models.Statement` for each financial statement in `dfpitr`;
         - `models.IncomeStatement` from the DRE statement of `dfpitr`;
         - `models.BalanceSheet` from the BPA and BPP statements of `dfpitr`.
-        
-        Then, for each ORM-mapped object `o`, calls `merge(o)`.
+
+        Only statements in `statementTypes()` are created. The balance sheet
+        and the income statement are created if their consolidated statements
+        were read, even if those statements are not in `statementTypes()`.
+
+        Returns the created `models.Document`, which is not bound to a company.
+        """
+
+        doc = models.Document.fromDfpItr(dfpitr, self._statement_types)
+
+        found_bpa = False
+        found_bpp = False
+        found_dre = False
+
+        for grouped_collection in dfpitr.grouped_collections():
+            for collection in grouped_collection.collections():
+                if collection.balance_type != cvm.datatypes.BalanceType.CONSOLIDATED:
+                    continue
+
+                found_bpa = found_bpa or collection.bpa is not None
+                found_bpp = found_bpp or collection.bpp is not None
+                found_dre = found_dre or collection.dre is not None
+
+        if found_bpa and found_bpp:
+            doc.balance_sheet = models.BalanceSheet.from_dfpitr(dfpitr)
+
+        if found_dre:
+            doc.income_statement = models.IncomeStatement.from_dfpitr(dfpitr)
+
+        return doc
+
+    def importDocument(self, prepared: PreparedDfpItr):
+        """Binds the document of `prepared` to the company in `companyIds()`
+        whose CNPJ matches that of `prepared`, if any.
+
+        Then, if `isBulk()` is `True`, adds the document to `bulkLoader()`.
+        Otherwise, calls `mergeDocument()` with that document.
         """
 
-        company = models.PublicCompany.findByCNPJ(dfpitr.cnpj.digits(), self.session())
+        company_id = self.companyIds().get(prepared.cnpj)
 
-        if company is None:
-            self.emitMessage('...company not found in the database, skipping')
+        if company_id is None:
+            _, count = self._missing_companies.get(prepared.cnpj, (None, 0))
+
+            self._missing_companies[prepared.cnpj] = (prepared.company_name, count + 1)
+            self.emitVerboseMessage('...company not found in the database, skipping')
             return
 
-        doc = models.Document.fromDfpItr(dfpitr)
-        doc.company = company
+        doc = prepared.document
+
+        if self.isVerbose():
+            if len(prepared.statement_types) == 0:
+                self.emitVerboseMessage('...no statements')
+
+            for statement_type, balance_type in prepared.statement_types:
+                self.emitVerboseMessage(f'...found {statement_type} ({balance_type})')
+
+            if doc.balance_sheet is not None:
+                self.emitVerboseMessage('...generated Balance Sheet')
+
+            if doc.income_statement is not None:
+                self.emitVerboseMessage('...generated Income Statement')
 
-        if len(doc.statements) == 0:
-            self.emitMessage('...no statements')
+        # Don't assign `doc.company`, as that would cascade `doc` into `session()`.
+        doc.company_id = company_id
+
+        if self.isBulk():
+            self.bulkLoader().add(doc, self._statement_types)
         else:
-            found_bpa = False
-            found_bpp = False
-            found_dre = False
-            
-            for stmt in doc.statements:
-                self.emitMessage(f'...found {stmt.statement_type} ({stmt.balance_type})')
-
-                if stmt.balance_type != cvm.datatypes.BalanceType.CONSOLIDATED:
-                    continue
-            
-                if   stmt.statement_type == cvm.datatypes.StatementType.BPA: found_bpa = True
-                elif stmt.statement_type == cvm.datatypes.StatementType.BPP: found_bpp = True
-                elif stmt.statement_type == cvm.datatypes.StatementType.DRE: found_dre = True
+            self.mergeDocument(doc)
+
+        stored_types = self.storedStatementTypes()
+
+        if self.documentVersions().get(prepared.id) != prepared.version:
+            # Statements kept from another version don't count as imported.
+            stored_types[prepared.id] = set()
+
+        stored_types.setdefault(prepared.id, set()).update(prepared.statement_types)
+
+        self.documentVersions()[prepared.id] = prepared.version
+
+    def mergeDocument(self, doc: models.Document):
+        """Adds `doc` to `session()`, unless a document with the same id is
+        in the database, in which case that document is updated by `doc`,
+        whose statements replace those of the same types, as deleted by
+        `importing.deleteReplacedRows()`.
+        """
+
+        session  = self.session()
+        existing = session.get(models.Document, doc.id)
+
+        if existing is None:
+            session.add(doc)
+            return
+
+        importing.deleteReplacedRows(
+            session,
+            [(doc.id, doc.income_statement is not None, doc.balance_sheet is not None)],
+            self._statement_types
+        )
+
+        # Relationships of `existing` may have been loaded before their rows were deleted.
+        session.expire(existing, ['statements', 'income_statement', 'balance_sheet'])
+
+        for column in models.Document.__table__.columns:
+            setattr(existing, column.key, getattr(doc, column.key))
+
+        # Move the new rows from `doc` to `existing`, which isn't replaced as a whole. They're
+        # detached from `doc` first, as backrefs would otherwise cascade `doc` into `session`.
+        statements       = list(doc.statements)
+        income_statement = doc.income_statement
+        balance_sheet    = doc.balance_sheet
 
-            if found_bpa and found_bpp:
-                doc.balance_sheet = models.BalanceSheet.from_dfpitr(dfpitr)
-                self.emitMessage('...generated Balance Sheet')
+        doc.statements       = []
+        doc.income_statement = None
+        doc.balance_sheet    = None
 
-            if found_dre:
-                doc.income_statement = models.IncomeStatement.from_dfpitr(dfpitr)
-                self.emitMessage('...generated Income Statement')
+        existing.statements.extend(statements)
 
-        self.merge(doc)
+        if income_statement is not None:
+            existing.income_statement = income_statement
+
+        if balance_sheet is not None:
+            existing.balance_sheet = balance_sheet
 
     ################################################################################
     # Private methods
     ################################################################################
-    def _updateListedCnpjs(self, cnpj: str):
-        if not self._is_filtering:
-            return
-        
-        if self._last_cnpj is None:
-            self._last_cnpj = cnpj
-        elif self._last_cnpj == cnpj:
-            return
-        else:
-            self._listed_cnpjs.discard(self._last_cnpj)
-            
-            if len(self._listed_cnpjs) == 0:
-                self.emitMessage('Finished reading all documents with the given CNPJs')
-                raise StopIteration()
-            else:
-                self._last_cnpj = cnpj
\ No newline at end of file
+    def _replaceStagedRows(self, src_conn: sa.engine.Connection, dst_conn: sa.engine.Connection):
+        D  = models.Document.__table__
+        IS = models.IncomeStatement.__table__
+        BS = models.BalanceSheet.__table__
+
+        select_stmt = (
+            sa.select(D.c.id, IS.c.id, BS.c.id)
+              .select_from(D.outerjoin(IS, IS.c.document_id == D.c.id).outerjoin(BS, BS.c.document_id == D.c.id))
+        )
+
+        for rows in src_conn.execute(select_stmt).partitions(500):
+            importing.deleteReplacedRows(
+                dst_conn,
+                [(document_id, income_statement_id is not None, balance_sheet_id is not None) for document_id, income_statement_id, balance_sheet_id in rows],
+                self._statement_types
+            )
+
+    def _isFileRead(self, name: str) -> bool:
+        match = _statement_file_re.search(name)
+
+        if self._statement_types is None or match is None:
+            return True
+
+        stmt_type    = cvm.StatementType.DFC if match.group(1).startswith('DFC') else cvm.StatementType[match.group(1)]
+        balance_type = cvm.BalanceType.CONSOLIDATED if match.group(2) == 'con' else cvm.BalanceType.INDIVIDUAL
+
+        if (stmt_type, balance_type) in self._statement_types:
+            return True
+
+        # The reader can't create statements of a balance type without its BPA and BPP.
+        is_balance_type_read = any(key[1] == balance_type for key in self._statement_types)
+
+        return stmt_type in (cvm.StatementType.BPA, cvm.StatementType.BPP) and is_balance_type_read
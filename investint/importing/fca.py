@@ -25,12 +25,16 @@ class FcaWorker(importing.ZipWorker, importing.SqlWorker):
         fca: cvm.datatypes.FCA = obj
         co = models.PublicCompany.fromFCA(fca)
 
-        summary = f"FCA id {fca.id} by company '{fca.company_name}' (version: {fca.version})"
-
-        self.emitMessage('Reading ' + summary)
+        if self.isVerbose():
+            self.emitVerboseMessage(f"Reading FCA id {fca.id} by company '{fca.company_name}' (version: {fca.version})")
 
         if co is None:
-            self.emitMessage('...missing issuer company')
+            self.emitVerboseMessage('...missing issuer company')
         else:
             self.merge(co)
-            self.emitMessage('...imported')
\ No newline at end of file
+            self.emitVerboseMessage('...imported')
+
+    def progressLabel(self, obj: typing.Any) -> str:
+        """Reimplements `Worker.progressLabel()` to return the company name of an FCA document."""
+
+        return obj.company_name
\ No newline at end of file
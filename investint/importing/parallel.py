@@ -0,0 +1,321 @@
+import concurrent.futures
+import logging
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+import typing
+from PyQt5     import QtCore
+from investint import importing
+
+__all__ = [
+    'ImportQueueSignals',
+    'ImportQueue'
+]
+
+WorkerFactory = typing.Callable[[], importing.Worker]
+
+class ImportQueueSignals(importing.WorkerSignals):
+    """Extends `WorkerSignals` with signals emitted by `ImportQueue` for each file.
+
+    The signal `fileStarted` is emitted with the path of a file when its
+    documents start being written to the database.
+
+    The signal `fileProgressed` is emitted with the path of a file, the
+    number of documents read from that file so far, and the throughput of
+    the whole queue so far, in documents per second.
+
+    The signal `fileFinished` is emitted with the path of a file and whether
+    that file was completely imported. A file whose import fails does not
+    cause the queue to stop. Instead, the error is emitted by `messaged`
+    with the level `logging.ERROR`, and `fileFinished` is emitted with
+    `completed` set to `False`.
+
+    The signal `progressed` is emitted along with `fileProgressed`, with
+    the number of documents read from all files and the last file read.
+    """
+
+    fileStarted    = QtCore.pyqtSignal(str)
+    fileProgressed = QtCore.pyqtSignal(str, int, float)
+    fileFinished   = QtCore.pyqtSignal(str, bool)
+
+class ImportQueue(QtCore.QRunnable):
+    """Imports several files by parsing them concurrently in a process pool.
+
+    The class `ImportQueue` is a `QRunnable` that takes a sequence of
+    callables, each of which returns a `Worker` for one file, and has the
+    same interface as `Worker` with respect to `signals()` and `stop()`.
+
+    Upon execution of `run()`, each callable is sent to a process pool,
+    where it is called to create a worker whose `open()`, `reader()`, and
+    `prepareOne()` parse the file of that worker. Prepared objects are sent
+    back in chunks of `chunk_size` objects to the thread running `run()`,
+    which calls the callable again to create a worker to import them. Thus,
+    files are parsed in parallel, whereas database writes are serialized by
+    that thread and happen in the order of `factories`. Note that this means
+    callables must be picklable, such as `functools.partial(DfpItrWorker, ...)`.
+
+    The signal `finished` is emitted with `True` if all files were imported
+    completely, and with `False` if `stop()` was called or any file failed.
+    """
+
+    def __init__(self,
+                 factories: typing.Sequence[WorkerFactory],
+                 process_count: typing.Optional[int] = None,
+                 chunk_size: int = 50
+    ) -> None:
+        super().__init__()
+
+        if process_count is None:
+            process_count = min(len(factories), os.cpu_count() or 1)
+
+        self._factories     = list(factories)
+        self._process_count = max(process_count, 1)
+        self._chunk_size    = chunk_size
+        self._signals       = ImportQueueSignals()
+        self._stop_ev       = threading.Event()
+        self._worker_lock   = threading.Lock()
+        self._worker        = None
+        self._total_count   = 0
+        self._start_time    = 0.0
+        self._is_verbose    = False
+
+    def fileCount(self) -> int:
+        return len(self._factories)
+
+    def processCount(self) -> int:
+        return self._process_count
+
+    def isVerbose(self) -> bool:
+        return self._is_verbose
+
+    def setVerbose(self, verbose: bool):
+        """Calls `Worker.setVerbose()` with `verbose` on the workers
+        that write documents. This should be called before `run()`.
+        """
+
+        self._is_verbose = verbose
+
+    def stop(self):
+        """Stops the importing process, if any.
+
+        The file being written is rolled back and the remaining files
+        are not imported. This function is thread-safe.
+        """
+
+        self._stop_ev.set()
+
+        with self._worker_lock:
+            if self._worker is not None:
+                self._worker.stop()
+
+    def signals(self) -> ImportQueueSignals:
+        """Returns an object that contains the signals emitted by this instance.
+
+        This function is thread-safe.
+        """
+
+        return self._signals
+
+    def emitMessage(self, message: str, level: int = logging.INFO):
+        """Emits `message` with the severity `level`, a level of the module `logging`.
+
+        This function is thread-safe.
+        """
+
+        self.signals().messaged.emit(message, level)
+
+    ################################################################################
+    # Overriden methods
+    ################################################################################
+    def run(self) -> None:
+        self._start_time = time.perf_counter()
+
+        # Don't fork the process running Qt and SQLAlchemy threads.
+        context = multiprocessing.get_context('spawn')
+
+        # Queues and events can't be passed to tasks, only to the processes of the pool.
+        parsed_queues = [context.Queue(maxsize=8) for _ in self._factories]
+        parse_stops   = [context.Event()          for _ in self._factories]
+
+        try:
+            with concurrent.futures.ProcessPoolExecutor(
+                     self._process_count,
+                     mp_context  = context,
+                     initializer = _initParsingProcess,
+                     initargs    = (parsed_queues, parse_stops)
+                 ) as executor:
+
+                futures = [
+                    executor.submit(_parseFile, index, factory, self._chunk_size)
+                    for index, factory in enumerate(self._factories)
+                ]
+
+                completed = True
+
+                for index, factory in enumerate(self._factories):
+                    if self._stop_ev.is_set():
+                        completed = False
+                    else:
+                        completed = self._importFile(factory, parsed_queues[index], futures[index]) and completed
+
+                    parse_stops[index].set()
+
+        except:
+            exc_type, exc_value = sys.exc_info()[:2]
+            exc_desc            = traceback.format_exc()
+
+            QtCore.qCritical(exc_desc.encode('utf-8'))
+
+            self.signals().error.emit(exc_type, exc_value, exc_desc)
+
+        else:
+            elapsed = time.perf_counter() - self._start_time
+
+            self.emitMessage(
+                f'Imported {self._total_count} documents from {len(self._factories)} files '
+                f'in {elapsed:.1f} s ({self._total_count / max(elapsed, 1e-9):.1f} documents/s)'
+            )
+
+            self.signals().finished.emit(completed)
+
+    ################################################################################
+    # Private methods
+    ################################################################################
+    def _importFile(self, factory: WorkerFactory, parsed_queue: queue.Queue, future: concurrent.futures.Future) -> bool:
+        worker   = factory()
+        filepath = worker.filepath()
+
+        worker.setVerbose(self._is_verbose)
+        worker.signals().messaged.connect(self.emitMessage)
+
+        with self._worker_lock:
+            self._worker = worker
+
+        if self._stop_ev.is_set():
+            worker.stop()
+
+        self.signals().fileStarted.emit(filepath)
+
+        try:
+            with worker.open(filepath) as file:
+                completed = worker.read(file, self._receive(filepath, parsed_queue, future))
+
+            worker.finish(completed)
+
+        except:
+            exc_desc = traceback.format_exc()
+
+            QtCore.qCritical(exc_desc.encode('utf-8'))
+
+            try:
+                worker.finish(False)
+            except:
+                pass
+
+            self.emitMessage(f"Failed to import '{filepath}':\n{exc_desc}", logging.ERROR)
+
+            completed = False
+
+        with self._worker_lock:
+            self._worker = None
+
+        self.signals().fileFinished.emit(filepath, completed)
+
+        return completed
+
+    def _receive(self,
+                 filepath: str,
+                 parsed_queue: queue.Queue,
+                 future: concurrent.futures.Future
+    ) -> typing.Iterator[typing.Any]:
+        count = 0
+
+        while True:
+            try:
+                item = parsed_queue.get(timeout=0.1)
+            except queue.Empty:
+                # The task may have failed before it could put anything,
+                # such as if a factory is not picklable.
+                if future.done() and future.exception() is not None:
+                    raise future.exception()
+
+                continue
+
+            if item is None:
+                return
+
+            if isinstance(item, str):
+                raise RuntimeError(f"error while parsing '{filepath}':\n{item}")
+
+            yield from item
+
+            count             += len(item)
+            self._total_count += len(item)
+
+            elapsed = time.perf_counter() - self._start_time
+
+            self.signals().fileProgressed.emit(filepath, count, self._total_count / max(elapsed, 1e-9))
+            self.signals().progressed.emit(importing.WorkerProgress(
+                read_count = self._total_count,
+                current    = os.path.basename(filepath),
+                elapsed    = elapsed
+            ))
+
+_parsed_queues: typing.List[multiprocessing.Queue] = []
+_parse_stops:   typing.List[threading.Event]       = []
+
+def _initParsingProcess(parsed_queues: typing.List[multiprocessing.Queue], parse_stops: typing.List[threading.Event]) -> None:
+    global _parsed_queues, _parse_stops
+
+    _parsed_queues = parsed_queues
+    _parse_stops   = parse_stops
+
+def _parseFile(index: int, factory: WorkerFactory, chunk_size: int) -> None:
+    """Runs on a process of the pool of `ImportQueue` to parse and prepare
+    objects of the file of the worker returned by `factory`. Puts lists of
+    prepared objects on the queue at `index`, followed by either `None` or
+    an error description.
+    """
+
+    parsed_queue = _parsed_queues[index]
+    parse_stop   = _parse_stops[index]
+
+    def put(item) -> bool:
+        while not parse_stop.is_set():
+            try:
+                parsed_queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+
+        return False
+
+    if parse_stop.is_set():
+        return
+
+    worker = factory()
+    chunk  = []
+
+    try:
+        with worker.open(worker.filepath()) as file:
+            for obj in worker.reader(file):
+                chunk.append(worker.prepareOne(obj))
+
+                if len(chunk) >= chunk_size:
+                    if not put(chunk):
+                        return
+
+                    chunk = []
+
+        if len(chunk) != 0 and not put(chunk):
+            return
+
+    except Exception:
+        put(traceback.format_exc())
+        return
+
+    put(None)
@@ -1,4 +1,11 @@
-from investint import database, importing
+import datetime
+import hashlib
+import itertools
+import logging
+import typing
+import sqlalchemy     as sa
+import sqlalchemy.orm as sa_orm
+from investint import database, importing, models
 
 __all__ = [
     'SqlWorker'
@@ -12,18 +19,49 @@ class SqlWorker(importing.Worker):
     SQLAlchemy `Session` for database operations and binds it to an
     instance of this class. This is so that database operations happen
     in the worker thread.
+
+    By default, pending changes are committed only once the whole file
+    is read. If `commit_interval` is positive, changes are also committed
+    after every such number of documents, along with a
+    `models.ImportCheckpoint` identifying the file being read.
+    Should the import be stopped or fail, a worker that is later run on
+    the same file skips the documents already committed.
+
+    If `fast_import` is `True` and `database.Session` is bound to a SQLite
+    file, `targetSession()` is bound to the engine of a `database.SqliteFastImport`
+    instead, from its creation until `finish()` returns, whether the import
+    succeeds or not. Other connections to the database keep their settings.
+
+    If `staging` is `True`, `session()` is bound to a `database.StagingDatabase`
+    rather than to the database being imported into, which is only written
+    to by `finish()`, in one transaction, once the whole file is read. In that
+    case, `commit_interval` is ignored, as there is nothing to resume from.
+    Note that the rows of a file are then held in memory until `finish()`.
     """
 
-    def __init__(self, filepath: str) -> None:
+    def __init__(self, filepath: str, commit_interval: int = 0, fast_import: bool = False, staging: bool = False) -> None:
         super().__init__(filepath=filepath)
 
-        self._session = None
+        self._session               = None
+        self._row_count             = 0
+        self._commit_interval       = max(commit_interval, 0)
+        self._uncommitted_count     = 0
+        self._last_document_id      = None
+        self._checkpoint_hash       = None
+        self._checkpoint_read_count = 0
+        self._is_fast_import        = fast_import
+        self._fast_import           = None
+        self._is_staging            = staging
+        self._staging               = None
+        self._target_session        = None
 
     def session(self):
         """Returns the session bound to `self`.
         
         If `self` does not have a session, creates one and returns it.
-        Otherwise, returns its session.
+        Otherwise, returns its session. If `isStaging()` is `True`, the
+        session is bound to a staging database. Otherwise, it is the same
+        as `targetSession()`.
 
         Note that this method should be called only after `self` has
         already been moved to a worker thread by `self.moveToThread()`,
@@ -32,10 +70,38 @@ class SqlWorker(importing.Worker):
         """
 
         if self._session is None:
-            self._session = database.Session()
+            if self._is_staging:
+                self._staging = database.StagingDatabase()
+                self._session = sa_orm.Session(bind=self._staging.engine(), future=True)
+            else:
+                self._session = self.targetSession()
+
+            sa.event.listen(self._session, 'after_flush', self._onSessionFlushed)
 
         return self._session
 
+    def targetSession(self):
+        """Returns the session of the database being imported into,
+        which should be used to look up rows that already exist.
+
+        As with `session()`, this method should only be called on the worker thread.
+        """
+
+        if self._target_session is None:
+            session = database.Session()
+
+            if self._is_fast_import:
+                # Tune the database before the session begins a transaction.
+                self._fast_import = database.SqliteFastImport(session.get_bind())
+                self._fast_import.start()
+
+                if self._fast_import.isStarted():
+                    session = sa_orm.Session(bind=self._fast_import.engine(), future=True)
+
+            self._target_session = session
+
+        return self._target_session
+
     def merge(self, mapped_obj: object):
         self.session().merge(mapped_obj)
 
@@ -45,15 +111,223 @@ class SqlWorker(importing.Worker):
     def rollback(self):
         self.session().rollback()
 
+    def isFastImport(self) -> bool:
+        return self._is_fast_import
+
+    def isStaging(self) -> bool:
+        return self._is_staging
+
+    def commitInterval(self) -> int:
+        return self._commit_interval
+
+    def setCommitInterval(self, interval: int):
+        """Sets the number of documents to be read between commits.
+
+        If `interval` is zero, changes are only committed once all documents
+        are read, and no checkpoint is recorded.
+        """
+
+        self._commit_interval = max(interval, 0)
+
+    def checkpointHash(self) -> typing.Optional[str]:
+        """Returns the hash identifying checkpoints of `self`, or `None`
+        if `self` does not record checkpoints or has not started reading.
+        """
+
+        return self._checkpoint_hash
+
+    def checkpointSalt(self) -> str:
+        """Returns a string identifying options of `self` that affect
+        which documents are imported, which is hashed along with the
+        file being read to identify checkpoints.
+
+        The default implementation returns an empty string.
+        """
+
+        return ''
+
+    def stagingReplacer(self) -> typing.Optional[typing.Callable[[sa.engine.Connection, sa.engine.Connection], None]]:
+        """Returns the function passed as `replace` to `database.StagingDatabase.writeTo()`
+        when writing the staged rows, if `isStaging()` is `True`.
+
+        The default implementation returns `None`, so that staged rows replace
+        the rows with the same primary key, along with the rows that depend on them.
+        """
+
+        return None
+
     ################################################################################
     # Overriden methods
     ################################################################################
+    def read(self, file: typing.IO, objects: typing.Optional[typing.Iterable[typing.Any]] = None) -> bool:
+        """Reimplements `Worker.read()` to look up the checkpoint of `file`
+        before reading it, if `commitInterval()` is positive.
+        """
+
+        if self._commit_interval > 0 and not self._is_staging:
+            self._loadCheckpoint(file)
+
+        return super().read(file, objects)
+
+    def skipOne(self, obj: typing.Any) -> bool:
+        """Reimplements `Worker.skipOne()` to skip documents up to
+        and including the last document of the checkpoint.
+        """
+
+        return self.readCount() <= self._checkpoint_read_count
+
+    def afterReadOne(self, obj: typing.Any):
+        """Reimplements `Worker.afterReadOne()` to commit pending changes
+        and record a checkpoint once `commitInterval()` documents are read.
+        """
+
+        self._last_document_id = getattr(obj, 'id', None)
+
+        if self._commit_interval == 0 or self._is_staging:
+            return
+
+        self._uncommitted_count += 1
+
+        if self._uncommitted_count >= self._commit_interval:
+            self._commitCheckpoint()
+
+    def rowCount(self) -> int:
+        """Reimplements `Worker.rowCount()` to return the number of table
+        rows inserted, updated, or deleted by `session()`.
+
+        An object of a mapper with joined table inheritance, such as
+        `models.Account`, is counted once per table it is written to, and
+        updated objects are only counted for tables whose columns changed.
+        """
+
+        return self._row_count
+
     def finish(self, completed: bool):
         """Reimplements `Worker.finish()` to commit pending changes on
         `session()` if `completed` is `True`, or rollback otherwise.
+
+        If `completed` is `True`, the checkpoint of `self` is removed,
+        since there is nothing left to resume. If `isStaging()` is `True`,
+        the rows committed to the staging database are then written to
+        the database of `targetSession()`. If the database was tuned for
+        `isFastImport()`, its settings are restored afterwards.
         """
 
-        if completed:
-            self.commit()
-        else:
-            self.rollback()
\ No newline at end of file
+        try:
+            if completed:
+                if self._checkpoint_hash is not None:
+                    checkpoint = self.session().get(models.ImportCheckpoint, self._checkpoint_hash)
+
+                    if checkpoint is not None:
+                        self.session().delete(checkpoint)
+
+                self.commit()
+
+                if self._staging is not None:
+                    self._writeStaging()
+            else:
+                self.rollback()
+        finally:
+            if self._session is not None:
+                # `database.Session` is thread-local, so `self._session` may be reused by other workers.
+                sa.event.remove(self._session, 'after_flush', self._onSessionFlushed)
+
+            if self._staging is not None:
+                self._session.close()
+                self._staging.dispose()
+                self._staging = None
+
+                if self._target_session is not None:
+                    # End the transaction of lookups if the staged rows weren't written.
+                    self._target_session.rollback()
+
+            if self._fast_import is not None:
+                if self._fast_import.isStarted():
+                    # Unlike `database.Session`, the session of the tuned engine isn't reused.
+                    self._target_session.close()
+
+                self._stopFastImport()
+
+    ################################################################################
+    # Private methods
+    ################################################################################
+    def _loadCheckpoint(self, file: typing.IO):
+        digest = hashlib.sha256()
+        digest.update(self.fileHash(file).encode('utf-8'))
+        digest.update(type(self).__name__.encode('utf-8'))
+        digest.update(self.checkpointSalt().encode('utf-8'))
+
+        self._checkpoint_hash = digest.hexdigest()
+
+        checkpoint = self.session().get(models.ImportCheckpoint, self._checkpoint_hash)
+
+        if checkpoint is not None:
+            self._checkpoint_read_count = checkpoint.read_count
+
+            self.emitMessage(
+                f'Resuming from checkpoint of {checkpoint.updated_at}: skipping {checkpoint.read_count} '
+                f'documents already imported (last document id: {checkpoint.last_document_id})'
+            )
+
+    def _commitCheckpoint(self):
+        self.session().merge(models.ImportCheckpoint(
+            archive_hash     = self._checkpoint_hash,
+            read_count       = self.readCount(),
+            last_document_id = self._last_document_id,
+            updated_at       = datetime.datetime.now()
+        ))
+
+        self.commit()
+
+        self._uncommitted_count = 0
+
+        self.emitMessage(f'Committed {self.readCount()} documents (last document id: {self._last_document_id})')
+
+    def _writeStaging(self):
+        target = self.targetSession()
+
+        # End the transaction of lookups, if any, so that the target may be written to.
+        target.commit()
+
+        self.emitMessage('Writing staged rows to the database...')
+
+        row_count = self._staging.writeTo(target.get_bind(), self.stagingReplacer())
+
+        self.emitMessage(f'Wrote {row_count} rows to the database')
+
+    def _stopFastImport(self):
+        index_count = len(self._fast_import.droppedIndexes())
+
+        if index_count != 0:
+            self.emitMessage(f'Creating {index_count} indexes...')
+
+        if not self._fast_import.stop():
+            self.emitMessage(
+                f"Could not restore the journal mode '{self._fast_import.journalMode()}' of the database, "
+                f"which remains in WAL mode, since another connection is using it",
+                logging.WARNING
+            )
+
+        self._fast_import = None
+
+    def _onSessionFlushed(self, session: sa_orm.Session, flush_context):
+        # Upon `after_flush`, the session and the history of attributes are still in their pre-flush state.
+        for obj in itertools.chain(session.new, session.deleted):
+            self._row_count += len(sa.inspect(obj).mapper.tables)
+
+        for obj in session.dirty:
+            self._row_count += len(_modifiedTables(obj))
+
+def _modifiedTables(obj: object) -> typing.Set[sa.Table]:
+    """Returns the tables of `obj` having columns whose values were changed since it was loaded."""
+
+    state  = sa.inspect(obj)
+    tables = set()
+
+    for attr in state.attrs:
+        prop = state.mapper.get_property(attr.key)
+
+        if isinstance(prop, sa_orm.ColumnProperty) and attr.history.has_changes():
+            tables.update(column.table for column in prop.columns)
+
+    return tables
\ No newline at end of file
@@ -1,14 +1,45 @@
+import dataclasses
+import hashlib
+import logging
+import os
 import sys
 import threading
+import time
 import traceback
 import typing
 from PyQt5 import QtCore
 
 __all__ = [
+    'WorkerProgress',
     'WorkerSignals',
     'Worker'
 ]
 
+@dataclasses.dataclass
+class WorkerProgress:
+    """Describes the progress of a `Worker`, as emitted by `WorkerSignals.progressed`.
+
+    The attribute `read_count` is the number of objects read so far, and
+    `row_count` is the number of rows written so far. `bytes_read` is the
+    number of bytes read from the file so far, which is 0 if unknown, and
+    `bytes_total` is the size of that file, as of when `Worker.run()` was
+    called, which is 0 otherwise. `current` is a short description of the
+    last object read, such as a company name, and `elapsed` is the time in
+    seconds since the worker started running.
+    """
+
+    read_count:  int   = 0
+    row_count:   int   = 0
+    bytes_read:  int   = 0
+    bytes_total: int   = 0
+    current:     str   = ''
+    elapsed:     float = 0.0
+
+    def rate(self) -> float:
+        """Returns the number of objects read per second."""
+
+        return self.read_count / self.elapsed if self.elapsed > 0 else 0.0
+
 class WorkerSignals(QtCore.QObject):
     """Groups signals emitted by `Worker`.
     
@@ -25,9 +56,16 @@ class WorkerSignals(QtCore.QObject):
     immediately after this signal is emitted. Note that the
     signal `finished` is **not** emitted in this case.
 
-    The signal `message` notifies progress changes, warning,
-    or general information while reading a file. It is emitted
-    by `Worker.emitMessage()`.
+    The signal `messaged` notifies warnings or general information
+    while reading a file. It has two arguments, the message and its
+    severity, which is a level of the module `logging`, such as
+    `logging.INFO`. It is emitted by `Worker.emitMessage()`. Messages
+    about each object read have the level `logging.DEBUG` and are only
+    emitted if the worker is verbose.
+
+    The signal `progressed` notifies progress changes with a
+    `WorkerProgress`. It is emitted at most once per progress
+    interval of a worker, and once more before `finished`.
 
     The signal `finished` is emitted immediately before
     `Worker.run()` returns to indicate that a worker is
@@ -37,9 +75,10 @@ class WorkerSignals(QtCore.QObject):
     stopped as a result of `Worker.stop()` being called.
     """
 
-    error    = QtCore.pyqtSignal(type, Exception, str)
-    messaged = QtCore.pyqtSignal(str)
-    finished = QtCore.pyqtSignal(bool)
+    error      = QtCore.pyqtSignal(type, Exception, str)
+    messaged   = QtCore.pyqtSignal(str, int)
+    progressed = QtCore.pyqtSignal(WorkerProgress)
+    finished   = QtCore.pyqtSignal(bool)
 
 class Worker(QtCore.QRunnable):
     """Imports file data.
@@ -58,7 +97,10 @@ class Worker(QtCore.QRunnable):
     object, which is then passed to `reader()` to create an iterable reader
     for reading the file's content. That reader is then iterated upon until
     exausted or `stop()` is called, and each object produced by that reader
-    is passed to `readOne()`. Finally, `finish()` is called.
+    is passed to `prepareOne()`, whose result is passed to `readOne()`,
+    unless `skipOne()` returns `True` for that object. After `readOne()`
+    returns, `afterReadOne()` is called with the same object. Finally,
+    `finish()` is called.
     """
 
     def __init__(self, filepath: str) -> None:
@@ -68,6 +110,19 @@ class Worker(QtCore.QRunnable):
         self._signals  = WorkerSignals()
         self._stop_ev  = threading.Event()
 
+        self._read_count  = 0
+        self._phase_times = {'parse': 0.0, 'prepare': 0.0, 'import': 0.0, 'finish': 0.0}
+
+        self._is_verbose         = False
+        self._progress_interval  = 0.25
+        self._next_progress_time = 0.0
+        self._start_time         = 0.0
+        self._bytes_total        = 0
+        self._current_obj        = None
+
+    def filepath(self) -> str:
+        return self._filepath
+
     def open(self, filepath: str) -> typing.IO:
         """Returns a file-like object from `filepath`."""
 
@@ -78,6 +133,19 @@ class Worker(QtCore.QRunnable):
 
         return iter(file.readlines())
 
+    def prepareOne(self, obj: typing.Any) -> typing.Any:
+        """Returns the object to be passed to `readOne()` for an object
+        yielded by an iteration of `reader()`.
+
+        Unlike `readOne()`, this method may be called on another process,
+        such as by `ImportQueue`. Therefore, it should only convert `obj`
+        rather than access the database or emit signals, and both `obj`
+        and the returned object should be picklable. The default
+        implementation returns `obj`.
+        """
+
+        return obj
+
     def readOne(self, obj: typing.Any):
         """Reads one object yielded by an iteration of `reader()`.
         
@@ -86,6 +154,38 @@ class Worker(QtCore.QRunnable):
 
         pass
 
+    def skipOne(self, obj: typing.Any) -> bool:
+        """Returns whether `obj` should be skipped rather than passed to `readOne()`.
+
+        Note that `obj` is passed to this method before `prepareOne()`,
+        unless it was already prepared by the caller of `read()`.
+
+        The default implementation returns `False`.
+        """
+
+        return False
+
+    def afterReadOne(self, obj: typing.Any):
+        """Called after `readOne(obj)` returns."""
+
+        pass
+
+    def progressLabel(self, obj: typing.Any) -> str:
+        """Returns a short description of `obj` for `WorkerProgress.current`.
+
+        The default implementation returns an empty string.
+        """
+
+        return ''
+
+    def bytesRead(self) -> int:
+        """Returns the number of bytes read from the file so far, or 0 if unknown.
+
+        The default implementation returns 0.
+        """
+
+        return 0
+
     def finish(self, completed: bool):
         """Finishes the reading process.
         
@@ -95,26 +195,135 @@ class Worker(QtCore.QRunnable):
 
         pass
 
-    def read(self, file: typing.IO) -> bool:
+    def read(self, file: typing.IO, objects: typing.Optional[typing.Iterable[typing.Any]] = None) -> bool:
         """Reads `file` in a loop.
+
+        If `objects` is not `None`, it is iterated upon instead of
+        `reader(file)`, and its objects are passed to `readOne()` as
+        they are. This allows `file` to be parsed and its objects to be
+        prepared elsewhere, such as in another process, by the same
+        `reader()` and `prepareOne()`.
         
         Returns `False` if reading stopped due to `stop()` being
         called, and `True` if due to exaustion of `reader(file)`.
         """
 
-        reader = self.reader(file)
+        is_prepared = objects is not None
+        reader      = iter(objects) if is_prepared else self.reader(file)
 
         while True:
             if self._stop_ev.is_set():
                 return False
 
             try:
-                self.readOne(next(reader))
+                last_time = time.perf_counter()
+                obj       = next(reader)
+                last_time = self._addPhaseTime('parse', last_time)
+
+                self._read_count += 1
+                self._current_obj = obj
+
+                if time.monotonic() >= self._next_progress_time:
+                    self.emitProgress()
+
+                if self.skipOne(obj):
+                    continue
+
+                if not is_prepared:
+                    obj       = self.prepareOne(obj)
+                    last_time = self._addPhaseTime('prepare', last_time)
+
+                self.readOne(obj)
+                self.afterReadOne(obj)
+                self._addPhaseTime('import', last_time)
+
             except StopIteration:
                 break
 
         return True
 
+    def readCount(self) -> int:
+        """Returns the number of objects yielded by `reader()` so far,
+        including skipped objects.
+        """
+
+        return self._read_count
+
+    def phaseTimes(self) -> typing.Dict[str, float]:
+        """Returns the time, in seconds, spent so far in each phase of `run()`.
+
+        The phases are "parse", spent iterating over `reader()`, "prepare",
+        spent in `prepareOne()`, "import", spent in `readOne()` and
+        `afterReadOne()`, and "finish", spent in `finish()`.
+
+        If `read()` is passed objects that were already prepared, the time
+        spent receiving them is accounted for as "parse".
+        """
+
+        return dict(self._phase_times)
+
+    def rowCount(self) -> int:
+        """Returns the number of rows written so far by `self`.
+
+        The default implementation returns 0.
+        """
+
+        return 0
+
+    def fileHash(self, file: typing.IO) -> str:
+        """Returns a hex digest identifying the contents of the file being read.
+
+        The default implementation hashes the whole content of `filepath()`.
+        """
+
+        digest = hashlib.sha256()
+
+        with open(self._filepath, 'rb') as binary_file:
+            for chunk in iter(lambda: binary_file.read(1024 * 1024), b''):
+                digest.update(chunk)
+
+        return digest.hexdigest()
+
+    def isVerbose(self) -> bool:
+        return self._is_verbose
+
+    def setVerbose(self, verbose: bool):
+        """Sets whether messages about each object read are emitted.
+
+        This should be called before `self` starts running.
+        """
+
+        self._is_verbose = verbose
+
+    def progressInterval(self) -> float:
+        return self._progress_interval
+
+    def setProgressInterval(self, interval: float):
+        """Sets the minimum time in seconds between two `progressed` signals."""
+
+        self._progress_interval = interval
+
+    def progress(self) -> WorkerProgress:
+        """Returns the current progress of `self`."""
+
+        current_obj = self._current_obj
+
+        return WorkerProgress(
+            read_count  = self._read_count,
+            row_count   = self.rowCount(),
+            bytes_read  = self.bytesRead(),
+            bytes_total = self._bytes_total,
+            current     = self.progressLabel(current_obj) if current_obj is not None else '',
+            elapsed     = time.perf_counter() - self._start_time if self._start_time > 0 else 0.0
+        )
+
+    def emitProgress(self):
+        """Emits `progressed` with `progress()` and schedules the next emission."""
+
+        self._next_progress_time = time.monotonic() + self._progress_interval
+
+        self.signals().progressed.emit(self.progress())
+
     def stop(self):
         """Stops the file-reading process, if any.
         
@@ -131,15 +340,36 @@ class Worker(QtCore.QRunnable):
 
         return self._signals
 
-    def emitMessage(self, message: str):
-        """This function is thread-safe."""
+    def emitMessage(self, message: str, level: int = logging.INFO):
+        """Emits `message` with the severity `level`, a level of the module `logging`.
+
+        This function is thread-safe.
+        """
+
+        self.signals().messaged.emit(message, level)
+
+    def emitVerboseMessage(self, message: str):
+        """Emits `message` with the level `logging.DEBUG` if `isVerbose()` is `True`.
+
+        Callers emitting several messages per object should check
+        `isVerbose()` beforehand to avoid formatting messages in vain.
+        """
 
-        self.signals().messaged.emit(message)
+        if self._is_verbose:
+            self.signals().messaged.emit(message, logging.DEBUG)
 
     ################################################################################
     # Overriden methods
     ################################################################################
     def run(self) -> None:
+        self._start_time = time.perf_counter()
+
+        # The size of the file doesn't change while it's read.
+        try:
+            self._bytes_total = os.path.getsize(self._filepath)
+        except OSError:
+            self._bytes_total = 0
+
         try:
             with self.open(self._filepath) as file:
                 completed = self.read(file)
@@ -154,5 +384,20 @@ class Worker(QtCore.QRunnable):
             self.signals().error.emit(exc_type, exc_value, exc_desc)
 
         else:
+            start_time = time.perf_counter()
+
             self.finish(completed)
-            self.signals().finished.emit(completed)
\ No newline at end of file
+            self._addPhaseTime('finish', start_time)
+
+            self.emitProgress()
+            self.signals().finished.emit(completed)
+
+    ################################################################################
+    # Private methods
+    ################################################################################
+    def _addPhaseTime(self, phase: str, start_time: float) -> float:
+        end_time = time.perf_counter()
+
+        self._phase_times[phase] += end_time - start_time
+
+        return end_time
\ No newline at end of file
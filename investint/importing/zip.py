@@ -1,3 +1,6 @@
+import hashlib
+import io
+import typing
 import zipfile
 from investint import importing
 
@@ -5,8 +8,91 @@ __all__ = [
     'ZipWorker'
 ]
 
+class _ByteCountingFile(io.FileIO):
+    """A binary file that counts the number of bytes read from it."""
+
+    def __init__(self, filepath: str) -> None:
+        super().__init__(filepath, 'rb')
+
+        self.bytes_read = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = super().read(size)
+        self.bytes_read += len(data)
+        return data
+
+    def readall(self) -> bytes:
+        data = super().readall()
+        self.bytes_read += len(data)
+        return data
+
+    def readinto(self, buffer) -> typing.Optional[int]:
+        count = super().readinto(buffer)
+        self.bytes_read += count or 0
+        return count
+
+MemberFilter = typing.Callable[[str, typing.IO[bytes]], typing.Optional[typing.IO[bytes]]]
+
+class _ByteCountingZipFile(zipfile.ZipFile):
+    """A `ZipFile` that counts the number of bytes read from its file.
+
+    Since members of a Zip file are compressed and stored next to each
+    other, the number of bytes read approaches the file size as members
+    are read, even if they're read concurrently.
+
+    Members opened for reading are passed to `member_filter`, if any,
+    whose return value is returned by `open()` instead. If it returns
+    `None`, the member is skipped: `open()` returns an empty file and
+    the compressed size of the member is counted as read.
+    """
+
+    def __init__(self, filepath: str, member_filter: typing.Optional[MemberFilter] = None) -> None:
+        self.counting_file = _ByteCountingFile(filepath)
+        self.member_filter = member_filter
+
+        try:
+            super().__init__(self.counting_file)
+        except:
+            self.counting_file.close()
+            raise
+
+    def open(self, name: typing.Union[str, zipfile.ZipInfo], mode: str = 'r', *args, **kwargs) -> typing.IO[bytes]:
+        member = super().open(name, mode, *args, **kwargs)
+
+        if mode == 'r' and self.member_filter is not None:
+            info     = name if isinstance(name, zipfile.ZipInfo) else self.getinfo(name)
+            filtered = self.member_filter(info.filename, member)
+
+            if filtered is None:
+                member.close()
+
+                self.counting_file.bytes_read += info.compress_size
+
+                return io.BytesIO()
+
+            return filtered
+
+        return member
+
+    def close(self) -> None:
+        try:
+            super().close()
+        finally:
+            # `ZipFile` doesn't close file objects that are passed to it.
+            self.counting_file.close()
+
 class ZipWorker(importing.Worker):
-    """Implements a `Worker` that reads Zip files."""
+    """Implements a `Worker` that reads Zip files.
+
+    Subclasses may reimplement `filterMember()` to filter the contents of
+    members of the Zip file as they're read, such as to skip members that
+    are not needed or to drop lines of a member before they're parsed.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+
+        self._zip_file: typing.Optional[_ByteCountingZipFile] = None
 
     ################################################################################
     # Overriden methods
@@ -14,4 +100,47 @@ class ZipWorker(importing.Worker):
     def open(self, filepath: str) -> zipfile.ZipFile:
         """Reimplementation of `Worker.open()` to open a `ZipFile`."""
 
-        return zipfile.ZipFile(filepath)
\ No newline at end of file
+        self._zip_file = _ByteCountingZipFile(filepath, self.filterMember)
+
+        return self._zip_file
+
+    def bytesRead(self) -> int:
+        """Reimplementation of `Worker.bytesRead()` to return
+        the number of bytes read from the Zip file.
+        """
+
+        if self._zip_file is None:
+            return 0
+
+        return self._zip_file.counting_file.bytes_read
+
+    def fileHash(self, file: zipfile.ZipFile) -> str:
+        """Reimplementation of `Worker.fileHash()` to hash the name, size,
+        and CRC-32 of each member of `file`.
+
+        Since these are stored in the central directory of a Zip file,
+        this avoids reading the whole file, which may be several GB long.
+        """
+
+        digest = hashlib.sha256()
+
+        for info in file.infolist():
+            digest.update(f'{info.filename}:{info.file_size}:{info.CRC}\n'.encode('utf-8'))
+
+        return digest.hexdigest()
+
+    ################################################################################
+    # Public methods
+    ################################################################################
+    def filterMember(self, name: str, member: typing.IO[bytes]) -> typing.Optional[typing.IO[bytes]]:
+        """Returns a binary file object to be read in place of `member`,
+        the member named `name` being opened for reading, or `None` to
+        skip that member, which is then read as an empty file without
+        being decompressed.
+
+        The returned object is closed in place of `member`, and thus must
+        close `member` when closed. The default implementation returns
+        `member` unchanged.
+        """
+
+        return member
\ No newline at end of file
@@ -1,4 +1,9 @@
 from investint.models.qt.reversible_proxy         import *
+from investint.models.qt.import_log               import *
+from investint.models.qt.query_loader             import *
+from investint.models.qt.query_cache              import *
+from investint.models.qt.company_snapshot         import *
+from investint.models.qt.display_text_cache       import *
 from investint.models.qt.account_tree             import *
 from investint.models.qt.comparative_account_tree import *
 from investint.models.qt.dmpl_account_tree        import *
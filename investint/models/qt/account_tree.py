@@ -3,35 +3,49 @@ import collections
 import cvm
 import datetime
 import enum
+import numpy
 import sqlalchemy     as sa
 import sqlalchemy.orm as sa_orm
 import typing
-from PyQt5        import QtCore
-from PyQt5.QtCore import Qt
-from investint    import database, models
+from PyQt5                import QtCore
+from PyQt5.QtCore         import Qt
+from investint            import database, models
+from investint.models.sql import BaseAccount
+from investint.models.qt  import DisplayTextCache
 
 __all__ = [
     'AccountTreeModel',
     'AccountTreeItem'
 ]
 
+def _codeSortKey(code: str) -> typing.Tuple[int, ...]:
+    # '2.01.04' -> (2, 1, 4)
+    return tuple(map(int, code.split('.')))
+
 class AccountTreeItem:
     __slots__ = (
         '_code',
         '_name',
-        '_quantities',
+        '_quantity_row',
         '_parent',
-        '_children'
+        '_children',
+        '_row'
     )
 
     def __init__(self, code: str, name: str):
-        self._code       = code
-        self._name       = name
-        self._quantities = []
+        self._code = code
+        self._name = name
+
+        # Row of the quantities of this item in the quantity array of its model, if any.
+        self._quantity_row = -1
 
         self._parent: typing.Optional[AccountTreeItem] = None
         self._children: typing.List[AccountTreeItem]   = []
 
+        # Index of this item in `_parent._children`, which is kept by `_appendChild()`
+        # and `_sort()`, so that `position()` doesn't search for it.
+        self._row = 0
+
     def code(self, extended: bool = True) -> str:
         if extended:
             return self._code
@@ -49,32 +63,17 @@ class AccountTreeItem:
     def name(self) -> str:
         return self._name
 
-    def quantities(self) -> typing.List[typing.Optional[int]]:
-        return self._quantities.copy()
-
     def level(self) -> int:
         return self._code.count('.') + 1
 
     def parentCode(self) -> str:
-        # 1       -> ''
-        # 1.01    -> '1'
-        # 2.01    -> '2'
-        # 2.01.04 -> '2.01'
-        index = self._code.rfind('.')
-
-        if index != -1:
-            return self._code[:index]
-
-        return ''
+        return BaseAccount.parentCodeOf(self._code)
 
     def parent(self) -> typing.Optional[AccountTreeItem]:
         return self._parent
 
     def position(self) -> int:
-        if self._parent is None:
-            return 0
-
-        return self._parent._children.index(self)
+        return self._row
 
     def child(self, row: int) -> AccountTreeItem:
         return self._children[row]
@@ -88,28 +87,41 @@ class AccountTreeItem:
     def children(self) -> typing.List[AccountTreeItem]:
         return self._children.copy()
     
-    def appendQuantity(self, quantity: typing.Optional[int]):
-        self._quantities.append(quantity)
-
     def _appendChild(self, child: AccountTreeItem):
-        self._children.append(child)
         child._parent = self
+        child._row    = len(self._children)
+
+        self._children.append(child)
 
     def _appendChildren(self, children: typing.Iterable[AccountTreeItem]):
         for child in children:
             self._appendChild(child)
 
+    def sortKey(self) -> typing.Tuple[int, ...]:
+        return _codeSortKey(self._code)
+
     def _sort(self):
         self._children.sort(key=lambda child: int(child.code(extended=False)))
 
-        for child in self._children:
+        for row, child in enumerate(self._children):
+            child._row = row
             child._sort()
 
 class AccountTreeModel(QtCore.QAbstractItemModel):
+    """Shows accounts as a tree, with columns of code, name, and quantities.
+
+    Quantities of all accounts are stored in a single 2-D integer array,
+    indexed by the quantity row of each item and by numeric column, where
+    missing quantities are stored as `missing_quantity`. They may be read
+    without copying by `quantity()` and `quantities()`.
+    """
+
     class Column(enum.IntEnum):
         Code = 0
         Name = 1
 
+    missing_quantity = numpy.iinfo(numpy.int64).min
+
     @staticmethod
     def tr(source_text, disambiguation: typing.Optional[str] = None, n: int = -1) -> str:
         return QtCore.QCoreApplication.translate('AccountTreeModel', source_text, disambiguation, n)
@@ -120,6 +132,18 @@ class AccountTreeModel(QtCore.QAbstractItemModel):
         self._header_texts        = ['', '']
         self._root_item           = AccountTreeItem('', '')
         self._numeric_column_data = []
+        self._quantities          = numpy.empty((0, 0), dtype=numpy.int64)
+        self._quantity_count      = 0
+        self._text_cache          = DisplayTextCache(self)
+
+        # Accounts set by `setAccounts()` are stored flat, indexed by their quantity
+        # row, and items are only created for top-level accounts and the children of
+        # accounts fetched by `fetchMore()`, which views do upon expanding them.
+        # `_child_records` maps the quantity row of an account whose children were
+        # not created yet to the quantity rows of its children, in the order shown.
+        self._account_codes: typing.List[str] = []
+        self._account_names: typing.List[str] = []
+        self._child_records: typing.Dict[int, typing.List[int]] = {}
 
         self.retranslateUi()
 
@@ -130,6 +154,11 @@ class AccountTreeModel(QtCore.QAbstractItemModel):
         self.beginResetModel()
         self._root_item = AccountTreeItem('', '')
         self._numeric_column_data.clear()
+        self._quantities     = numpy.empty((0, 0), dtype=numpy.int64)
+        self._quantity_count = 0
+        self._account_codes  = []
+        self._account_names  = []
+        self._child_records  = {}
         self.endResetModel()
 
     def setNumericColumnCount(self, count: int) -> None:
@@ -140,13 +169,17 @@ class AccountTreeModel(QtCore.QAbstractItemModel):
 
             self.beginRemoveColumns(QtCore.QModelIndex(), static_count + count, static_count + current_count - 1)
             self._numeric_column_data = self._numeric_column_data[:count]
+            self._quantities          = self._quantities[:, :count].copy()
             self.endRemoveColumns()
 
         elif count > current_count:
             static_count = self.staticColumnCount()
 
+            missing_quantities = numpy.full((len(self._quantities), count - current_count), self.missing_quantity, dtype=numpy.int64)
+
             self.beginInsertColumns(QtCore.QModelIndex(), static_count + current_count, static_count + count - 1)
             self._numeric_column_data += [None] * (count - current_count)
+            self._quantities           = numpy.hstack((self._quantities, missing_quantities))
             self.endInsertColumns()
 
     def setNumericColumnData(self, column: int, data: typing.Any) -> None:
@@ -171,20 +204,110 @@ class AccountTreeModel(QtCore.QAbstractItemModel):
         self.beginInsertRows(QtCore.QModelIndex(), row_count, row_count)
 
         account_item = AccountTreeItem(code, name)
-
-        for column in range(self.numericColumnCount()):
-            column_data = self.numericColumnData(column)
-
-            try:
-                quantity = int(quantities[column_data])
-            except (KeyError, ValueError, TypeError):
-                quantity = None
-            
-            account_item.appendQuantity(quantity)
+        account_item._quantity_row = self._appendQuantities(self._quantityRow(self._numeric_column_data, quantities))
 
         self._root_item._appendChild(account_item)
         self.endInsertRows()
 
+    def setAccounts(self,
+                    column_data: typing.Sequence[typing.Any],
+                    accounts: typing.Iterable[typing.Tuple[str, str, typing.Dict[typing.Any, int]]]
+    ) -> None:
+        """Replaces all numeric columns and accounts at once.
+
+        The data of each numeric column is taken from `column_data`, and each
+        account is a tuple of code, name, and a dictionary mapping data of
+        numeric columns to quantities, as passed to `append()`.
+
+        Unlike calling `setNumericColumnCount()`, `append()`, and `buildTree()`,
+        this method links each account to its parent in a single pass over the
+        accounts sorted by code, and notifies views of a single reset.
+
+        See also `setOrderedAccounts()`.
+        """
+
+        column_data   = list(column_data)
+        codes         = []
+        names         = []
+        quantity_rows = []
+
+        for code, name, quantities in accounts:
+            codes.append(code)
+            names.append(name)
+            quantity_rows.append(self._quantityRow(column_data, quantities))
+
+        # Parents are sorted before their children, and siblings in the order shown.
+        records      = sorted(range(len(codes)), key=lambda record: _codeSortKey(codes[record]))
+        parent_codes = [BaseAccount.parentCodeOf(code) for code in codes]
+
+        self._setRecords(column_data, codes, names, quantity_rows, parent_codes, records)
+
+    def setOrderedAccounts(self,
+                           column_data: typing.Sequence[typing.Any],
+                           accounts: typing.Iterable[typing.Tuple[str, str, str, typing.Dict[typing.Any, int]]]
+    ) -> None:
+        """Same as `setAccounts()`, except that each account is a tuple of code,
+        parent code, name, and quantities, and that accounts are already in the
+        order shown, with parents before their children, as when queried by
+        `BaseAccount.sort_key`.
+
+        Accounts are neither sorted nor have their codes parsed, so this is
+        preferred when `BaseAccount.parent_code` and `BaseAccount.sort_key`
+        are known.
+        """
+
+        column_data   = list(column_data)
+        codes         = []
+        parent_codes  = []
+        names         = []
+        quantity_rows = []
+
+        for code, parent_code, name, quantities in accounts:
+            codes.append(code)
+            parent_codes.append(parent_code)
+            names.append(name)
+            quantity_rows.append(self._quantityRow(column_data, quantities))
+
+        self._setRecords(column_data, codes, names, quantity_rows, parent_codes, range(len(codes)))
+
+    def fetchAll(self) -> None:
+        """Creates the items of all accounts not yet fetched by `fetchMore()`, notifying views of a single reset."""
+
+        if len(self._child_records) == 0:
+            return
+
+        self.beginResetModel()
+        self._createAllChildren()
+        self.endResetModel()
+
+    def quantity(self, index: QtCore.QModelIndex, column: int) -> typing.Optional[int]:
+        """Returns the quantity of the account at `index` in the numeric column `column`, or `None` if missing."""
+
+        item: typing.Optional[AccountTreeItem] = index.internalPointer()
+
+        if item is None or item._quantity_row == -1:
+            return None
+
+        quantity = self._quantities[item._quantity_row, column]
+
+        return None if quantity == self.missing_quantity else int(quantity)
+
+    def quantities(self, index: QtCore.QModelIndex) -> numpy.ndarray:
+        """Returns a read-only view of the quantities of the account at `index`,
+        in which missing quantities are `missing_quantity`.
+        """
+
+        item: typing.Optional[AccountTreeItem] = index.internalPointer()
+
+        if item is None or item._quantity_row == -1:
+            quantities = numpy.full(self.numericColumnCount(), self.missing_quantity, dtype=numpy.int64)
+        else:
+            quantities = self._quantities[item._quantity_row].view()
+
+        quantities.flags.writeable = False
+
+        return quantities
+
     def staticColumnCount(self) -> int:
         return len(AccountTreeModel.Column)
 
@@ -193,6 +316,7 @@ class AccountTreeModel(QtCore.QAbstractItemModel):
             return
 
         self.beginResetModel()
+        self._createAllChildren()
 
         items_by_code  = {}
         codes_by_level = collections.defaultdict(list)
@@ -258,14 +382,15 @@ class AccountTreeModel(QtCore.QAbstractItemModel):
             if   column == Column.Code: return item.code()
             elif column == Column.Name: return item.name()
         else:
-            quantities = item.quantities()
-
             try:
-                quantity = int(quantities[column - len(Column)])
-            except (IndexError, TypeError):
+                quantity = self.quantity(index, column - len(Column))
+            except IndexError:
+                return ''
+
+            if quantity is None:
                 return ''
-            else:
-                return QtCore.QLocale().toCurrencyString(quantity)
+
+            return DisplayTextCache.locale().toCurrencyString(quantity)
 
         return ''
 
@@ -282,10 +407,89 @@ class AccountTreeModel(QtCore.QAbstractItemModel):
         self.setHeaderText(0, AccountTreeModel.tr('Code'))
         self.setHeaderText(1, AccountTreeModel.tr('Name'))
 
+    ################################################################################
+    # Private methods
+    ################################################################################
+    def _quantityRow(self, column_data: typing.Sequence[typing.Any], quantities: typing.Dict[typing.Any, int]) -> typing.List[int]:
+        quantity_row = []
+
+        for data in column_data:
+            try:
+                quantity_row.append(int(quantities[data]))
+            except (KeyError, ValueError, TypeError):
+                quantity_row.append(self.missing_quantity)
+
+        return quantity_row
+
+    def _setRecords(self,
+                    column_data: typing.List[typing.Any],
+                    codes: typing.List[str],
+                    names: typing.List[str],
+                    quantity_rows: typing.List[typing.List[int]],
+                    parent_codes: typing.List[str],
+                    records: typing.Iterable[int]
+    ):
+        """Replaces all accounts by those in `records`, which are in the order shown."""
+
+        record_by_code = {}
+        child_records  = collections.defaultdict(list)
+
+        for record in records:
+            record_by_code[codes[record]] = record
+            child_records[record_by_code.get(parent_codes[record], -1)].append(record)
+
+        self.beginResetModel()
+        self._root_item           = AccountTreeItem('', '')
+        self._numeric_column_data = column_data
+        self._quantities          = numpy.array(quantity_rows, dtype=numpy.int64).reshape(len(quantity_rows), len(column_data))
+        self._quantity_count      = len(quantity_rows)
+        self._account_codes       = codes
+        self._account_names       = names
+        self._child_records       = dict(child_records)
+        self._createChildren(self._root_item, self._child_records.pop(-1, []))
+        self.endResetModel()
+
+    def _createChildren(self, parent_item: AccountTreeItem, records: typing.List[int]):
+        for record in records:
+            item = AccountTreeItem(self._account_codes[record], self._account_names[record])
+            item._quantity_row = record
+
+            parent_item._appendChild(item)
+
+    def _createAllChildren(self):
+        items = [self._root_item]
+
+        while len(items) != 0 and len(self._child_records) != 0:
+            item    = items.pop()
+            records = self._child_records.pop(item._quantity_row, None)
+
+            if records is not None:
+                self._createChildren(item, records)
+
+            items.extend(item._children)
+
+    def _appendQuantities(self, quantity_row: typing.List[int]) -> int:
+        """Stores `quantity_row` in the quantity array, growing it if needed, and returns its row."""
+
+        row = self._quantity_count
+
+        if row == len(self._quantities):
+            # Double the capacity, so that appending an account doesn't copy all quantities each time.
+            missing_quantities = numpy.full((max(row, 16), self.numericColumnCount()), self.missing_quantity, dtype=numpy.int64)
+            self._quantities   = numpy.vstack((self._quantities, missing_quantities))
+
+        self._quantities[row] = quantity_row
+        self._quantity_count += 1
+
+        return row
+
     ################################################################################
     # Overriden methods
     ################################################################################
     def index(self, row: int, column: int, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> QtCore.QModelIndex:
+        if not self.hasIndex(row, column, parent):
+            return QtCore.QModelIndex()
+
         if not parent.isValid():
             parent_item = self._root_item
         else:
@@ -305,14 +509,14 @@ class AccountTreeModel(QtCore.QAbstractItemModel):
         item: AccountTreeItem = index.internalPointer()
         parent_item = item.parent()
 
-        if parent_item is None:
+        if parent_item is None or parent_item is self._root_item:
             return QtCore.QModelIndex()
         else:
             return self.createIndex(parent_item.position(), 0, parent_item)
 
     def data(self, index: QtCore.QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> typing.Any:
         if role == Qt.ItemDataRole.DisplayRole:
-            return self.text(index)
+            return self._text_cache.text((index.internalId(), index.column()), self.text, index)
         elif role == Qt.ItemDataRole.TextAlignmentRole:
             return self.textAlignment(index)
         else:
@@ -340,9 +544,42 @@ class AccountTreeModel(QtCore.QAbstractItemModel):
         
         return False
 
+    def hasChildren(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> bool:
+        if not parent.isValid():
+            return self._root_item.hasChildren()
+
+        if parent.column() != 0:
+            return False
+
+        item: AccountTreeItem = parent.internalPointer()
+
+        return item.hasChildren() or item._quantity_row in self._child_records
+
+    def canFetchMore(self, parent: QtCore.QModelIndex) -> bool:
+        if not parent.isValid() or parent.column() != 0:
+            return False
+
+        item: AccountTreeItem = parent.internalPointer()
+
+        return item._quantity_row in self._child_records
+
+    def fetchMore(self, parent: QtCore.QModelIndex) -> None:
+        if not self.canFetchMore(parent):
+            return
+
+        item: AccountTreeItem = parent.internalPointer()
+        records = self._child_records.pop(item._quantity_row)
+
+        self.beginInsertRows(parent, 0, len(records) - 1)
+        self._createChildren(item, records)
+        self.endInsertRows()
+
     def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
         if not parent.isValid():
             parent_item = self._root_item
+        elif parent.column() != 0:
+            # Only the first column has children.
+            return 0
         else:
             parent_item = parent.internalPointer()
         
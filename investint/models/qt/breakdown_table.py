@@ -1,10 +1,22 @@
+import collections
+import datetime
+import enum
+import numpy
 import typing
-from PyQt5 import QtCore
+from PyQt5               import QtCore
+from investint.models.qt import DisplayTextCache
 
 __all__ = [
+    'BreakdownColumnKind',
     'BreakdownTableModel'
 ]
 
+class BreakdownColumnKind(enum.IntEnum):
+    Number             = 0
+    HorizontalAnalysis = 1
+    VerticalAnalysis   = 2
+    YearOverYear       = 3
+
 class BreakdownTableModel(QtCore.QAbstractTableModel):
     """Implements a `QAbstractTableModel` for showing numerical data.
 
@@ -39,6 +51,16 @@ class BreakdownTableModel(QtCore.QAbstractTableModel):
     | b |  20  |  50  |
     | c |  30  |  60  |
 
+    Columns may also be appended at once by `extend()`, or replace all
+    columns by `setColumns()`, which notify views only once:
+
+    >>> model.extend([(2012, {'a': 70}), (2013, {'a': 80})])
+    >>> model.columnCount()
+    4
+    >>> model.setColumns([(2010, {'c': 30, 'b': 20, 'a': 10}), (2011, {'b': 50, 'a': 40, 'c': 60})])
+    >>> model.columnCount()
+    2
+
     Also note that although the above calls to `append()` passed
     the values 2010 and 2011 as `int`, the default implementation
     of `columnName()` simply returns `columnData()` as `str`, which
@@ -59,7 +81,7 @@ class BreakdownTableModel(QtCore.QAbstractTableModel):
     >>> model.number('a', 0)
     10
     >>> model.number('a', 1)
-    3
+    3.0
     >>> model.number('a', 2)
     40
     >>> tuple(model.isHorizontalAnalysisColumn(column) for column in range(3))
@@ -80,12 +102,33 @@ class BreakdownTableModel(QtCore.QAbstractTableModel):
     Thus, growth is seen from a left to right perspective. This order may be
     changed by using `ReversibleProxyModel`.
 
+    Two other analyses may be toggled likewise. Vertical analysis (VA) inserts
+    a column after each user-defined column with the ratio of each number to
+    the number of `verticalAnalysisRow()` in that column, such as the share of
+    total assets of each account of a balance sheet. Year-over-year analysis
+    (YoY) inserts a column after each user-defined column with the growth ratio
+    from the column returned by `yearOverYearColumn()`, which by default is the
+    column whose data is a year before, if any:
+
+    >>> model.setVerticalAnalysisEnabled(True)
+    >>> model.setVerticalAnalysisRow('c')
+    >>> model.columnName(1)
+    'VA %'
+    >>> model.number('a', 1)
+    0.3333333333333333
+
+    Analysis columns are not stored, but computed from the columns they
+    analyze once their numbers are requested, and kept in a small memo.
+    Thus, toggling an analysis only inserts or removes its columns.
+
     As demonstrated, this class is made to have a static number of rows and
     a dynamic number of columns, which is a not very common way of using
     `QAbstractTableModel`, but which is the standard way of laying out
     financial data, for example.
     """
 
+    memo_size = 64
+
     def __init__(self,
                  row_names: typing.Iterable[str],
                  parent: typing.Optional[QtCore.QObject] = None
@@ -96,60 +139,102 @@ class BreakdownTableModel(QtCore.QAbstractTableModel):
         #----------------|-------------------|-------------------|-------------------|-------------------|
         #                |   HHeaderData[0]  |   HHeaderData[1]  |  HHeaderData[2]   |   HHeaderData[M]  |
         #----------------|-------------------|-------------------|-------------------|-------------------|
-        # VHeaderData[0] | NumericData[0][0] | NumericData[1][0] | NumericData[2][0] | NumericData[M][0] |
+        # VHeaderData[0] | NumericData[0, 0] | NumericData[1, 0] | NumericData[2, 0] | NumericData[M, 0] |
         #----------------|-------------------|-------------------|-------------------|-------------------|
-        # VHeaderData[1] | NumericData[0][1] | NumericData[1][1] | NumericData[2][1] | NumericData[M][1] |
+        # VHeaderData[1] | NumericData[0, 1] | NumericData[1, 1] | NumericData[2, 1] | NumericData[M, 1] |
         #----------------|-------------------|-------------------|-------------------|-------------------|
-        # VHeaderData[2] | NumericData[0][2] | NumericData[1][2] | NumericData[2][2] | NumericData[M][2] |
+        # VHeaderData[2] | NumericData[0, 2] | NumericData[1, 2] | NumericData[2, 2] | NumericData[M, 2] |
         #----------------|-------------------|-------------------|-------------------|-------------------|
-        # VHeaderData[N] | NumericData[0][N] | NumericData[1][N] | NumericData[2][N] | NumericData[M][N] |
+        # VHeaderData[N] | NumericData[0, N] | NumericData[1, N] | NumericData[2, N] | NumericData[M, N] |
         #----------------|-------------------|-------------------|-------------------|-------------------|
+        #
+        # `NumericData` is a 2-D float array indexed by column and row, so that
+        # each column is contiguous, and missing numbers are stored as NaN.
+        # Only columns appended by the user are stored in it, and `_columns`
+        # maps each column of this model to a pair of kind and index in
+        # `NumericData`, so that analysis columns refer to the column they
+        # analyze, such as [(Number, 0), (HorizontalAnalysis, 1), (Number, 1)].
         self._vheader_data = list(row_names)
         self._hheader_data = []
-        self._numeric_data = []
+        self._numeric_data = numpy.empty((0, len(self._vheader_data)))
+        self._columns: typing.List[typing.Tuple[BreakdownColumnKind, int]] = []
+        self._column_from_data: typing.Dict[typing.Any, int] = {}
 
-        # Horizontal analysis
-        self._ha_enabled = False
+        # Analyses
+        self._ha_enabled  = False
+        self._va_enabled  = False
+        self._yoy_enabled = False
+        self._va_row      = 0
+        self._memo: collections.OrderedDict[typing.Tuple[BreakdownColumnKind, int], numpy.ndarray] = collections.OrderedDict()
+
+        self._text_cache = DisplayTextCache(self)
 
     def setHorizontalAnalysisEnabled(self, enabled: bool):
-        if self._ha_enabled == enabled:
-            return
+        if self._ha_enabled != enabled:
+            self._ha_enabled = enabled
+            self._updateColumns()
+    
+    def isHorizontalAnalysisEnabled(self) -> bool:
+        return self._ha_enabled
 
-        self.beginResetModel()
+    def isHorizontalAnalysisColumn(self, column: int) -> bool:
+        return self.columnKind(column) == BreakdownColumnKind.HorizontalAnalysis
+
+    def setVerticalAnalysisEnabled(self, enabled: bool):
+        if self._va_enabled != enabled:
+            self._va_enabled = enabled
+            self._updateColumns()
 
-        new_numeric_data = []
-        new_hheader_data = []
+    def isVerticalAnalysisEnabled(self) -> bool:
+        return self._va_enabled
 
-        if self._ha_enabled:
-            for column in range(self.columnCount()):
-                if not self.isHorizontalAnalysisColumn(column):
-                    new_numeric_data.append(self._numeric_data[column])
-                    new_hheader_data.append(self._hheader_data[column])
+    def isVerticalAnalysisColumn(self, column: int) -> bool:
+        return self.columnKind(column) == BreakdownColumnKind.VerticalAnalysis
+
+    @typing.overload
+    def setVerticalAnalysisRow(self, row: int):
+        ...
+
+    @typing.overload
+    def setVerticalAnalysisRow(self, row_name: str):
+        ...
+
+    def setVerticalAnalysisRow(self, row_or_name: typing.Union[int, str]):
+        """Sets the row to which numbers are compared by vertical analysis, which is 0 by default."""
+
+        if isinstance(row_or_name, str):
+            row = self.rowFromName(row_or_name)
         else:
-            column_count = self.columnCount()
+            row = row_or_name
 
-            if column_count > 0:
-                new_numeric_data.append(self._numeric_data[0])
-                new_hheader_data.append(self._hheader_data[0])
+        if self._va_row == row:
+            return
 
-            for column in range(1, column_count):
-                new_numeric_data.append(self.calculateHorizontalAnalysis(column - 1, column))
-                new_hheader_data.append(None)
+        self._va_row = row
+        self._forgetAnalyses()
 
-                new_numeric_data.append(self._numeric_data[column])
-                new_hheader_data.append(self._hheader_data[column])
+        if self.isVerticalAnalysisEnabled():
+            self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount() - 1, self.columnCount() - 1))
 
-        self._ha_enabled   = enabled
-        self._numeric_data = new_numeric_data
-        self._hheader_data = new_hheader_data
+    def verticalAnalysisRow(self) -> int:
+        return self._va_row
 
-        self.endResetModel()
-    
-    def isHorizontalAnalysisEnabled(self) -> bool:
-        return self._ha_enabled
+    def setYearOverYearAnalysisEnabled(self, enabled: bool):
+        if self._yoy_enabled != enabled:
+            self._yoy_enabled = enabled
+            self._updateColumns()
 
-    def isHorizontalAnalysisColumn(self, column: int) -> bool:
-        return self.isHorizontalAnalysisEnabled() and (column % 2) != 0
+    def isYearOverYearAnalysisEnabled(self) -> bool:
+        return self._yoy_enabled
+
+    def isYearOverYearAnalysisColumn(self, column: int) -> bool:
+        return self.columnKind(column) == BreakdownColumnKind.YearOverYear
+
+    def columnKind(self, column: int) -> BreakdownColumnKind:
+        return self._columns[column][0]
+
+    def isAnalysisColumn(self, column: int) -> bool:
+        return self.columnKind(column) != BreakdownColumnKind.Number
 
     def rowName(self, row: int) -> str:
         return self._vheader_data[row]
@@ -161,52 +246,89 @@ class BreakdownTableModel(QtCore.QAbstractTableModel):
             return -1
 
     def columnData(self, column: int) -> typing.Any:
-        return self._hheader_data[column]
+        kind, data_column = self._columns[column]
+
+        if kind != BreakdownColumnKind.Number:
+            return None
+
+        return self._hheader_data[data_column]
     
     def columnName(self, column: int) -> str:
-        if self.isHorizontalAnalysisColumn(column):
+        kind = self.columnKind(column)
+
+        if kind == BreakdownColumnKind.HorizontalAnalysis:
             return 'HA %'
+        elif kind == BreakdownColumnKind.VerticalAnalysis:
+            return 'VA %'
+        elif kind == BreakdownColumnKind.YearOverYear:
+            return 'YoY %'
         else:
             return str(self.columnData(column))
 
     def columnFromData(self, column_data: typing.Any) -> int:
         try:
-            return self._hheader_data.index(column_data)
-        except ValueError:
+            data_column = self._column_from_data[column_data]
+        except (KeyError, TypeError):
             return -1
 
+        return self._columns.index((BreakdownColumnKind.Number, data_column))
+
+    def yearOverYearColumn(self, data_column: int) -> int:
+        """Returns the index of the user-defined column to which the user-defined
+        column `data_column` is compared by year-over-year analysis, or -1 if none.
+
+        Note that both indexes are of user-defined columns, that is, in the order
+        they were appended, regardless of which analysis columns are shown. The
+        default implementation looks up the column whose data is a year before
+        that of `data_column`, if the latter is a `datetime.date` or a year as `int`.
+        """
+
+        column_data = self._hheader_data[data_column]
+
+        if isinstance(column_data, datetime.date):
+            try:
+                year_before = column_data.replace(year=column_data.year - 1)
+            except ValueError:
+                # 29 Feb
+                year_before = column_data.replace(year=column_data.year - 1, day=28)
+
+        elif isinstance(column_data, int) and not isinstance(column_data, bool):
+            year_before = column_data - 1
+
+        else:
+            return -1
+
+        return self._column_from_data.get(year_before, -1)
+
     def clear(self):
         self.beginResetModel()
-        self._hheader_data.clear()
-        self._numeric_data.clear()
+        self._clearColumns()
         self.endResetModel()
 
     def append(self, column_name: typing.Any, mapped_numbers: typing.Dict[str, typing.Optional[float]]):
-        numeric_column = [mapped_numbers.get(row_name, None) for row_name in self._vheader_data]
-        column_count   = self.columnCount()
-        
-        should_insert_ha_column = self.isHorizontalAnalysisEnabled() and column_count != 0
+        self.extend([(column_name, mapped_numbers)])
 
-        if should_insert_ha_column:
-            first_column = column_count
-            last_column  = column_count + 1
-        else:
-            first_column = column_count
-            last_column  = column_count
+    def extend(self, columns: typing.Iterable[typing.Tuple[typing.Any, typing.Dict[str, typing.Optional[float]]]]):
+        """Appends each pair of column data and mapped numbers in `columns`, as `append()` does.
 
-        self.beginInsertColumns(QtCore.QModelIndex(), first_column, last_column)
-        
-        if should_insert_ha_column:
-            self._hheader_data.append(None)
-            self._numeric_data.append([]) # Just append the column, we'll reset it after inserting `new_numeric_data`
+        Unlike calling `append()` for each column, numbers of all columns are
+        stored at once, and views are notified of a single column insertion.
+        """
 
-        self._hheader_data.append(column_name)
-        self._numeric_data.append(numeric_column)
+        self._appendColumns(*self._numericColumns(columns))
 
-        if should_insert_ha_column:
-            self._numeric_data[-2] = self.calculateHorizontalAnalysis(column_count - 1, last_column)
+    def setColumns(self, columns: typing.Iterable[typing.Tuple[typing.Any, typing.Dict[str, typing.Optional[float]]]]):
+        """Replaces all columns by `columns`, as if by `clear()` and `extend()`,
+        but notifying views of a single reset.
+        """
 
-        self.endInsertColumns()
+        column_data, numeric_data = self._numericColumns(columns)
+
+        self.beginResetModel()
+        self._clearColumns()
+        self._storeColumns(column_data, numeric_data)
+        self._columns = self._columnLayout()
+        self.endResetModel()
 
     @typing.overload
     def number(self, row: int, column: int) -> typing.Optional[float]:
@@ -221,11 +343,27 @@ class BreakdownTableModel(QtCore.QAbstractTableModel):
             row = self.rowFromName(row_or_name)
         else:
             row = row_or_name
-        
-        return self._numeric_data[column][row]
+
+        kind, data_column = self._columns[column]
+
+        if kind == BreakdownColumnKind.Number:
+            number = self._numeric_data[data_column, row]
+        else:
+            number = self._analysis(kind, data_column)[row]
+
+        if numpy.isnan(number):
+            return None
+
+        number = float(number)
+
+        # Numbers are stored as floats, so integers are restored as such.
+        if kind == BreakdownColumnKind.Number and number.is_integer():
+            return int(number)
+
+        return number
 
     def numberTextAlignment(self, row: int, column: int) -> QtCore.Qt.Alignment:
-        if self.isHorizontalAnalysisColumn(column):
+        if self.isAnalysisColumn(column):
             return QtCore.Qt.AlignmentFlag.AlignCenter
         else:
             return QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter
@@ -236,47 +374,210 @@ class BreakdownTableModel(QtCore.QAbstractTableModel):
         if number is None:
             return None
 
-        if self.isHorizontalAnalysisColumn(column):
+        if self.isAnalysisColumn(column):
             percent = number * 100
             return f'{percent:.2f}%'
         else:
-            return QtCore.QLocale().toString(number)
+            return DisplayTextCache.locale().toString(number)
 
     def numberData(self, row: int, column: int, role: int = QtCore.Qt.ItemDataRole.DisplayRole) -> typing.Any:
         if role == QtCore.Qt.ItemDataRole.TextAlignmentRole:
             return self.numberTextAlignment(row, column)
 
         elif role == QtCore.Qt.ItemDataRole.DisplayRole:
-            return self.numberText(row, column)
+            return self._text_cache.text((row, column), self.numberText, row, column)
         
         return None
 
     def calculateHorizontalAnalysis(self, previous_column: int, next_column: int) -> typing.List[typing.Optional[float]]:
         if (
             previous_column == next_column or
-            self.isHorizontalAnalysisColumn(previous_column) or
-            self.isHorizontalAnalysisColumn(next_column)
+            self.isAnalysisColumn(previous_column) or
+            self.isAnalysisColumn(next_column)
         ):
             return [None] * self.rowCount()
 
-        ha_numeric_data   = []
-        next_numeric_data = self._numeric_data[next_column]
-        prev_numeric_data = self._numeric_data[previous_column]
+        ha_numeric_data = self._growth(
+            self._numeric_data[self._columns[previous_column][1]],
+            self._numeric_data[self._columns[next_column][1]]
+        )
+
+        return [None if numpy.isnan(ratio) else float(ratio) for ratio in ha_numeric_data]
+
+    ################################################################################
+    # Private methods
+    ################################################################################
+    def _numericColumns(self,
+                        columns: typing.Iterable[typing.Tuple[typing.Any, typing.Dict[str, typing.Optional[float]]]]
+    ) -> typing.Tuple[typing.List[typing.Any], numpy.ndarray]:
+        """Returns the data of `columns` and an array of their numbers, with NaN for missing numbers."""
+
+        column_data  = []
+        numeric_data = []
+
+        for data, mapped_numbers in columns:
+            column_data.append(data)
+            numeric_data.append([mapped_numbers.get(row_name, None) for row_name in self._vheader_data])
+
+        return column_data, numpy.array(numeric_data, dtype=float).reshape(len(column_data), self.rowCount())
+
+    def _appendColumns(self, column_data: typing.Sequence[typing.Any], numeric_data: numpy.ndarray):
+        """Appends columns whose data is `column_data` and whose numbers are the rows
+        of `numeric_data`, with NaN for missing numbers, notifying views only once.
+        """
+
+        if len(column_data) == 0:
+            return
+
+        self._storeColumns(column_data, numeric_data)
+
+        # Since columns are appended, this inserts them at once.
+        self._updateColumns()
+
+    def _storeColumns(self, column_data: typing.Sequence[typing.Any], numeric_data: numpy.ndarray):
+        first_data_column = len(self._hheader_data)
+
+        for data_column, data in enumerate(column_data, first_data_column):
+            try:
+                self._column_from_data.setdefault(data, data_column)
+            except TypeError:
+                # Unhashable data is not looked up.
+                pass
+
+        self._hheader_data.extend(column_data)
+        self._numeric_data = numpy.concatenate((self._numeric_data, numeric_data))
+        self._forgetAnalyses()
+
+    def _clearColumns(self):
+        self._hheader_data.clear()
+        self._column_from_data.clear()
+        self._columns.clear()
+        self._numeric_data = numpy.empty((0, self.rowCount()))
+        self._forgetAnalyses()
+
+    def _columnGroup(self, data_column: int) -> typing.List[typing.Tuple[BreakdownColumnKind, int]]:
+        """Returns the columns shown for the user-defined column `data_column`."""
+
+        group = []
+
+        if self._ha_enabled and data_column != 0:
+            group.append((BreakdownColumnKind.HorizontalAnalysis, data_column))
+
+        group.append((BreakdownColumnKind.Number, data_column))
+
+        if self._va_enabled:
+            group.append((BreakdownColumnKind.VerticalAnalysis, data_column))
+
+        if self._yoy_enabled:
+            group.append((BreakdownColumnKind.YearOverYear, data_column))
+
+        return group
+
+    def _columnLayout(self) -> typing.List[typing.Tuple[BreakdownColumnKind, int]]:
+        """Returns the columns shown for all user-defined columns."""
+
+        return [column for data_column in range(len(self._hheader_data)) for column in self._columnGroup(data_column)]
+
+    def _updateColumns(self):
+        """Inserts and removes columns so that `_columns` matches the analyses enabled.
 
-        for row, next_number in enumerate(next_numeric_data):
-            prev_number = prev_numeric_data[row]
+        Columns are compared in order, so that each run of columns to be inserted or
+        removed is notified to views by a single insertion or removal, and columns
+        that remain are neither recomputed nor copied.
+        """
+
+        new_columns    = self._columnLayout()
+        new_column_set = set(new_columns)
+        old_column_set = set(self._columns)
+
+        i = 0 # Index in `_columns`
+        j = 0 # Index in `new_columns`
+
+        while i < len(self._columns) or j < len(new_columns):
+            if i < len(self._columns) and j < len(new_columns) and self._columns[i] == new_columns[j]:
+                i += 1
+                j += 1
+
+            elif i < len(self._columns) and self._columns[i] not in new_column_set:
+                last = i
+
+                while last + 1 < len(self._columns) and self._columns[last + 1] not in new_column_set:
+                    last += 1
+
+                self.beginRemoveColumns(QtCore.QModelIndex(), i, last)
+                del self._columns[i:last + 1]
+                self.endRemoveColumns()
 
-            if prev_number is None or next_number is None:
-                ha_numeric_data.append(None)
             else:
-                try:
-                    ratio = (next_number - prev_number) / prev_number
-                except ZeroDivisionError:
-                    ratio = 0
-                
-                ha_numeric_data.append(ratio)
+                last = j
+
+                while last + 1 < len(new_columns) and new_columns[last + 1] not in old_column_set:
+                    last += 1
+
+                count = last - j + 1
 
-        return ha_numeric_data
+                self.beginInsertColumns(QtCore.QModelIndex(), i, i + count - 1)
+                self._columns[i:i] = new_columns[j:last + 1]
+                self.endInsertColumns()
+
+                i += count
+                j += count
+
+    def _analysis(self, kind: BreakdownColumnKind, data_column: int) -> numpy.ndarray:
+        """Returns the numbers of the analysis `kind` of the user-defined column `data_column`."""
+
+        key    = (kind, data_column)
+        ratios = self._memo.get(key)
+
+        if ratios is not None:
+            self._memo.move_to_end(key)
+            return ratios
+
+        numbers = self._numeric_data[data_column]
+
+        if kind == BreakdownColumnKind.HorizontalAnalysis:
+            ratios = self._growth(self._numeric_data[data_column - 1], numbers)
+
+        elif kind == BreakdownColumnKind.VerticalAnalysis:
+            if 0 <= self._va_row < self.rowCount():
+                total = numbers[self._va_row]
+            else:
+                total = numpy.nan
+
+            with numpy.errstate(divide='ignore', invalid='ignore'):
+                ratios = numbers / total if total != 0 else numpy.full_like(numbers, numpy.nan)
+
+        else:
+            prev_data_column = self.yearOverYearColumn(data_column)
+
+            if prev_data_column == -1:
+                ratios = numpy.full_like(numbers, numpy.nan)
+            else:
+                ratios = self._growth(self._numeric_data[prev_data_column], numbers)
+
+        self._memo[key] = ratios
+
+        if len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
+
+        return ratios
+
+    def _forgetAnalyses(self):
+        self._memo.clear()
+
+    @staticmethod
+    def _growth(prev_data: numpy.ndarray, next_data: numpy.ndarray) -> numpy.ndarray:
+        """Returns the growth ratio from `prev_data` to `next_data`, which is NaN
+        where either number is missing, and 0 where the previous number is 0.
+        """
+
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            ratio = (next_data - prev_data) / prev_data
+
+        ratio[prev_data == 0] = 0
+        ratio[numpy.isnan(prev_data) | numpy.isnan(next_data)] = numpy.nan
+
+        return ratio
 
     ################################################################################
     # Overriden methods
@@ -301,7 +602,13 @@ class BreakdownTableModel(QtCore.QAbstractTableModel):
             return None
 
     def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
-        return len(self._hheader_data)
+        if parent.isValid():
+            return 0
+
+        return len(self._columns)
 
     def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+
         return len(self._vheader_data)
\ No newline at end of file
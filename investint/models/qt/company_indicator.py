@@ -1,13 +1,13 @@
 import datetime
 import cvm
 import dataclasses
+import functools
 import sqlalchemy     as sa
 import sqlalchemy.orm as sa_orm
 import typing
 from PyQt5                import QtCore
-from investint.database   import Session
 from investint.models.sql import Document, IncomeStatement, BalanceSheet
-from investint.models.qt  import MappedBreakdownTableModel, CompanyStatementPeriod
+from investint.models.qt  import MappedBreakdownTableModel, CompanyStatementPeriod, QueryLoader, QueryCache
 
 __all__ = [
     'CompanyIndicatorModel'
@@ -21,7 +21,34 @@ class CompanyIndicatorModel(MappedBreakdownTableModel):
         self._decimals     = 2
         self._period       = CompanyStatementPeriod.Annual
 
-    def select(self, company_id: int, period: CompanyStatementPeriod) -> None:
+    def select(self, company_id: int, period: CompanyStatementPeriod, loader: typing.Optional[QueryLoader] = None) -> None:
+        """Shows indicators of the company `company_id` for `period`.
+
+        The result is looked up in `QueryCache.globalInstance()` first. If it's
+        not there and `loader` is `None`, the database is queried on the current
+        thread. Otherwise, it is queried by `loader`, and this model is only
+        updated once the query finishes, unless this method is called again before.
+        """
+
+        QueryCache.globalInstance().load(
+            (type(self).__name__, company_id, period),
+            functools.partial(self.fetch, company_id=company_id, period=period),
+            functools.partial(self._setIndicators, period),
+            loader,
+            self
+        )
+
+    def fetch(self,
+              session: sa_orm.Session,
+              company_id: int,
+              period: CompanyStatementPeriod
+    ) -> typing.List[typing.Tuple[datetime.date, typing.Dict[str, typing.Any]]]:
+        """Returns the reference date and the indicators of each document of
+        the company `company_id` for `period`, as queried by `session`.
+
+        This method doesn't change this model, so it may be called on any thread.
+        """
+
         D: Document        = sa_orm.aliased(Document,        name='d')
         I: IncomeStatement = sa_orm.aliased(IncomeStatement, name='i')
         B: BalanceSheet    = sa_orm.aliased(BalanceSheet,    name='b')
@@ -41,18 +68,15 @@ class CompanyIndicatorModel(MappedBreakdownTableModel):
               .order_by(D.reference_date.asc())
         )
 
-        session = Session()
-        result  = session.execute(select_stmt)
-
-        self.clear()
+        indicators = []
 
-        self._period = period
-
-        for row in result.all():
+        for row in session.execute(select_stmt).all():
             reference_date, income_statement, balance_sheet = row
             indicator = self.createIndicator(balance_sheet, income_statement)
 
-            self.append(reference_date, dataclasses.asdict(indicator))
+            indicators.append((reference_date, dataclasses.asdict(indicator)))
+
+        return indicators
     
     def createIndicator(self, balance_sheet: cvm.balances.BalanceSheet, income_statement: cvm.balances.IncomeStatement) -> typing.Any:
         return
@@ -96,7 +120,7 @@ class CompanyIndicatorModel(MappedBreakdownTableModel):
         return self._decimals
 
     def numberText(self, row: int, column: int) -> typing.Optional[str]:
-        if self.isHorizontalAnalysisColumn(column):
+        if self.isAnalysisColumn(column):
             return super().numberText(row, column)
         
         indicator_value = self.number(row, column)
@@ -115,7 +139,7 @@ class CompanyIndicatorModel(MappedBreakdownTableModel):
         return fmt.format(indicator_value) + suffix
     
     def columnName(self, column: int) -> str:
-        if self.isHorizontalAnalysisColumn(column):
+        if self.isAnalysisColumn(column):
             return super().columnName(column)
         
         reference_date = self.columnData(column)
@@ -127,4 +151,15 @@ class CompanyIndicatorModel(MappedBreakdownTableModel):
             return str(reference_date.year)
         else:
             quarter = int(reference_date.month / 3)
-            return f'{quarter}T{reference_date.year}'
\ No newline at end of file
+            return f'{quarter}T{reference_date.year}'
+
+    ################################################################################
+    # Private methods
+    ################################################################################
+    def _setIndicators(self,
+                       period: CompanyStatementPeriod,
+                       indicators: typing.List[typing.Tuple[datetime.date, typing.Dict[str, typing.Any]]]
+    ) -> None:
+        self._period = period
+
+        self.setColumns(indicators)
\ No newline at end of file
@@ -0,0 +1,201 @@
+import hashlib
+import os
+import pickle
+import shutil
+import typing
+import zlib
+import sqlalchemy     as sa
+import sqlalchemy.orm as sa_orm
+from investint            import database
+from investint.models.sql import Document, PublicCompany, Statement
+
+__all__ = [
+    'CompanySnapshotCache'
+]
+
+Stamp = typing.Tuple[typing.Any, ...]
+
+class CompanySnapshotCache:
+    """Stores results of `QueryCache` on disk, one file per company, so
+    that showing a company again, even after restarting the application,
+    doesn't query the database for data that didn't change.
+
+    A snapshot of a company is a mapping of the keys to the results of
+    `QueryCache` for that company, as returned by `QueryCache.scopeEntries()`,
+    and is saved by `save()` along with a stamp of the company in the
+    database. The stamp consists of the CNPJ of the company, the latest
+    receipt date of its documents, the number and the sum of the versions
+    of its documents, and the number and the greatest id of its statements,
+    which is queried by a single statement. Statements written by
+    `importing.DocumentBulkLoader` or through a staging database have ids
+    greater than any in the database, so the stamp also changes when
+    documents are imported again with the same version.
+
+    Upon `load()`, the stamp is queried again, and the snapshot is discarded
+    if it doesn't match the stamp saved, such as if documents of that company
+    were imported since. The stamp is written before the results, so stale
+    snapshots are detected without reading the rest of their file. Since not
+    every rewrite of documents changes the stamp, `clear()` should be called
+    after importing.
+
+    Snapshots are stored in a subdirectory of `directory` for each database,
+    which is identified by its URL, without password, or by its path, if it
+    is a SQLite file. Nothing is stored for in-memory databases.
+
+    Snapshots are written with `pickle`, so `directory` must only be writable
+    by the user running the application, as is the case for its cache directory.
+    """
+
+    # Changed whenever the format of results changes, so that older snapshots are discarded.
+    magic = b'INVESTINT-SNAPSHOT-2\n'
+
+    def __init__(self, directory: str) -> None:
+        self._directory = directory
+        self._db_dir    = None
+
+    def directory(self) -> str:
+        return self._directory
+
+    def setEngine(self, engine: typing.Optional[sa.engine.Engine]):
+        """Sets the database whose snapshots are loaded and saved."""
+
+        if engine is None or database.isInMemoryEngine(engine):
+            self._db_dir = None
+            return
+
+        if database.isFileEngine(engine):
+            identity = 'sqlite:' + os.path.normcase(os.path.abspath(engine.url.database))
+        else:
+            identity = engine.url.render_as_string(hide_password=True)
+
+        self._db_dir = os.path.join(self._directory, hashlib.sha256(identity.encode('utf-8')).hexdigest()[:16])
+
+    def isEnabled(self) -> bool:
+        """Returns whether snapshots are loaded and saved for the current database."""
+
+        return self._db_dir is not None
+
+    def stamp(self, company: PublicCompany, session: typing.Optional[sa_orm.Session] = None) -> Stamp:
+        """Queries the stamp of `company` in the database."""
+
+        if session is None:
+            session = database.Session()
+
+        statements = (
+            sa.select(sa.func.count(Statement.id), sa.func.max(Statement.id))
+              .join(Document, Statement.document_id == Document.id)
+              .where(Document.company_id == company.id)
+              .subquery()
+        )
+
+        documents = (
+            sa.select(sa.func.max(Document.receipt_date), sa.func.count(Document.id), sa.func.sum(Document.version))
+              .where(Document.company_id == company.id)
+              .subquery()
+        )
+
+        # Both subqueries return a single row.
+        stamp = session.execute(
+            sa.select(documents, statements).select_from(documents.join(statements, sa.true()))
+        ).one()
+
+        return (company.cnpj, *stamp)
+
+    def load(self,
+             company: PublicCompany,
+             stamp: typing.Optional[Stamp] = None,
+             session: typing.Optional[sa_orm.Session] = None
+    ) -> typing.Dict[typing.Hashable, typing.Any]:
+        """Returns the snapshot of `company`, or an empty mapping if there is
+        none or it's stale. Stale or unreadable snapshots are removed.
+
+        The snapshot is compared with `stamp` or, if `stamp` is `None`, with
+        the stamp queried by `session`. If that query fails, such as if the
+        database is locked, an empty mapping is returned.
+
+        This method doesn't use Qt objects, so it may be called on any thread.
+        """
+
+        filepath = self._filepath(company)
+
+        if filepath is None or not os.path.exists(filepath):
+            return {}
+
+        try:
+            if stamp is None:
+                stamp = self.stamp(company, session)
+        except sa.exc.SQLAlchemyError:
+            return {}
+
+        try:
+            with open(filepath, 'rb') as file:
+                if file.readline() != self.magic or pickle.load(file) != stamp:
+                    raise ValueError('stale snapshot')
+
+                return pickle.loads(zlib.decompress(file.read()))
+
+        except (OSError, ValueError, EOFError, pickle.UnpicklingError, zlib.error, AttributeError, ImportError):
+            self._remove(filepath)
+            return {}
+
+    def save(self,
+             company: PublicCompany,
+             entries: typing.Dict[typing.Hashable, typing.Any],
+             stamp: typing.Optional[Stamp] = None
+    ):
+        """Saves `entries` as the snapshot of `company`, replacing its current snapshot, if any.
+
+        The snapshot is saved along with `stamp` or, if `stamp` is `None`, with
+        the stamp queried by `database.Session`. A stamp queried before `entries`
+        were, such as by the same task that called `load()`, is safe to pass, as
+        the snapshot is then only discarded sooner if the database changed since.
+
+        If `entries` is empty, nothing is done.
+        """
+
+        filepath = self._filepath(company)
+
+        if filepath is None or len(entries) == 0:
+            return
+
+        if stamp is None:
+            stamp = self.stamp(company)
+
+        os.makedirs(self._db_dir, exist_ok=True)
+
+        temp_filepath = filepath + '.tmp'
+
+        with open(temp_filepath, 'wb') as file:
+            file.write(self.magic)
+            pickle.dump(stamp, file, pickle.HIGHEST_PROTOCOL)
+            file.write(zlib.compress(pickle.dumps(entries, pickle.HIGHEST_PROTOCOL)))
+
+        # Don't leave a partially written snapshot if the application exits meanwhile.
+        os.replace(temp_filepath, filepath)
+
+    def clear(self):
+        """Removes all snapshots of the current database, such as after importing."""
+
+        if self._db_dir is not None:
+            shutil.rmtree(self._db_dir, ignore_errors=True)
+
+    def remove(self, company: PublicCompany):
+        filepath = self._filepath(company)
+
+        if filepath is not None:
+            self._remove(filepath)
+
+    ################################################################################
+    # Private methods
+    ################################################################################
+    def _filepath(self, company: PublicCompany) -> typing.Optional[str]:
+        if self._db_dir is None:
+            return None
+
+        return os.path.join(self._db_dir, f'{company.id}.snapshot')
+
+    def _remove(self, filepath: str):
+        try:
+            os.remove(filepath)
+        except OSError:
+            pass
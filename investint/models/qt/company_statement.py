@@ -2,11 +2,12 @@ import cvm
 import dataclasses
 import datetime
 import enum
+import functools
 import typing
-import sqlalchemy as sa
+import sqlalchemy     as sa
+import sqlalchemy.orm as sa_orm
 from PyQt5               import QtCore
-from investint           import database
-from investint.models.qt import MappedBreakdownTableModel
+from investint.models.qt import MappedBreakdownTableModel, QueryLoader, QueryCache
 
 __all__ = [
     'CompanyStatementModel',
@@ -39,12 +40,40 @@ class CompanyStatementModel(MappedBreakdownTableModel):
                cnpj: str,
                start_year: int,
                end_year: int,
-               period: CompanyStatementPeriod = CompanyStatementPeriod.Annual
+               period: CompanyStatementPeriod = CompanyStatementPeriod.Annual,
+               loader: typing.Optional[QueryLoader] = None
     ):
-        self.clear()
-
-        session = database.Session()
-        Period  = CompanyStatementPeriod
+        """Shows statements of the company `cnpj` from `start_year` to `end_year` for `period`.
+
+        The result is looked up in `QueryCache.globalInstance()` first. If it's
+        not there and `loader` is `None`, the database is queried on the current
+        thread. Otherwise, it is queried by `loader`, and this model is only
+        updated once the query finishes, unless this method is called again before.
+        """
+
+        QueryCache.globalInstance().load(
+            (type(self).__name__, cnpj, start_year, end_year, period),
+            functools.partial(self.fetch, cnpj=cnpj, start_year=start_year, end_year=end_year, period=period),
+            functools.partial(self._setStatements, period),
+            loader,
+            self
+        )
+
+    def fetch(self,
+              session: sa_orm.Session,
+              cnpj: str,
+              start_year: int,
+              end_year: int,
+              period: CompanyStatementPeriod = CompanyStatementPeriod.Annual
+    ) -> typing.List[typing.Tuple[datetime.date, typing.Dict[str, typing.Any]]]:
+        """Returns the reference date and the fields of each statement
+        selected by `selectStatement()`, as queried by `session`.
+
+        This method doesn't change this model, so it may be called on any thread.
+        """
+
+        Period     = CompanyStatementPeriod
+        statements = []
 
         if period == Period.Annual:
             document_type = cvm.datatypes.DocumentType.DFP
@@ -56,7 +85,7 @@ class CompanyStatementModel(MappedBreakdownTableModel):
             end_date   = datetime.date(end_year,  12, 31) # 31 Dec YYYY
             result     = session.execute(self.selectStatement(cnpj, start_date, end_date, document_type))
             
-            self._appendSqlResult(result)
+            self._appendSqlResult(result, statements)
         else:
             if period == Period.Quarter1:
                 start_month_day = (1, 1)  # 1 Jan
@@ -83,9 +112,9 @@ class CompanyStatementModel(MappedBreakdownTableModel):
 
                 result = session.execute(self.selectStatement(cnpj, start_date, end_date, document_type))
 
-                self._appendSqlResult(result)
+                self._appendSqlResult(result, statements)
 
-        self._period = period
+        return statements
 
     def period(self) -> CompanyStatementPeriod:
         return self._period
@@ -93,7 +122,19 @@ class CompanyStatementModel(MappedBreakdownTableModel):
     def retranslateUi(self):
         pass
 
-    def _appendSqlResult(self, result: sa.engine.Result):
+    def _setStatements(self,
+                       period: CompanyStatementPeriod,
+                       statements: typing.List[typing.Tuple[datetime.date, typing.Dict[str, typing.Any]]]
+    ) -> None:
+        # Column names depend on the period, so set it before notifying views.
+        self._period = period
+
+        self.setColumns(statements)
+
+    def _appendSqlResult(self,
+                         result: sa.engine.Result,
+                         statements: typing.List[typing.Tuple[datetime.date, typing.Dict[str, typing.Any]]]
+    ) -> None:
         for row in result.all():
             try:
                 reference_date = row[0]
@@ -107,13 +148,13 @@ class CompanyStatementModel(MappedBreakdownTableModel):
 
             obj_dict = dataclasses.asdict(dataclass_obj)
             
-            self.append(reference_date, obj_dict)
+            statements.append((reference_date, obj_dict))
 
     ################################################################################
     # Overriden methods (BreakdownTableModel)
     ################################################################################
     def columnName(self, column: int) -> str:
-        if self.isHorizontalAnalysisColumn(column):
+        if self.isAnalysisColumn(column):
             return super().columnName(column)
         else:
             column_data = self.columnData(column)
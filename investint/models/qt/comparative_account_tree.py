@@ -1,11 +1,12 @@
 import collections
 import cvm
 import datetime
+import functools
 import sqlalchemy     as sa
 import sqlalchemy.orm as sa_orm
-from investint            import database
+import typing
 from investint.models.sql import Account, Statement, Document, PublicCompany
-from investint.models.qt  import AccountTreeModel
+from investint.models.qt  import AccountTreeModel, QueryLoader, QueryCache
 
 __all__ = [
     'ComparativeAccountTreeModel'
@@ -17,9 +18,48 @@ class ComparativeAccountTreeModel(AccountTreeModel):
                reference_date: datetime.date,
                document_type: cvm.DocumentType,
                statement_type: cvm.StatementType,
-               balance_type: cvm.BalanceType
+               balance_type: cvm.BalanceType,
+               loader: typing.Optional[QueryLoader] = None
     ) -> None:
-        self.clear()
+        """Shows the accounts of a statement of the company `cnpj`.
+
+        The result is looked up in `QueryCache.globalInstance()` first. If it's
+        not there and `loader` is `None`, the database is queried on the current
+        thread. Otherwise, it is queried by `loader`, and this model is only
+        updated once the query finishes, unless this method is called again before.
+        """
+
+        fetch = functools.partial(
+            self.fetch,
+            cnpj           = cnpj,
+            reference_date = reference_date,
+            document_type  = document_type,
+            statement_type = statement_type,
+            balance_type   = balance_type
+        )
+
+        QueryCache.globalInstance().load(
+            (type(self).__name__, cnpj, reference_date, document_type, statement_type, balance_type),
+            fetch,
+            self._setAccounts,
+            loader,
+            self
+        )
+
+    def fetch(self,
+              session: sa_orm.Session,
+              cnpj: str,
+              reference_date: datetime.date,
+              document_type: cvm.DocumentType,
+              statement_type: cvm.StatementType,
+              balance_type: cvm.BalanceType
+    ) -> typing.List[typing.Tuple[str, typing.Optional[str], str, int, datetime.date]]:
+        """Returns the code, parent code, name, quantity, and period end date
+        of each account of a statement of the company `cnpj`, as queried by
+        `session`, in the order accounts are shown.
+
+        This method doesn't change this model, so it may be called on any thread.
+        """
 
         A: Account       = sa_orm.aliased(Account,       name='a')
         S: Statement     = sa_orm.aliased(Statement,     name='s')
@@ -27,7 +67,7 @@ class ComparativeAccountTreeModel(AccountTreeModel):
         C: PublicCompany = sa_orm.aliased(PublicCompany, name='c')
 
         stmt = (
-            sa.select(A, S.period_end_date)
+            sa.select(A.code, A.parent_code, A.name, A.quantity, S.period_end_date)
               .select_from(A)
               .join(S, A.statement_id == S.id)
               .join(D, S.document_id  == D.id)
@@ -37,32 +77,38 @@ class ComparativeAccountTreeModel(AccountTreeModel):
               .where(D.type           == document_type)
               .where(S.statement_type == statement_type)
               .where(S.balance_type   == balance_type)
+              .order_by(A.sort_key)
         )
 
-        session = database.Session()
-        results = session.execute(stmt).all()
-
-        account_names      = {}
-        account_quantities = collections.defaultdict(dict)
-        period_end_dates   = set()
+        return [tuple(row) for row in session.execute(stmt).all()]
 
-        for row in results:
-            account: Account               = row[0]
-            period_end_date: datetime.date = row[1]
+    ################################################################################
+    # Private methods
+    ################################################################################
+    def _setAccounts(self, accounts: typing.List[typing.Tuple[str, typing.Optional[str], str, int, datetime.date]]):
+        account_parent_codes = {}
+        account_names        = {}
+        account_quantities   = collections.defaultdict(dict)
+        period_end_dates     = set()
 
+        for account_code, parent_code, account_name, quantity, period_end_date in accounts:
             period_end_dates.add(period_end_date)
 
-            account_names[account.code] = account.name
-            account_quantities[account.code][period_end_date] = account.quantity
-
-        self.setNumericColumnCount(len(period_end_dates))
-
-        for i, period_end_date in enumerate(sorted(period_end_dates)):
-            self.setNumericColumnData(i, period_end_date)
-
-        for account_code, account_name in account_names.items():
-            quantities = account_quantities[account_code]
+            account_parent_codes[account_code] = parent_code
+            account_names[account_code]        = account_name
+            account_quantities[account_code][period_end_date] = quantity
 
-            self.append(account_code, account_name, quantities)
-        
-        self.buildTree()
\ No newline at end of file
+        if None in account_parent_codes.values():
+            # Accounts imported before their hierarchy was stored are sorted by code instead.
+            self.setAccounts(
+                sorted(period_end_dates),
+                ((account_code, account_name, account_quantities[account_code]) for account_code, account_name in account_names.items())
+            )
+        else:
+            self.setOrderedAccounts(
+                sorted(period_end_dates),
+                (
+                    (account_code, account_parent_codes[account_code], account_name, account_quantities[account_code])
+                    for account_code, account_name in account_names.items()
+                )
+            )
\ No newline at end of file
@@ -0,0 +1,118 @@
+from __future__ import annotations
+import typing
+from PyQt5 import QtCore
+
+__all__ = [
+    'DisplayTextCache'
+]
+
+class _DisplayLocale(QtCore.QObject):
+    changed = QtCore.pyqtSignal()
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        self.locale = QtCore.QLocale()
+
+class DisplayTextCache(QtCore.QObject):
+    """Stores the display texts of cells of a model, so that formatting
+    numbers, which is relatively slow, is done once per cell rather than
+    every time a view repaints that cell.
+
+    A cache is created for a model, of which it's a child, and stores texts
+    by a key that identifies a cell, such as a pair of row and column:
+
+    >>> cache = DisplayTextCache(model)
+    >>> cache.text((row, column), model.numberText, row, column)
+
+    The above calls `model.numberText(row, column)` only if the text of
+    `(row, column)` is not stored yet. All stored texts are discarded
+    whenever data of the model changes, including its layout, as notified
+    by the signals of `QAbstractItemModel`. Thus, models must emit
+    `dataChanged` when anything that affects their texts changes, such
+    as the number of decimals shown.
+
+    Texts are also discarded if the locale by which numbers are formatted,
+    `locale()`, is changed by `setLocale()`, in which case `dataChanged` is
+    emitted by the model so that views repaint. Models should format numbers
+    with `locale()` rather than constructing a `QLocale` for each number.
+    """
+
+    _display_locale: typing.Optional[_DisplayLocale] = None
+
+    def __init__(self, model: QtCore.QAbstractItemModel) -> None:
+        super().__init__(parent=model)
+
+        self._model = model
+        self._texts: typing.Dict[typing.Hashable, typing.Any] = {}
+
+        for signal in (
+            model.dataChanged,
+            model.modelReset,
+            model.layoutChanged,
+            model.rowsInserted,
+            model.rowsRemoved,
+            model.rowsMoved,
+            model.columnsInserted,
+            model.columnsRemoved,
+            model.columnsMoved
+        ):
+            signal.connect(self.clear)
+
+        DisplayTextCache._displayLocale().changed.connect(self._onLocaleChanged)
+
+    @staticmethod
+    def locale() -> QtCore.QLocale:
+        """Returns the locale by which models format numbers, which is initially `QLocale()`."""
+
+        return DisplayTextCache._displayLocale().locale
+
+    @staticmethod
+    def setLocale(locale: QtCore.QLocale):
+        display_locale = DisplayTextCache._displayLocale()
+
+        if display_locale.locale != locale:
+            display_locale.locale = QtCore.QLocale(locale)
+            display_locale.changed.emit()
+
+    def model(self) -> QtCore.QAbstractItemModel:
+        return self._model
+
+    def count(self) -> int:
+        return len(self._texts)
+
+    def text(self, key: typing.Hashable, function: typing.Callable[..., typing.Any], *args) -> typing.Any:
+        """Returns the text stored by `key`, storing `function(*args)` by `key` first if there is none."""
+
+        try:
+            return self._texts[key]
+        except KeyError:
+            text = self._texts[key] = function(*args)
+            return text
+
+    @QtCore.pyqtSlot()
+    def clear(self):
+        self._texts.clear()
+
+    ################################################################################
+    # Private methods
+    ################################################################################
+    @staticmethod
+    def _displayLocale() -> _DisplayLocale:
+        if DisplayTextCache._display_locale is None:
+            DisplayTextCache._display_locale = _DisplayLocale()
+
+        return DisplayTextCache._display_locale
+
+    ################################################################################
+    # Private slots
+    ################################################################################
+    @QtCore.pyqtSlot()
+    def _onLocaleChanged(self):
+        self.clear()
+
+        model = self._model
+
+        if model.rowCount() != 0 and model.columnCount() != 0:
+            # Views repaint all cells, not only those in the range of `dataChanged`.
+            model.dataChanged.emit(model.index(0, 0), model.index(model.rowCount() - 1, model.columnCount() - 1))
\ No newline at end of file
@@ -1,12 +1,11 @@
 import cvm
-import dataclasses
+import functools
 import sqlalchemy     as sa
 import sqlalchemy.orm as sa_orm
 import typing
-from PyQt5     import QtCore
-from investint import database
-from investint.models.sql import Statement, DMPLAccount
-from investint.models.qt  import AccountTreeModel
+from PyQt5                import QtCore
+from investint.models.sql import DMPLAccount
+from investint.models.qt  import AccountTreeModel, QueryLoader, QueryCache
 
 __all__ = [
     'DMPLAccountTreeModel'
@@ -33,35 +32,46 @@ class DMPLAccountTreeModel(AccountTreeModel):
 
         self.retranslateUi()
 
-    def select(self, statement: Statement) -> None:
-        self.clear()
-
-        if statement.statement_type != cvm.StatementType.DMPL:
-            return
+    def select(self, statement_id: int, balance_type: cvm.BalanceType, loader: typing.Optional[QueryLoader] = None) -> None:
+        """Shows the accounts of the DMPL statement `statement_id`, whose balance type is `balance_type`.
+
+        The result is looked up in `QueryCache.globalInstance()` first. If it's
+        not there and `loader` is `None`, the database is queried on the current
+        thread. Otherwise, it is queried by `loader`, and this model is only
+        updated once the query finishes, unless this method is called again before.
+        """
+
+        QueryCache.globalInstance().load(
+            (type(self).__name__, statement_id),
+            functools.partial(self.fetch, statement_id=statement_id),
+            functools.partial(self._setAccounts, balance_type),
+            loader,
+            self
+        )
 
-        A: DMPLAccount = sa_orm.aliased(DMPLAccount, name='a')
+    def fetch(self,
+              session: sa_orm.Session,
+              statement_id: int
+    ) -> typing.List[typing.Tuple[str, typing.Optional[str], str, typing.Dict[str, int]]]:
+        """Returns the code, parent code, name, and quantities by column of
+        each account of the DMPL statement `statement_id`, as queried by
+        `session`, in the order accounts are shown.
 
-        select_stmt = sa.select(A).where(A.statement_id == statement.id)
-        session     = database.Session()
-        results     = session.execute(select_stmt).all()
+        This method doesn't change this model, so it may be called on any thread.
+        """
 
-        if statement.balance_type == cvm.BalanceType.CONSOLIDATED:
-            column_dataset = self._column_dataset
-        else:
-            column_dataset = self._column_dataset[:-1]
-
-        self.setNumericColumnCount(len(column_dataset))
-        
-        for column, column_data, in enumerate(column_dataset):
-            self.setNumericColumnData(column, column_data)
+        A: DMPLAccount = sa_orm.aliased(DMPLAccount, name='a')
 
-        for row in results:
-            account: DMPLAccount = row[0]
-            quantities = dataclasses.asdict(account)
+        stmt = (
+            sa.select(A.code, A.parent_code, A.name, *(getattr(A, column) for column in self._column_dataset))
+              .where(A.statement_id == statement_id)
+              .order_by(A.sort_key)
+        )
 
-            self.append(account.code, account.name, quantities)
-        
-        self.buildTree()
+        return [
+            (code, parent_code, name, dict(zip(self._column_dataset, quantities)))
+            for code, parent_code, name, *quantities in session.execute(stmt).all()
+        ]
 
     def numericColumnText(self, column: int) -> str:
         column_data: str = self.numericColumnData(column)
@@ -82,4 +92,22 @@ class DMPLAccountTreeModel(AccountTreeModel):
             'consolidated_equity':                 DMPLAccountTreeModel.tr('Consolidated Equity'),
         }
 
-        self.headerDataChanged.emit(QtCore.Qt.Orientation.Horizontal, self.staticColumnCount(), self.columnCount() - 1)
\ No newline at end of file
+        self.headerDataChanged.emit(QtCore.Qt.Orientation.Horizontal, self.staticColumnCount(), self.columnCount() - 1)
+
+    ################################################################################
+    # Private methods
+    ################################################################################
+    def _setAccounts(self,
+                     balance_type: cvm.BalanceType,
+                     accounts: typing.List[typing.Tuple[str, typing.Optional[str], str, typing.Dict[str, int]]]
+    ):
+        if balance_type == cvm.BalanceType.CONSOLIDATED:
+            column_dataset = self._column_dataset
+        else:
+            column_dataset = self._column_dataset[:-1]
+
+        if any(parent_code is None for _, parent_code, _, _ in accounts):
+            # Accounts imported before their hierarchy was stored are sorted by code instead.
+            self.setAccounts(column_dataset, ((code, name, quantities) for code, _, name, quantities in accounts))
+        else:
+            self.setOrderedAccounts(column_dataset, accounts)
\ No newline at end of file
@@ -0,0 +1,209 @@
+import datetime
+import logging
+import typing
+from PyQt5 import QtCore, QtGui
+
+__all__ = [
+    'ImportLogModel',
+    'ImportLogFilterModel'
+]
+
+class ImportLogModel(QtCore.QAbstractListModel):
+    """Implements a `QAbstractListModel` for showing messages of importing.
+
+    This class stores messages, one row per line, along with their severity,
+    which is a level of the module `logging`. Lines are stored in a ring
+    buffer that holds at most `maxLines()` lines:
+
+    >>> model = ImportLogModel(max_lines=2)
+    >>> model.append('a')
+    >>> model.append('b\\nc', logging.WARNING)
+    >>> model.rowCount()
+    2
+    >>> model.line(0)
+    'b'
+
+    Once the model is full, appending lines removes lines from its start,
+    so memory and the cost of each call to `append()` don't grow with the
+    number of lines appended. Lines are removed in chunks of a tenth of
+    `maxLines()`, rather than as many as appended, since proxy models such
+    as `ImportLogFilterModel` remap all their rows upon each removal. Also,
+    views that show this model, such as a `QListView` with uniform item
+    sizes, only lay out the lines in their viewport.
+
+    Lines removed from this model are lost, unless a log file is set by
+    `setLogFilePath()`, in which case every line appended is also written
+    to that file, preceded by its time and severity.
+    """
+
+    LevelRole = QtCore.Qt.ItemDataRole.UserRole
+
+    def __init__(self, max_lines: int = 10000, parent: typing.Optional[QtCore.QObject] = None) -> None:
+        super().__init__(parent=parent)
+
+        self._max_lines = max(max_lines, 1)
+        self._lines     = [None] * self._max_lines
+        self._first     = 0
+        self._count     = 0
+        self._log_file  = None
+        self._log_path  = ''
+
+    def maxLines(self) -> int:
+        return self._max_lines
+
+    def setMaxLines(self, max_lines: int):
+        """Sets the maximum number of lines stored by this model.
+
+        If there are more lines than `max_lines`, the first lines are removed.
+        """
+
+        max_lines = max(max_lines, 1)
+
+        if max_lines == self._max_lines:
+            return
+
+        self.beginResetModel()
+
+        lines = [self._lines[(self._first + row) % self._max_lines] for row in range(self._count)][-max_lines:]
+
+        self._max_lines = max_lines
+        self._lines     = lines + [None] * (max_lines - len(lines))
+        self._first     = 0
+        self._count     = len(lines)
+
+        self.endResetModel()
+
+    def logFilePath(self) -> str:
+        """Returns the path of the file lines are written to, or an empty string if there is none."""
+
+        return self._log_path
+
+    def setLogFilePath(self, path: str):
+        """Appends every line appended to this model to the file at `path`.
+
+        If `path` is an empty string, closes the current log file, if any.
+        May raise `OSError` if the file can't be opened.
+        """
+
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
+            self._log_path = ''
+
+        if path != '':
+            self._log_file = open(path, 'a', encoding='utf-8')
+            self._log_path = path
+
+    def flushLogFile(self):
+        if self._log_file is not None:
+            self._log_file.flush()
+
+    def line(self, row: int) -> str:
+        return self._entry(row)[1]
+
+    def level(self, row: int) -> int:
+        return self._entry(row)[0]
+
+    def append(self, message: str, level: int = logging.INFO):
+        """Appends each line of `message` with the severity `level`."""
+
+        lines = message.splitlines() or ['']
+
+        if self._log_file is not None:
+            prefix = f'{datetime.datetime.now():%Y-%m-%d %H:%M:%S} {logging.getLevelName(level):<8} '
+
+            self._log_file.writelines(prefix + line + '\n' for line in lines)
+
+        lines        = lines[-self._max_lines:]
+        remove_count = self._count + len(lines) - self._max_lines
+
+        if remove_count > 0:
+            remove_count = min(max(remove_count, self._max_lines // 10), self._count)
+
+            self.beginRemoveRows(QtCore.QModelIndex(), 0, remove_count - 1)
+
+            for row in range(remove_count):
+                self._lines[(self._first + row) % self._max_lines] = None
+
+            self._first  = (self._first + remove_count) % self._max_lines
+            self._count -= remove_count
+
+            self.endRemoveRows()
+
+        self.beginInsertRows(QtCore.QModelIndex(), self._count, self._count + len(lines) - 1)
+
+        for line in lines:
+            self._lines[(self._first + self._count) % self._max_lines] = (level, line)
+            self._count += 1
+
+        self.endInsertRows()
+
+    def clear(self):
+        """Removes all lines. The log file, if any, is left unchanged."""
+
+        self.beginResetModel()
+
+        self._lines = [None] * self._max_lines
+        self._first = 0
+        self._count = 0
+
+        self.endResetModel()
+
+    ################################################################################
+    # Overriden methods
+    ################################################################################
+    def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.ItemDataRole.DisplayRole) -> typing.Any:
+        if not index.isValid() or index.row() >= self._count:
+            return None
+
+        level, line = self._entry(index.row())
+
+        if role == QtCore.Qt.ItemDataRole.DisplayRole:
+            return line
+        elif role == QtCore.Qt.ItemDataRole.ForegroundRole:
+            if level >= logging.ERROR:
+                return QtGui.QBrush(QtCore.Qt.GlobalColor.red)
+            elif level >= logging.WARNING:
+                return QtGui.QBrush(QtCore.Qt.GlobalColor.darkYellow)
+            elif level < logging.INFO:
+                return QtGui.QBrush(QtCore.Qt.GlobalColor.darkGray)
+        elif role == ImportLogModel.LevelRole:
+            return level
+
+        return None
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+
+        return self._count
+
+    ################################################################################
+    # Private methods
+    ################################################################################
+    def _entry(self, row: int) -> typing.Tuple[int, str]:
+        return self._lines[(self._first + row) % self._max_lines]
+
+class ImportLogFilterModel(QtCore.QSortFilterProxyModel):
+    """Implements a proxy model that hides lines of an `ImportLogModel`
+    whose severity is lower than `minimumLevel()`.
+    """
+
+    def __init__(self, parent: typing.Optional[QtCore.QObject] = None) -> None:
+        super().__init__(parent=parent)
+
+        self._minimum_level = logging.NOTSET
+
+    def minimumLevel(self) -> int:
+        return self._minimum_level
+
+    def setMinimumLevel(self, level: int):
+        if self._minimum_level != level:
+            self._minimum_level = level
+            self.invalidateFilter()
+
+    ################################################################################
+    # Overriden methods
+    ################################################################################
+    def filterAcceptsRow(self, source_row: int, source_parent: QtCore.QModelIndex) -> bool:
+        return self.sourceModel().level(source_row) >= self._minimum_level
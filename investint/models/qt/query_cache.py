@@ -0,0 +1,185 @@
+from __future__ import annotations
+import collections
+import typing
+from PyQt5               import QtCore
+from investint           import database
+from investint.models.qt import QueryLoader
+
+__all__ = [
+    'QueryCache'
+]
+
+FetchFunction = typing.Callable[[typing.Any], typing.Any]
+ApplyFunction = typing.Callable[[typing.Any], None]
+
+class QueryCache(QtCore.QObject):
+    """Stores the results of queries made by models, so that selecting the
+    same data again, such as when switching back to a company, doesn't
+    query the database.
+
+    Results are stored by a key describing the query, such as the kind of
+    model, the company, and the period selected, and are evicted in least
+    recently used order once the total cost of stored results exceeds
+    `maxCost()`. The cost of a result is its length, if it has one, such
+    as the number of rows of a list of rows, or 1 otherwise.
+
+    Results are also tagged by the scope that was current when they were
+    loaded, as set by `setScope()`, such as the company being shown, so
+    that the results of a scope may be retrieved by `scopeEntries()`.
+
+    Stored results are returned as is, so they must not be modified.
+    Since the database may change, such as upon importing files or
+    opening another database, the cache should be cleared by `clear()`
+    whenever that happens.
+
+    Instances of this class should only be used on the GUI thread. A global
+    instance shared by models is returned by `globalInstance()`.
+    """
+
+    _global_instance: typing.Optional[QueryCache] = None
+
+    def __init__(self, max_cost: int = 50000, parent: typing.Optional[QtCore.QObject] = None) -> None:
+        super().__init__(parent=parent)
+
+        self._max_cost   = max(max_cost, 0)
+        self._total_cost = 0
+        self._generation = 0
+        self._scope      = None
+        self._entries: collections.OrderedDict[typing.Hashable, typing.Tuple[typing.Any, int, typing.Hashable]] = collections.OrderedDict()
+
+    @staticmethod
+    def globalInstance() -> QueryCache:
+        if QueryCache._global_instance is None:
+            QueryCache._global_instance = QueryCache()
+
+        return QueryCache._global_instance
+
+    def maxCost(self) -> int:
+        return self._max_cost
+
+    def setMaxCost(self, max_cost: int):
+        self._max_cost = max(max_cost, 0)
+        self._evict()
+
+    def totalCost(self) -> int:
+        return self._total_cost
+
+    def count(self) -> int:
+        return len(self._entries)
+
+    def scope(self) -> typing.Hashable:
+        return self._scope
+
+    def setScope(self, scope: typing.Hashable):
+        """Sets the scope by which results loaded from now on are tagged."""
+
+        self._scope = scope
+
+    def scopeEntries(self, scope: typing.Hashable) -> typing.Dict[typing.Hashable, typing.Any]:
+        """Returns a mapping of key to result of the results tagged by `scope`."""
+
+        return {key: result for key, (result, _, entry_scope) in self._entries.items() if entry_scope == scope}
+
+    def contains(self, key: typing.Hashable) -> bool:
+        return key in self._entries
+
+    def get(self, key: typing.Hashable, default: typing.Any = None) -> typing.Any:
+        """Returns the result stored by `key`, or `default` if there is none."""
+
+        entry = self._entries.get(key)
+
+        if entry is None:
+            return default
+
+        self._entries.move_to_end(key)
+
+        return entry[0]
+
+    def put(self, key: typing.Hashable, result: typing.Any, scope: typing.Hashable = None):
+        """Stores `result` by `key` tagged by `scope`, evicting
+        the least recently used results if needed.
+
+        Results whose cost exceeds `maxCost()` are not stored.
+        """
+
+        self.remove(key)
+
+        try:
+            cost = max(len(result), 1)
+        except TypeError:
+            cost = 1
+
+        if cost > self._max_cost:
+            return
+
+        self._entries[key] = (result, cost, scope)
+        self._total_cost  += cost
+
+        self._evict()
+
+    def remove(self, key: typing.Hashable):
+        entry = self._entries.pop(key, None)
+
+        if entry is not None:
+            self._total_cost -= entry[1]
+
+    @QtCore.pyqtSlot()
+    def clear(self):
+        """Removes all results, including those of queries still being loaded."""
+
+        self._entries.clear()
+        self._total_cost  = 0
+        self._generation += 1
+
+    def load(self,
+             key: typing.Hashable,
+             fetch: FetchFunction,
+             apply: ApplyFunction,
+             loader: typing.Optional[QueryLoader] = None,
+             loader_key: typing.Optional[typing.Hashable] = None
+    ):
+        """Calls `apply` with the result stored by `key`, if any.
+
+        Otherwise, calls `fetch` with a session, stores its result by `key`,
+        and calls `apply` with that result. If `loader` is `None`, `fetch`
+        is called on the current thread with `database.Session()`. Else,
+        `fetch` is loaded by `loader` by the key `loader_key`, and its result
+        is only stored if `clear()` is not called while it's being loaded.
+        Either way, the result is tagged by the current `scope()`.
+
+        If the result of `key` is stored, the load of `loader_key`, if any,
+        is cancelled, so that it doesn't overwrite what `apply` shows.
+        """
+
+        if key in self._entries:
+            if loader is not None:
+                loader.cancel(loader_key)
+
+            apply(self.get(key))
+
+        elif loader is None:
+            result = fetch(database.Session())
+
+            self.put(key, result, self._scope)
+            apply(result)
+
+        else:
+            loader.load(
+                loader_key,
+                fetch,
+                lambda result, generation=self._generation, scope=self._scope: self._onLoaded(key, generation, scope, apply, result)
+            )
+
+    ################################################################################
+    # Private methods
+    ################################################################################
+    def _evict(self):
+        while self._total_cost > self._max_cost and len(self._entries) != 0:
+            _, (_, cost, _) = self._entries.popitem(last=False)
+            self._total_cost -= cost
+
+    def _onLoaded(self, key: typing.Hashable, generation: int, scope: typing.Hashable, apply: ApplyFunction, result: typing.Any):
+        if generation == self._generation:
+            self.put(key, result, scope)
+
+        apply(result)
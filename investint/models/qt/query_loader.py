@@ -0,0 +1,215 @@
+import threading
+import traceback
+import typing
+import sqlalchemy.orm as sa_orm
+from PyQt5     import QtCore
+from investint import database
+
+__all__ = [
+    'QueryLoader'
+]
+
+FetchFunction = typing.Callable[[sa_orm.Session], typing.Any]
+ApplyFunction = typing.Callable[[typing.Any], None]
+
+class _QueryTaskSignals(QtCore.QObject):
+    fetched = QtCore.pyqtSignal(object, object)
+    failed  = QtCore.pyqtSignal(object)
+
+class _QueryTask(QtCore.QRunnable):
+    def __init__(self, key: typing.Hashable, fetch: FetchFunction, apply: ApplyFunction) -> None:
+        super().__init__()
+
+        self.key   = key
+        self.apply = apply
+
+        self._fetch      = fetch
+        self._signals    = _QueryTaskSignals()
+        self._cancel_ev  = threading.Event()
+        self._dbapi_lock = threading.Lock()
+        self._dbapi_conn = None
+
+    def signals(self) -> _QueryTaskSignals:
+        return self._signals
+
+    def isCancelled(self) -> bool:
+        return self._cancel_ev.is_set()
+
+    def cancel(self):
+        """Prevents the result of `fetch` from being emitted.
+
+        If `fetch` is running a query on a connection of its own, that
+        query is also interrupted, if the database driver supports it.
+        """
+
+        self._cancel_ev.set()
+
+        with self._dbapi_lock:
+            dbapi_conn = self._dbapi_conn
+
+            if dbapi_conn is None:
+                return
+
+            try:
+                if hasattr(dbapi_conn, 'interrupt'):
+                    # sqlite3
+                    dbapi_conn.interrupt()
+                elif hasattr(dbapi_conn, 'cancel'):
+                    # psycopg2
+                    dbapi_conn.cancel()
+            except Exception:
+                pass
+
+    def run(self) -> None:
+        if self.isCancelled():
+            return
+
+        # Sessions of `database.Session` are thread-local and keep
+        # loaded objects, so use a new session for each query instead.
+        session = database.session_factory()
+
+        try:
+            connection = session.connection()
+
+            # In-memory databases share one connection with other threads, whose queries must not be interrupted.
+            if not database.isInMemoryEngine(connection.engine):
+                with self._dbapi_lock:
+                    self._dbapi_conn = connection.connection.connection
+
+            result = self._fetch(session)
+
+        except Exception:
+            if not self.isCancelled():
+                QtCore.qCritical(traceback.format_exc().encode('utf-8'))
+                self._signals.failed.emit(self)
+
+            return
+
+        finally:
+            with self._dbapi_lock:
+                self._dbapi_conn = None
+
+            session.close()
+
+        if not self.isCancelled():
+            self._signals.fetched.emit(self, result)
+
+class QueryLoader(QtCore.QObject):
+    """Runs database queries on worker threads and applies their results
+    on the thread of this object, typically the GUI thread.
+
+    Each call to `load()` takes a key, a function `fetch` that queries the
+    database, and a function `apply` that takes the result of `fetch`. The
+    function `fetch` is called on a thread of `threadPool()` with a new
+    `Session`, so it must not change objects that live on other threads,
+    such as models. Then, `apply` is called with its result on the thread
+    of this object, which may update models.
+
+    Loading a key cancels the previous load of that key, if it's still
+    running, in which case its `apply` is not called. Thus, a model whose
+    loads are keyed by itself only receives the results of its last load.
+    Queries of cancelled loads are interrupted, unless the database is
+    in memory. If `fetch` raises an exception, its traceback is logged
+    and `apply` is not called either.
+
+    The signal `loadingChanged` is emitted with `True` when a load starts
+    while no other load is running, and with `False` when all loads end.
+    """
+
+    loadingChanged = QtCore.pyqtSignal(bool)
+
+    def __init__(self, parent: typing.Optional[QtCore.QObject] = None) -> None:
+        super().__init__(parent=parent)
+
+        self._thread_pool = QtCore.QThreadPool(self)
+        self._tasks: typing.Dict[typing.Hashable, _QueryTask] = {}
+
+    def threadPool(self) -> QtCore.QThreadPool:
+        return self._thread_pool
+
+    def load(self, key: typing.Hashable, fetch: FetchFunction, apply: ApplyFunction):
+        """Calls `fetch` on a worker thread, and `apply` with its result on the thread of this object."""
+
+        was_loading = self.isLoading()
+        prev_task   = self._tasks.pop(key, None)
+
+        if prev_task is not None:
+            prev_task.cancel()
+
+        task = _QueryTask(key, fetch, apply)
+        task.signals().fetched.connect(self._onTaskFetched)
+        task.signals().failed.connect(self._onTaskFailed)
+
+        self._tasks[key] = task
+        self._thread_pool.start(task)
+
+        if not was_loading:
+            self.loadingChanged.emit(True)
+
+    def cancel(self, key: typing.Hashable):
+        """Cancels the load of `key`, if any."""
+
+        task = self._tasks.pop(key, None)
+
+        if task is None:
+            return
+
+        task.cancel()
+
+        if len(self._tasks) == 0:
+            self.loadingChanged.emit(False)
+
+    def cancelAll(self):
+        for key in list(self._tasks.keys()):
+            self.cancel(key)
+
+    def isLoading(self, key: typing.Optional[typing.Hashable] = None) -> bool:
+        """Returns whether `key` is being loaded or, if `key` is `None`, whether any key is."""
+
+        if key is None:
+            return len(self._tasks) != 0
+
+        return key in self._tasks
+
+    def waitForDone(self, msecs: int = -1) -> bool:
+        """Waits for running queries to finish and applies their results.
+
+        Returns `True` if all queries finished within `msecs` milliseconds.
+        """
+
+        done = self._thread_pool.waitForDone(msecs)
+
+        QtCore.QCoreApplication.sendPostedEvents(self)
+
+        return done
+
+    ################################################################################
+    # Private methods
+    ################################################################################
+    def _finishTask(self, task: _QueryTask) -> bool:
+        if self._tasks.get(task.key) is not task:
+            # The load was cancelled after `task` emitted.
+            return False
+
+        del self._tasks[task.key]
+
+        return True
+
+    ################################################################################
+    # Private slots
+    ################################################################################
+    @QtCore.pyqtSlot(object, object)
+    def _onTaskFetched(self, task: _QueryTask, result: typing.Any):
+        if not self._finishTask(task):
+            return
+
+        try:
+            task.apply(result)
+        finally:
+            if len(self._tasks) == 0:
+                self.loadingChanged.emit(False)
+
+    @QtCore.pyqtSlot(object)
+    def _onTaskFailed(self, task: _QueryTask):
+        if self._finishTask(task) and len(self._tasks) == 0:
+            self.loadingChanged.emit(False)
@@ -1,3 +1,4 @@
-from investint.models.sql.base import *
-from investint.models.sql.cvm  import *
-from investint.models.sql.b3   import *
\ No newline at end of file
+from investint.models.sql.base       import *
+from investint.models.sql.cvm        import *
+from investint.models.sql.b3         import *
+from investint.models.sql.checkpoint import *
\ No newline at end of file
@@ -0,0 +1,24 @@
+import sqlalchemy as sa
+from investint.models.sql import Base
+
+__all__ = [
+    'ImportCheckpoint'
+]
+
+class ImportCheckpoint(Base):
+    """Records how far an interrupted import has progressed through a file.
+
+    A checkpoint is identified by `archive_hash`, which is computed from
+    the contents of the file being imported and from the options of the
+    worker importing it, so that a file imported with different options
+    does not resume from the same checkpoint. `read_count` is the number
+    of documents read from that file up to and including the last
+    committed document, whose id is `last_document_id`.
+    """
+
+    __tablename__ = 'import_checkpoint'
+
+    archive_hash     = sa.Column(sa.String(64), primary_key=True)
+    read_count       = sa.Column(sa.Integer,    nullable=False)
+    last_document_id = sa.Column(sa.Integer)
+    updated_at       = sa.Column(sa.DateTime,   nullable=False)
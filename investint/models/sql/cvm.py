@@ -1,4 +1,5 @@
 from __future__ import annotations
+import collections
 import cvm
 import dataclasses
 import datetime
@@ -26,7 +27,10 @@ __all__ = [
 ]
 
 class PublicCompany(Base):
-    __tablename__ = 'public_company'
+    __tablename__  = 'public_company'
+    __table_args__ = (
+        sa.Index('ix_public_company_cnpj', 'cnpj'),
+    )
 
     id                         = sa.Column(sa.Integer,     primary_key=True, autoincrement=True)
     cnpj                       = sa.Column(sa.String(20),  nullable=False)
@@ -71,6 +75,22 @@ class PublicCompany(Base):
 
         return session.query(PublicCompany).filter(PublicCompany.cnpj == cnpj).one_or_none()
 
+    @staticmethod
+    def idsByCNPJ(cnpjs: typing.Optional[typing.Iterable[str]] = None, session = None) -> typing.Dict[str, int]:
+        """Returns a mapping of CNPJ to id of companies whose CNPJ is in `cnpjs`,
+        or of all companies if `cnpjs` is `None`.
+        """
+
+        if session is None:
+            session = database.Session()
+
+        stmt = sa.select(PublicCompany.cnpj, PublicCompany.id)
+
+        if cnpjs is not None:
+            stmt = stmt.where(PublicCompany.cnpj.in_(list(cnpjs)))
+
+        return dict(session.execute(stmt).all())
+
     @staticmethod
     def findByExpression(expression: str) -> typing.List[PublicCompany]:
         if expression == '':
@@ -130,7 +150,10 @@ class PublicCompany(Base):
         )
 
 class Document(Base):
-    __tablename__ = 'document'
+    __tablename__  = 'document'
+    __table_args__ = (
+        sa.Index('ix_document_company_id_type_reference_date', 'company_id', 'type', 'reference_date'),
+    )
 
     id             = sa.Column(sa.Integer,                primary_key=True, autoincrement=False)
     company_id     = sa.Column(sa.Integer,                sa.ForeignKey('public_company.id'), nullable=False)
@@ -146,14 +169,25 @@ class Document(Base):
     balance_sheet:    typing.Optional['BalanceSheet']    = sa_orm.relationship('BalanceSheet',    back_populates='document',  uselist=False)
 
     @staticmethod
-    def fromDfpItr(dfpitr: cvm.DFPITR) -> Document:
+    def fromDfpItr(dfpitr: cvm.DFPITR,
+                   statement_types: typing.Optional[typing.Container[typing.Tuple[cvm.StatementType, cvm.BalanceType]]] = None
+    ) -> Document:
+        """Creates a `Document` and its statements from `dfpitr`.
+
+        If `statement_types` is not `None`, only statements whose pair of
+        statement type and balance type is in it are created.
+        """
+
         statements = []
 
         for grouped_collection in dfpitr.grouped_collections():
-            statements += Statement.fromCollection(grouped_collection.last)
+            statements += Statement.fromCollection(grouped_collection.last, statement_types)
 
             if grouped_collection.previous:
-                statements += Statement.fromCollection(grouped_collection.previous)
+                statements += Statement.fromCollection(grouped_collection.previous, statement_types)
+
+        for stmt in statements:
+            stmt.document_version = dfpitr.version
 
         return Document(
             id             = dfpitr.id,
@@ -165,12 +199,66 @@ class Document(Base):
             statements     = statements
         )
 
+    @staticmethod
+    def versions(company_ids: typing.Optional[typing.Iterable[int]] = None, session = None) -> typing.Dict[int, int]:
+        """Returns a mapping of id to version of documents of companies whose
+        id is in `company_ids`, or of all documents if `company_ids` is `None`.
+        """
+
+        if session is None:
+            session = database.Session()
+
+        stmt = sa.select(Document.id, Document.version)
+
+        if company_ids is not None:
+            stmt = stmt.where(Document.company_id.in_(list(company_ids)))
+
+        return dict(session.execute(stmt).all())
+
+    @staticmethod
+    def statementTypes(company_ids: typing.Optional[typing.Iterable[int]] = None,
+                       session = None
+    ) -> typing.Dict[int, typing.Set[typing.Tuple[cvm.StatementType, cvm.BalanceType]]]:
+        """Returns a mapping of id of documents of companies whose id is in
+        `company_ids`, or of all documents if `company_ids` is `None`, to the
+        pairs of statement type and balance type of their statements that were
+        imported from their current version.
+        """
+
+        if session is None:
+            session = database.Session()
+
+        S: Statement = sa_orm.aliased(Statement, name='s')
+        D: Document  = sa_orm.aliased(Document,  name='d')
+
+        stmt = (
+            sa.select(D.id, S.statement_type, S.balance_type)
+              .select_from(D)
+              .join(S, D.id == S.document_id)
+              .where(sa.func.coalesce(S.document_version, D.version) == D.version)
+              .distinct()
+        )
+
+        if company_ids is not None:
+            stmt = stmt.where(D.company_id.in_(list(company_ids)))
+
+        statement_types = collections.defaultdict(set)
+
+        for document_id, statement_type, balance_type in session.execute(stmt):
+            statement_types[document_id].add((statement_type, balance_type))
+
+        return dict(statement_types)
+
     @staticmethod
     def referenceDates(company_id: int,
                        document_type: cvm.DocumentType,
                        statement_type: cvm.StatementType,
-                       balance_type: cvm.BalanceType
+                       balance_type: cvm.BalanceType,
+                       session = None
     ) -> typing.List[datetime.date]:
+        if session is None:
+            session = database.Session()
+
         S: Statement = sa_orm.aliased(Statement, name='s')
         D: Document  = sa_orm.aliased(Document,  name='d')
 
@@ -184,13 +272,19 @@ class Document(Base):
               .where(S.balance_type   == balance_type)
         )
 
-        session = database.Session()
-        result  = session.execute(select_stmt.distinct()).all()
+        result = session.execute(select_stmt.distinct()).all()
 
         return list(row[0] for row in result)
 
     @staticmethod
-    def find(company_id: int, document_type: cvm.DocumentType, reference_date: datetime.date) -> typing.Optional[Document]:
+    def find(company_id: int,
+             document_type: cvm.DocumentType,
+             reference_date: datetime.date,
+             session = None
+    ) -> typing.Optional[Document]:
+        if session is None:
+            session = database.Session()
+
         D: Document = sa_orm.aliased(Document, name='d')
 
         select_stmt = (
@@ -202,8 +296,7 @@ class Document(Base):
               .limit(1)
         )
 
-        session = database.Session()
-        row     = session.execute(select_stmt).one_or_none()
+        row = session.execute(select_stmt).one_or_none()
 
         if row is None:
             return None
@@ -211,7 +304,10 @@ class Document(Base):
         return row[0]
 
 class Statement(Base):
-    __tablename__ = 'statement'
+    __tablename__  = 'statement'
+    __table_args__ = (
+        sa.Index('ix_statement_document_id_statement_type_balance_type', 'document_id', 'statement_type', 'balance_type'),
+    )
 
     id                = sa.Column(sa.Integer,                 primary_key=True, autoincrement=True)
     document_id       = sa.Column(sa.Integer,                 sa.ForeignKey('document.id'), nullable=False)
@@ -220,14 +316,24 @@ class Statement(Base):
     period_start_date = sa.Column(sa.Date)
     period_end_date   = sa.Column(sa.Date,                    nullable=False)
 
+    # Version of the document from which this statement was imported, which is older than
+    # `Document.version` if later versions were imported without this type of statement,
+    # or null if this statement was imported along with all others of its document.
+    document_version  = sa.Column(sa.SmallInteger)
+
     document: Document                   = sa_orm.relationship('Document',     back_populates='statements', uselist=False)
     accounts: typing.List['BaseAccount'] = sa_orm.relationship('BaseAccount',  back_populates='statement',  uselist=True)
 
     @staticmethod
-    def fromCollection(collection: cvm.StatementCollection) -> typing.List[Statement]:
+    def fromCollection(collection: cvm.StatementCollection,
+                       statement_types: typing.Optional[typing.Container[typing.Tuple[cvm.StatementType, cvm.BalanceType]]] = None
+    ) -> typing.List[Statement]:
         stmts = []
 
         for stmt_type in cvm.StatementType:
+            if statement_types is not None and (stmt_type, collection.balance_type) not in statement_types:
+                continue
+
             cvm_stmt = collection.statement(stmt_type)
 
             if cvm_stmt is not None:
@@ -253,6 +359,7 @@ class Statement(Base):
 
         for cvm_account in cvm_statement.accounts:
             account = account_cls(**dataclasses.asdict(cvm_account))
+            account.setHierarchy()
             
             stmt.accounts.append(account)
 
@@ -261,9 +368,12 @@ class Statement(Base):
     @staticmethod
     def find(document_id: int,
              statement_type: cvm.StatementType,
-             balance_type: cvm.BalanceType
+             balance_type: cvm.BalanceType,
+             session = None
     ) -> typing.List[Statement]:
-        
+        if session is None:
+            session = database.Session()
+
         S: Statement = sa_orm.aliased(Statement, name='s')
 
         select_stmt = (
@@ -274,8 +384,7 @@ class Statement(Base):
               .where(S.balance_type   == balance_type)
         )
 
-        session = database.Session()
-        result  = session.execute(select_stmt).all()
+        result = session.execute(select_stmt).all()
 
         return list(row[0] for row in result)
 
@@ -299,7 +408,8 @@ class IncomeStatement(cvm.IncomeStatement):
         sa.Column('tax_expenses',                  sa.Integer, nullable=False),
         sa.Column('continuing_operation_result',   sa.Integer, nullable=False),
         sa.Column('discontinued_operation_result', sa.Integer, nullable=False),
-        sa.Column('net_income',                    sa.Integer, nullable=False)
+        sa.Column('net_income',                    sa.Integer, nullable=False),
+        sa.Index('ix_income_statement_document_id', 'document_id')
     )
 
     id: int            = dataclasses.field(init=False)
@@ -334,7 +444,8 @@ class BalanceSheet(cvm.BalanceSheet):
         sa.Column('current_loans_and_financing',    sa.Integer),
         sa.Column('noncurrent_liabilities',         sa.Integer),
         sa.Column('noncurrent_loans_and_financing', sa.Integer),
-        sa.Column('equity',                         sa.Integer, nullable=False)
+        sa.Column('equity',                         sa.Integer, nullable=False),
+        sa.Index('ix_balance_sheet_document_id', 'document_id')
     )
 
     id: int            = dataclasses.field(init=False)
@@ -358,12 +469,23 @@ class BaseAccount(cvm.BaseAccount):
         sa.Column('code',         sa.String(18),  nullable=False),
         sa.Column('name',         sa.String(100), nullable=False),
         sa.Column('is_fixed',     sa.Boolean,     nullable=False),
-        sa.Column('type',         sa.String(10),  nullable=False)
+        sa.Column('type',         sa.String(10),  nullable=False),
+
+        # Position of the account in the hierarchy of its statement, which is computed
+        # from `code` by `Statement.fromCVM()`. These are null for accounts imported
+        # before these columns existed.
+        sa.Column('parent_code',  sa.String(18)),
+        sa.Column('depth',        sa.Integer),
+        sa.Column('sort_key',     sa.String(50)),
+        sa.Index('ix_base_account_statement_id', 'statement_id')
     )
 
     id: int              = dataclasses.field(init=False)
     statement_id: int    = dataclasses.field(init=False)
     statement: Statement = dataclasses.field(init=False)
+    parent_code: str     = dataclasses.field(init=False)
+    depth: int           = dataclasses.field(init=False)
+    sort_key: str        = dataclasses.field(init=False)
     
     __mapper_args__ = {
         'polymorphic_on': 'type',
@@ -373,6 +495,37 @@ class BaseAccount(cvm.BaseAccount):
         }
     }
 
+    @staticmethod
+    def parentCodeOf(code: str) -> str:
+        """Returns the code of the parent of the account `code`, or an empty string if it has none."""
+
+        # 1       -> ''
+        # 1.01    -> '1'
+        # 2.01.04 -> '2.01'
+        index = code.rfind('.')
+
+        if index != -1:
+            return code[:index]
+
+        return ''
+
+    @staticmethod
+    def sortKeyOf(code: str) -> str:
+        """Returns a string by which the account `code` sorts after its parent and
+        among its siblings as ordered by number, such as by `ORDER BY sort_key`.
+        """
+
+        # 2.01.04 -> '0002.0001.0004'
+        # 2.1     -> '0002.0001'
+        return '.'.join(part.zfill(4) for part in code.split('.'))
+
+    def setHierarchy(self) -> None:
+        """Sets `parent_code`, `depth`, and `sort_key` from `code`."""
+
+        self.parent_code = BaseAccount.parentCodeOf(self.code)
+        self.depth       = self.level
+        self.sort_key    = BaseAccount.sortKeyOf(self.code)
+
 @database.mapper_registry.mapped
 @dataclasses.dataclass
 class Account(BaseAccount, cvm.Account):
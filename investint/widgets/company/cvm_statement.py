@@ -1,4 +1,6 @@
 import cvm
+import datetime
+import functools
 import typing
 from PyQt5     import QtCore, QtWidgets
 from investint import widgets, models
@@ -21,6 +23,8 @@ class CompanyCvmStatementWidget(QtWidgets.QWidget):
         self.retranslateUi()
     
     def _initWidgets(self):
+        self._loader = models.QueryLoader(self)
+
         self._comparative_account_tree = widgets.AccountTreeWidget()
         self._comparative_account_tree.setModel(models.ComparativeAccountTreeModel())
 
@@ -91,7 +95,6 @@ class CompanyCvmStatementWidget(QtWidgets.QWidget):
             self._company = co
 
             self._resetReferenceDateCombo()
-            self.applyFilter()
     
     def company(self) -> typing.Optional[models.PublicCompany]:
         return self._company
@@ -109,14 +112,16 @@ class CompanyCvmStatementWidget(QtWidgets.QWidget):
                 self.referenceDate(),
                 self.documentType(),
                 self.statementType(),
-                self.balanceType()
+                self.balanceType(),
+                self._loader
             )
         else:
             self._dmpl.select(
                 self._company.id,
                 self.referenceDate(),
                 self.documentType(),
-                self.balanceType()
+                self.balanceType(),
+                self._loader
             )
     
     def retranslateUi(self):
@@ -140,39 +145,49 @@ class CompanyCvmStatementWidget(QtWidgets.QWidget):
     @QtCore.pyqtSlot()
     def _onDocumentTypeComboIndexChanged(self):
         self._resetReferenceDateCombo()
-        self.applyFilter()
 
     @QtCore.pyqtSlot()
     def _onStatementTypeComboIndexChanged(self):
-        self._resetReferenceDateCombo()
-
         if self.statementType() == cvm.StatementType.DMPL:
             self._stacked_widget.setCurrentWidget(self._dmpl)
         else:
             self._stacked_widget.setCurrentWidget(self._comparative_account_tree)
 
-        self.applyFilter()
+        self._resetReferenceDateCombo()
 
     @QtCore.pyqtSlot()
     def _onBalanceTypeChanged(self):
         self._resetReferenceDateCombo()
-        self.applyFilter()
 
     ################################################################################
     # Private methods
     ################################################################################
     def _resetReferenceDateCombo(self):
+        """Loads the reference dates of the current filter into the
+        reference date combo, then calls `applyFilter()`.
+        """
+
         if self._company is None:
             return
 
-        reference_dates = models.Document.referenceDates(
-            self._company.id,
-            self.documentType(),
-            self.statementType(),
-            self.balanceType()
+        args = (self._company.id, self.documentType(), self.statementType(), self.balanceType())
+
+        models.QueryCache.globalInstance().load(
+            ('referenceDates',) + args,
+            functools.partial(models.Document.referenceDates, *args),
+            self._setReferenceDates,
+            self._loader,
+            self._reference_date_combo
         )
 
+    def _setReferenceDates(self, reference_dates: typing.List[datetime.date]):
+        # Don't apply the filter once for each item added.
+        self._reference_date_combo.blockSignals(True)
         self._reference_date_combo.clear()
 
         for reference_date in reference_dates:
-            self._reference_date_combo.addItem(str(reference_date), reference_date)
\ No newline at end of file
+            self._reference_date_combo.addItem(str(reference_date), reference_date)
+
+        self._reference_date_combo.blockSignals(False)
+
+        self.applyFilter()
\ No newline at end of file
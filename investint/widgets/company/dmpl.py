@@ -1,6 +1,8 @@
 import cvm
 import datetime
+import functools
 import typing
+import sqlalchemy.orm as sa_orm
 from PyQt5     import QtCore, QtWidgets
 from investint import models, widgets
 
@@ -35,31 +37,55 @@ class CompanyDMPLWidget(QtWidgets.QWidget):
                company_id: int,
                reference_date: datetime.date,
                document_type: cvm.DocumentType,
-               balance_type: cvm.BalanceType
+               balance_type: cvm.BalanceType,
+               loader: typing.Optional[models.QueryLoader] = None
     ) -> None:
-        self._tabs.clear()
-
-        document = models.Document.find(company_id, document_type, reference_date)
+        """Shows a tab for each DMPL statement of the document of the company
+        `company_id` with the balance type `balance_type`.
+
+        As with `models.ComparativeAccountTreeModel.select()`, the statements
+        and their accounts are queried by `loader`, if it's not `None`.
+        """
+
+        fetch = functools.partial(
+            self.fetch,
+            company_id     = company_id,
+            reference_date = reference_date,
+            document_type  = document_type,
+            balance_type   = balance_type
+        )
+
+        models.QueryCache.globalInstance().load(
+            (type(self).__name__, company_id, reference_date, document_type, balance_type),
+            fetch,
+            functools.partial(self._setStatements, balance_type, loader),
+            loader,
+            self
+        )
+
+    def fetch(self,
+              session: sa_orm.Session,
+              company_id: int,
+              reference_date: datetime.date,
+              document_type: cvm.DocumentType,
+              balance_type: cvm.BalanceType
+    ) -> typing.List[typing.Tuple[int, typing.Optional[datetime.date], datetime.date]]:
+        """Returns the id, period start date, and period end date of each
+        DMPL statement of the document, as queried by `session`, from the
+        latest period to the earliest.
+
+        This method doesn't change this widget, so it may be called on any thread.
+        """
+
+        document = models.Document.find(company_id, document_type, reference_date, session)
 
         if document is None:
-            return
-
-        dmpls = models.Statement.find(document.id, cvm.StatementType.DMPL, balance_type)
-        dmpls: typing.List[models.Statement] = sorted(dmpls, key=lambda dmpl: dmpl.period_end_date, reverse=True)
-
-        for dmpl in dmpls:
-            model = models.DMPLAccountTreeModel()
-            model.select(dmpl)
-
-            account_tree = widgets.AccountTreeWidget()
-            account_tree.setModel(model)
+            return []
 
-            if dmpl.period_start_date is not None:
-                tab_name = f'{dmpl.period_start_date} - {dmpl.period_end_date}'
-            else:
-                tab_name = str(dmpl.period_end_date)
+        dmpls = models.Statement.find(document.id, cvm.StatementType.DMPL, balance_type, session)
+        dmpls = sorted(dmpls, key=lambda dmpl: dmpl.period_end_date, reverse=True)
 
-            self._tabs.addTab(account_tree, tab_name)
+        return [(dmpl.id, dmpl.period_start_date, dmpl.period_end_date) for dmpl in dmpls]
 
     def retranslateUi(self):
         for i in range(self._tabs.count()):
@@ -73,4 +99,40 @@ class CompanyDMPLWidget(QtWidgets.QWidget):
         if event.type() == QtCore.QEvent.Type.LanguageChange:
             self.retranslateUi()
         
-        super().changeEvent(event)
\ No newline at end of file
+        super().changeEvent(event)
+
+    ################################################################################
+    # Private methods
+    ################################################################################
+    def _setStatements(self,
+                       balance_type: cvm.BalanceType,
+                       loader: typing.Optional[models.QueryLoader],
+                       statements: typing.List[typing.Tuple[int, typing.Optional[datetime.date], datetime.date]]
+    ):
+        self._clearTabs(loader)
+
+        for statement_id, period_start_date, period_end_date in statements:
+            model = models.DMPLAccountTreeModel()
+
+            account_tree = widgets.AccountTreeWidget()
+            account_tree.setModel(model)
+
+            if period_start_date is not None:
+                tab_name = f'{period_start_date} - {period_end_date}'
+            else:
+                tab_name = str(period_end_date)
+
+            self._tabs.addTab(account_tree, tab_name)
+
+            model.select(statement_id, balance_type, loader)
+
+    def _clearTabs(self, loader: typing.Optional[models.QueryLoader]):
+        while self._tabs.count() != 0:
+            account_tree = self._tabs.widget(0)
+
+            if loader is not None:
+                # Don't apply results to a model that is being deleted.
+                loader.cancel(account_tree.model())
+
+            self._tabs.removeTab(0)
+            account_tree.deleteLater()
\ No newline at end of file
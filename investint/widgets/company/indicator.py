@@ -22,6 +22,8 @@ class CompanyIndicatorWidget(QtWidgets.QWidget):
         self._company = None
 
     def _initWidgets(self):
+        self._loader = models.QueryLoader(self)
+
         self._period_lbl      = QtWidgets.QLabel()
         self._period_selector = widgets.CompanyStatementPeriodSelector()
         self._period_selector.periodChanged.connect(self.applyFilter)
@@ -77,9 +79,9 @@ class CompanyIndicatorWidget(QtWidgets.QWidget):
         company_id = self._company.id
         period     = self._period_selector.period()
 
-        self._indebtedness_model.select(company_id, period)
-        self._efficiency_model.select(company_id, period)
-        self._profitability_model.select(company_id, period)
+        self._indebtedness_model.select(company_id, period, self._loader)
+        self._efficiency_model.select(company_id, period, self._loader)
+        self._profitability_model.select(company_id, period, self._loader)
 
     def retranslateUi(self):
         self._period_lbl.setText(self.tr('Period'))
@@ -21,6 +21,8 @@ class CompanyStatementWidget(QtWidgets.QWidget):
         self.retranslateUi()
 
     def _initWidgets(self):
+        self._loader = models.QueryLoader(self)
+
         self._year_range = widgets.YearRangeWidget()
         self._year_range.setMinimum(2010)
         self._year_range.setEndYear(self._year_range.maximum())
@@ -46,6 +48,20 @@ class CompanyStatementWidget(QtWidgets.QWidget):
         self._toggle_ha_button.setChecked(False)
         self._toggle_ha_button.clicked.connect(self._onToggleHaButtonClicked)
 
+        # Toggle vertical analysis.
+        self._toggle_va_button = QtWidgets.QPushButton()
+        self._toggle_va_button.setSizePolicy(button_sz_policy)
+        self._toggle_va_button.setCheckable(True)
+        self._toggle_va_button.setChecked(False)
+        self._toggle_va_button.clicked.connect(self._onToggleVaButtonClicked)
+
+        # Toggle year-over-year analysis.
+        self._toggle_yoy_button = QtWidgets.QPushButton()
+        self._toggle_yoy_button.setSizePolicy(button_sz_policy)
+        self._toggle_yoy_button.setCheckable(True)
+        self._toggle_yoy_button.setChecked(False)
+        self._toggle_yoy_button.clicked.connect(self._onToggleYoyButtonClicked)
+
         # Toggle horizontal reversal.
         self._toggle_hr_button = QtWidgets.QPushButton()
         self._toggle_hr_button.setSizePolicy(button_sz_policy)
@@ -58,6 +74,8 @@ class CompanyStatementWidget(QtWidgets.QWidget):
         filter_layout.addWidget(self._year_range)
         filter_layout.addWidget(self._period_selector)
         filter_layout.addWidget(self._toggle_ha_button)
+        filter_layout.addWidget(self._toggle_va_button)
+        filter_layout.addWidget(self._toggle_yoy_button)
         filter_layout.addWidget(self._toggle_hr_button)
         filter_layout.setAlignment(QtCore.Qt.AlignmentFlag.AlignLeft | QtCore.Qt.AlignmentFlag.AlignVCenter)
 
@@ -80,6 +98,8 @@ class CompanyStatementWidget(QtWidgets.QWidget):
     def setModel(self, model: models.CompanyStatementModel):
         self.proxyModel().setSourceModel(model)
         self._toggle_ha_button.setChecked(model.isHorizontalAnalysisEnabled())
+        self._toggle_va_button.setChecked(model.isVerticalAnalysisEnabled())
+        self._toggle_yoy_button.setChecked(model.isYearOverYearAnalysisEnabled())
         self._toggle_hr_button
 
     def model(self) -> models.CompanyStatementModel:
@@ -93,11 +113,14 @@ class CompanyStatementWidget(QtWidgets.QWidget):
             self._company.cnpj,
             self._year_range.startYear(),
             self._year_range.endYear(),
-            self._period_selector.period()
+            self._period_selector.period(),
+            self._loader
         )
 
     def retranslateUi(self):
         self._toggle_ha_button.setText(self.tr('Toggle HA'))
+        self._toggle_va_button.setText(self.tr('Toggle VA'))
+        self._toggle_yoy_button.setText(self.tr('Toggle YoY'))
         self._toggle_hr_button.setText(self.tr('Toggle HR'))
 
         model = self.model()
@@ -121,6 +144,14 @@ class CompanyStatementWidget(QtWidgets.QWidget):
     def _onToggleHaButtonClicked(self, checked: bool):
         self.model().setHorizontalAnalysisEnabled(checked)
 
+    @QtCore.pyqtSlot(bool)
+    def _onToggleVaButtonClicked(self, checked: bool):
+        self.model().setVerticalAnalysisEnabled(checked)
+
+    @QtCore.pyqtSlot(bool)
+    def _onToggleYoyButtonClicked(self, checked: bool):
+        self.model().setYearOverYearAnalysisEnabled(checked)
+
     @QtCore.pyqtSlot(bool)
     def _onToggleHrButtonClicked(self, checked: bool):
         self.proxyModel().setReversedHorizontally(checked)
\ No newline at end of file
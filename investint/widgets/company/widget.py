@@ -1,4 +1,7 @@
+import functools
 import typing
+import sqlalchemy     as sa
+import sqlalchemy.orm as sa_orm
 from PyQt5     import QtCore, QtWidgets
 from investint import widgets, models
 
@@ -11,6 +14,13 @@ class CompanyWidget(QtWidgets.QWidget):
 
     The class `CompanyWidget` is a top-level widget that encloses all
     other widget classes that present data from a company.
+
+    Data queried for a company is stored in `models.QueryCache.globalInstance()`
+    with the id of that company as scope. If a snapshot cache is set by
+    `setSnapshotCache()`, that data is also saved to disk once another company
+    is shown or `saveSnapshot()` is called, and loaded when that company is
+    shown again. The snapshot is loaded, and the stamp it is saved with is
+    queried, on a worker thread, and the company is shown once that's done.
     """
 
     ################################################################################
@@ -19,11 +29,17 @@ class CompanyWidget(QtWidgets.QWidget):
     def __init__(self, parent: typing.Optional[QtWidgets.QWidget] = None):
         super().__init__(parent=parent)
 
+        self._company        = None
+        self._snapshot_cache = None
+        self._snapshot_stamp = None
+
         self._initWidgets()
         self._initLayouts()
         self.retranslateUi()
 
     def _initWidgets(self):
+        self._loader = models.QueryLoader(self)
+
         self._company_drop_down = widgets.CompanyDropDown()
         self._company_drop_down.companyChanged.connect(self.setCompany)
 
@@ -47,13 +63,46 @@ class CompanyWidget(QtWidgets.QWidget):
     # Public methods
     ################################################################################
     def setCompany(self, co: models.PublicCompany):
-        self._general_info.setCompany(co)
-        self._indicators.setCompany(co)
-        self._financials.setCompany(co)
+        self.saveSnapshot()
+
+        self._company        = co
+        self._snapshot_stamp = None
+
+        if self._snapshot_cache is None:
+            self._loader.cancel(self)
+            self._showCompany(co, {})
+        else:
+            # Refresh the attributes used by the stamp here, should they be expired, rather than on the worker thread.
+            co.id, co.cnpj
+
+            self._loader.load(
+                self,
+                functools.partial(self._fetchSnapshot, self._snapshot_cache, co),
+                functools.partial(self._onSnapshotLoaded, co)
+            )
 
     def company(self) -> typing.Optional[models.PublicCompany]:
         return self._company_drop_down.currentCompany()
     
+    def snapshotCache(self) -> typing.Optional[models.CompanySnapshotCache]:
+        return self._snapshot_cache
+
+    def setSnapshotCache(self, cache: typing.Optional[models.CompanySnapshotCache]):
+        self._snapshot_cache = cache
+
+    def saveSnapshot(self):
+        """Saves the data queried for the company being shown to `snapshotCache()`, if any."""
+
+        if self._snapshot_cache is None or self._company is None or self._snapshot_stamp is None:
+            return
+
+        entries = models.QueryCache.globalInstance().scopeEntries(self._company.id)
+
+        try:
+            self._snapshot_cache.save(self._company, entries, self._snapshot_stamp)
+        except (OSError, sa.exc.SQLAlchemyError) as exc:
+            QtCore.qWarning(f'Failed to save snapshot of company {self._company.id}: {exc}'.encode('utf-8'))
+
     def refresh(self):
         co = self.company()
 
@@ -72,4 +121,40 @@ class CompanyWidget(QtWidgets.QWidget):
         if event.type() == QtCore.QEvent.Type.LanguageChange:
             self.retranslateUi()
         
-        super().changeEvent(event)
\ No newline at end of file
+        super().changeEvent(event)
+
+    ################################################################################
+    # Private methods
+    ################################################################################
+    def _fetchSnapshot(self,
+                       cache: models.CompanySnapshotCache,
+                       co: models.PublicCompany,
+                       session: sa_orm.Session
+    ) -> typing.Tuple[typing.Optional[tuple], typing.Dict[typing.Hashable, typing.Any]]:
+        try:
+            stamp = cache.stamp(co, session)
+        except sa.exc.SQLAlchemyError as exc:
+            QtCore.qWarning(f'Failed to load snapshot of company {co.id}: {exc}'.encode('utf-8'))
+            return (None, {})
+
+        return (stamp, cache.load(co, stamp))
+
+    def _onSnapshotLoaded(self,
+                          co: models.PublicCompany,
+                          result: typing.Tuple[typing.Optional[tuple], typing.Dict[typing.Hashable, typing.Any]]
+    ):
+        self._snapshot_stamp, entries = result
+
+        self._showCompany(co, entries)
+
+    def _showCompany(self, co: models.PublicCompany, entries: typing.Dict[typing.Hashable, typing.Any]):
+        query_cache = models.QueryCache.globalInstance()
+
+        for key, result in entries.items():
+            query_cache.put(key, result, co.id)
+
+        query_cache.setScope(co.id)
+
+        self._general_info.setCompany(co)
+        self._indicators.setCompany(co)
+        self._financials.setCompany(co)
\ No newline at end of file
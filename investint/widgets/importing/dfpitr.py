@@ -1,3 +1,4 @@
+import functools
 import typing
 from PyQt5                       import QtCore, QtWidgets
 from investint.importing         import Worker, DfpItrWorker
@@ -18,17 +19,26 @@ class ImportingDfpItrWindow(ImportingWindow):
     def __init__(self, parent: typing.Optional[QtWidgets.QWidget] = None):
         super().__init__(parent=parent)
 
-        self._companies = []
+        self._companies       = []
+        self._statement_types = None
 
         self.settingsButton().clicked.connect(self._onSettingsButtonClicked)
 
     ################################################################################
     # Overriden methods
     ################################################################################
-    def createWorker(self, filepath: str) -> Worker:
-        listed_cnpjs = (co.cnpj for co in self._companies)
-
-        return DfpItrWorker(listed_cnpjs, filepath)
+    def workerFactory(self, filepath: str) -> typing.Callable[[], Worker]:
+        listed_cnpjs = [co.cnpj for co in self._companies]
+
+        return functools.partial(
+            DfpItrWorker,
+            listed_cnpjs,
+            filepath,
+            bulk            = True,
+            commit_interval = 500,
+            statement_types = self._statement_types,
+            fast_import     = True
+        )
 
     def retranslateUi(self):
         super().retranslateUi()
@@ -43,6 +53,8 @@ class ImportingDfpItrWindow(ImportingWindow):
     def _onSettingsButtonClicked(self):
         dialog = ImportingSelectionDialog(self)
         dialog.setCompanies(self._companies)
+        dialog.setStatementTypes(self._statement_types)
         
         if dialog.exec():
-            self._companies = dialog.companies()
\ No newline at end of file
+            self._companies       = dialog.companies()
+            self._statement_types = dialog.statementTypes()
\ No newline at end of file
@@ -1,3 +1,4 @@
+import functools
 import typing
 from PyQt5     import QtCore, QtWidgets
 from investint.importing         import Worker, FcaWorker
@@ -23,8 +24,8 @@ class ImportingFcaWindow(ImportingWindow):
     ################################################################################
     # Overriden methods
     ################################################################################
-    def createWorker(self, filepath: str) -> Worker:
-        return FcaWorker(filepath)
+    def workerFactory(self, filepath: str) -> typing.Callable[[], Worker]:
+        return functools.partial(FcaWorker, filepath, commit_interval=500, fast_import=True)
 
     def retranslateUi(self):
         super().retranslateUi()
@@ -1,3 +1,4 @@
+import cvm
 import typing
 from PyQt5     import QtCore, QtWidgets
 from investint import models, widgets
@@ -33,6 +34,19 @@ class ImportingSelectionDialog(QtWidgets.QDialog):
         self._confirm_button = QtWidgets.QPushButton()
         self._confirm_button.clicked.connect(self.accept)
 
+        self._statements_group = QtWidgets.QGroupBox()
+        self._consolidated_label = QtWidgets.QLabel()
+        self._individual_label = QtWidgets.QLabel()
+        self._statement_checks: typing.Dict[typing.Tuple[cvm.StatementType, cvm.BalanceType], QtWidgets.QCheckBox] = {}
+
+        for stmt_type in cvm.StatementType:
+            for balance_type in cvm.BalanceType:
+                check = QtWidgets.QCheckBox(stmt_type.name)
+                check.setToolTip(stmt_type.description)
+                check.setChecked(True)
+
+                self._statement_checks[stmt_type, balance_type] = check
+
     def _initLayouts(self):
         upper_buttons_layout = QtWidgets.QVBoxLayout()
         upper_buttons_layout.addWidget(self._remove_button)
@@ -52,11 +66,23 @@ class ImportingSelectionDialog(QtWidgets.QDialog):
         left_layout.addWidget(self._company_drop_down)
         left_layout.addWidget(self._company_list)
 
+        statements_layout = QtWidgets.QGridLayout()
+        statements_layout.addWidget(self._consolidated_label, 0, 0)
+        statements_layout.addWidget(self._individual_label,   0, 1)
+
+        for (stmt_type, balance_type), check in self._statement_checks.items():
+            column = 0 if balance_type == cvm.BalanceType.CONSOLIDATED else 1
+
+            statements_layout.addWidget(check, list(cvm.StatementType).index(stmt_type) + 1, column)
+
+        self._statements_group.setLayout(statements_layout)
+
         main_layout = QtWidgets.QGridLayout()
         main_layout.addWidget(self._company_drop_down, 0, 0)
         main_layout.addWidget(self._company_list,      1, 0)
         main_layout.addWidget(self._add_button,        0, 1)
         main_layout.addLayout(buttons_layout,          1, 1)
+        main_layout.addWidget(self._statements_group,  2, 0, 1, 2)
 
         self.setLayout(main_layout)
 
@@ -82,12 +108,36 @@ class ImportingSelectionDialog(QtWidgets.QDialog):
     def companies(self) -> typing.List[models.PublicCompany]:
         return self._companies.copy()
 
+    def setStatementTypes(self, statement_types: typing.Optional[typing.Iterable[typing.Tuple[cvm.StatementType, cvm.BalanceType]]]):
+        """Checks the pairs of statement type and balance type in `statement_types`,
+        or all pairs if `statement_types` is `None`.
+        """
+
+        if statement_types is not None:
+            statement_types = set(statement_types)
+
+        for key, check in self._statement_checks.items():
+            check.setChecked(statement_types is None or key in statement_types)
+
+    def statementTypes(self) -> typing.Optional[typing.List[typing.Tuple[cvm.StatementType, cvm.BalanceType]]]:
+        """Returns the checked pairs of statement type and balance type, or `None` if all are checked."""
+
+        statement_types = [key for key, check in self._statement_checks.items() if check.isChecked()]
+
+        if len(statement_types) == len(self._statement_checks):
+            return None
+
+        return statement_types
+
     def retranslateUi(self):
         self.setWindowTitle(self.tr('Importing Settings'))
 
         self._add_button.setText(self.tr('Add'))
         self._remove_button.setText(self.tr('Remove'))
         self._confirm_button.setText(self.tr('Confirm'))
+        self._statements_group.setTitle(self.tr('Statements'))
+        self._consolidated_label.setText(self.tr('Consolidated'))
+        self._individual_label.setText(self.tr('Individual'))
 
     ################################################################################
     # Overriden methods
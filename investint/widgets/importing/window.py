@@ -1,7 +1,12 @@
+import fnmatch
+import functools
+import logging
+import os
+import re
 import typing
 import pyqt5_fugueicons as fugue
 from PyQt5     import QtCore, QtGui, QtWidgets
-from investint import importing
+from investint import importing, models
 
 __all__ = [
     'ImportingWindow'
@@ -12,11 +17,26 @@ class ImportingWindow(QtWidgets.QWidget):
     
     This class implements a graphical means to work with `importing.Worker`.
     It shows a `QLineEdit` that allows the user to specify a file,
-    a `QPushButton` to that triggers `startImporting()`, and a `QTextEdit`
+    a `QPushButton` to that triggers `startImporting()`, and a `QListView`
     to display messages emitted by `importing.Worker`.
 
-    Subclasses of this class may reimplement `createWorker()` to return
-    subclasses of `working.Worker`.
+    The `QLineEdit` may also specify several files or directories separated
+    by `os.pathsep`, in which case all files are imported by an
+    `importing.ImportQueue`, and a `QTreeWidget` shows the progress of each
+    file.
+
+    While importing, a `QProgressBar` and a `QLabel` show the progress
+    notified by the signal `progressed` of the worker. Messages about each
+    document read are only shown if the "Verbose" check box is checked.
+
+    Messages are stored in a `models.ImportLogModel`, which keeps at most
+    `maxOutputLines()` lines, so that long imports don't slow down the GUI.
+    A `QComboBox` hides messages below a given severity, and a `QToolButton`
+    allows writing all messages to a log file, which is also possible
+    by calling `setLogFilePath()`.
+
+    Subclasses of this class may reimplement `workerFactory()` to return
+    callables that create subclasses of `working.Worker`.
     """
 
     ################################################################################
@@ -38,6 +58,7 @@ class ImportingWindow(QtWidgets.QWidget):
 
         self._is_importing = False
         self._thread_pool  = QtCore.QThreadPool()
+        self._file_items   = {}
 
         self._initWidgets()
         self._initLayouts()
@@ -51,26 +72,81 @@ class ImportingWindow(QtWidgets.QWidget):
         browse_action = self._filepath_edit.addAction(browse_icon, QtWidgets.QLineEdit.ActionPosition.TrailingPosition)
         browse_action.triggered.connect(self._onBrowseFileAction)
 
+        browse_dir_icon   = fugue.icon('folder-open')
+        browse_dir_action = self._filepath_edit.addAction(browse_dir_icon, QtWidgets.QLineEdit.ActionPosition.TrailingPosition)
+        browse_dir_action.triggered.connect(self._onBrowseDirectoryAction)
+
         self._settings_button = QtWidgets.QToolButton()
         self._settings_button.setIcon(fugue.icon('gear'))
 
+        self._verbose_check = QtWidgets.QCheckBox()
+
         self._import_btn = QtWidgets.QPushButton()
         self._import_btn.setEnabled(False)
         self._import_btn.clicked.connect(self._onImportButtonClicked)
 
-        self._output_edit = QtWidgets.QTextEdit()
-        self._output_edit.setReadOnly(True)
+        self._log_model = models.ImportLogModel(parent=self)
+
+        self._log_filter_model = models.ImportLogFilterModel(parent=self)
+        self._log_filter_model.setSourceModel(self._log_model)
+
+        self._output_view = QtWidgets.QListView()
+        self._output_view.setUniformItemSizes(True)
+        self._output_view.setModel(self._log_filter_model)
+        self._output_view.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.ExtendedSelection)
+
+        # Scrolling lays out all lines, so it's done once the messages pending are appended.
+        self._scroll_timer = QtCore.QTimer(self)
+        self._scroll_timer.setSingleShot(True)
+        self._scroll_timer.setInterval(0)
+        self._scroll_timer.timeout.connect(self._output_view.scrollToBottom)
+
+        self._log_level_label = QtWidgets.QLabel()
+
+        self._log_level_combo = QtWidgets.QComboBox()
+        self._log_level_combo.currentIndexChanged.connect(self._onLogLevelComboIndexChanged)
+
+        self._log_file_button = QtWidgets.QToolButton()
+        self._log_file_button.setIcon(fugue.icon('disk-black'))
+        self._log_file_button.setCheckable(True)
+        self._log_file_button.clicked.connect(self._onLogFileButtonClicked)
+
+        self._files_tree = QtWidgets.QTreeWidget()
+        self._files_tree.setRootIsDecorated(False)
+        self._files_tree.setColumnCount(3)
+        self._files_tree.setVisible(False)
+
+        self._progress_bar = QtWidgets.QProgressBar()
+        self._progress_bar.setVisible(False)
+
+        self._progress_label = QtWidgets.QLabel()
+        self._progress_label.setVisible(False)
 
     def _initLayouts(self):
         upper_layout = QtWidgets.QHBoxLayout()
         upper_layout.addWidget(self._filepath_edit)
         upper_layout.addWidget(self._settings_button)
+        upper_layout.addWidget(self._verbose_check)
         upper_layout.addWidget(self._import_btn)
         upper_layout.setSpacing(2)
+
+        progress_layout = QtWidgets.QHBoxLayout()
+        progress_layout.addWidget(self._progress_bar)
+        progress_layout.addWidget(self._progress_label, 1)
         
+        log_layout = QtWidgets.QHBoxLayout()
+        log_layout.addWidget(self._log_level_label)
+        log_layout.addWidget(self._log_level_combo)
+        log_layout.addStretch()
+        log_layout.addWidget(self._log_file_button)
+        log_layout.setSpacing(2)
+
         main_layout = QtWidgets.QVBoxLayout()
         main_layout.addLayout(upper_layout)
-        main_layout.addWidget(self._output_edit)
+        main_layout.addWidget(self._files_tree)
+        main_layout.addLayout(progress_layout)
+        main_layout.addLayout(log_layout)
+        main_layout.addWidget(self._output_view)
         
         self.setLayout(main_layout)
 
@@ -88,18 +164,103 @@ class ImportingWindow(QtWidgets.QWidget):
 
         return self._filepath_edit.text()
 
+    def filepaths(self) -> typing.List[str]:
+        """Returns the paths of files to be imported.
+
+        The text in this instance's `QLineEdit` is split by `os.pathsep`.
+        Each path that is a directory is replaced by the paths of the files
+        in that directory that match the filter set by `setFileNameFilter()`.
+        """
+
+        patterns  = re.findall(r'\(([^)]*)\)', self._filename_filter)
+        patterns  = ' '.join(patterns).split() or ['*']
+        filepaths = []
+
+        for path in self.filepath().split(os.pathsep):
+            path = path.strip()
+
+            if path == '':
+                continue
+
+            if os.path.isdir(path):
+                for filename in sorted(os.listdir(path)):
+                    filepath = os.path.join(path, filename)
+
+                    if os.path.isfile(filepath) and any(fnmatch.fnmatch(filename, pattern) for pattern in patterns):
+                        filepaths.append(filepath)
+            else:
+                filepaths.append(path)
+
+        return filepaths
+
     def clearOutput(self):
-        """Clears the text in this instance's `QTextEdit`."""
+        """Clears the messages in this instance's `QListView`."""
+
+        self._log_model.clear()
+
+    def appendOutput(self, text: str, level: int = logging.INFO):
+        """Appends `text` with the severity `level`, a level of the module
+        `logging`, to this instance's `QListView`.
+
+        If the view was scrolled to the bottom, it is scrolled to the
+        bottom again once control returns to the event loop.
+        """
+
+        scroll_bar = self._output_view.verticalScrollBar()
+        at_bottom  = scroll_bar.value() == scroll_bar.maximum()
+
+        self._log_model.append(text, level)
+
+        if at_bottom:
+            self._scroll_timer.start()
+
+    def maxOutputLines(self) -> int:
+        return self._log_model.maxLines()
+
+    def setMaxOutputLines(self, max_lines: int):
+        """Sets the maximum number of lines of messages kept by this instance.
+
+        Older lines are removed when this number is exceeded.
+        """
+
+        self._log_model.setMaxLines(max_lines)
+
+    def logFilePath(self) -> str:
+        return self._log_model.logFilePath()
+
+    def setLogFilePath(self, path: str):
+        """Writes all messages to the file at `path`, in addition to showing them.
+
+        If `path` is an empty string, stops writing messages to a file.
+        May raise `OSError` if the file can't be opened.
+        """
+
+        self._log_model.setLogFilePath(path)
+        self._log_file_button.setChecked(path != '')
 
-        self._output_edit.clear()
+    def isVerbose(self) -> bool:
+        return self._verbose_check.isChecked()
 
-    def appendOutput(self, text: str):
-        """Appends `text` to this instance's `QTextEdit`."""
+    def workerFactory(self, filepath: str) -> typing.Callable[[], importing.Worker]:
+        """Returns a callable that creates a worker to import `filepath`.
 
-        self._output_edit.append(text)
+        Since the callable may be sent to another process by
+        `importing.ImportQueue`, it must be picklable.
+        """
+
+        return functools.partial(importing.Worker, filepath)
 
     def createWorker(self, filepath: str) -> importing.Worker:
-        return importing.Worker(filepath)
+        worker = self.workerFactory(filepath)()
+        worker.setVerbose(self.isVerbose())
+
+        return worker
+
+    def createQueue(self, filepaths: typing.Sequence[str]) -> importing.ImportQueue:
+        import_queue = importing.ImportQueue([self.workerFactory(filepath) for filepath in filepaths])
+        import_queue.setVerbose(self.isVerbose())
+
+        return import_queue
 
     def isImporting(self):
         return self._is_importing
@@ -107,27 +268,37 @@ class ImportingWindow(QtWidgets.QWidget):
     def startImporting(self):
         """Starts the importing process.
 
-        If `isImporting()` is `True` or `filepath()` is an empty string,
-        does nothing.
+        If `isImporting()` is `True` or `filepaths()` is empty, does nothing.
         
-        Otherwise, calls `createWorker(filepath())` and starts running
-        the returned worker object on a worker thread. Then, emits
-        `importingStarted`.
+        Otherwise, if `filepaths()` has one file, calls `createWorker()` with
+        that file and starts running the returned worker object on a worker
+        thread. If it has several files, does the same with `createQueue()`.
+        Then, emits `importingStarted`.
         """
 
         if self.isImporting():
             return
 
-        filepath = self.filepath()
+        filepaths = self.filepaths()
 
-        if filepath == '':
+        if len(filepaths) == 0:
             return
         
-        self._worker = self.createWorker(filepath)
+        if len(filepaths) == 1:
+            self._worker = self.createWorker(filepaths[0])
+        else:
+            self._worker = self.createQueue(filepaths)
+            self._worker.signals().fileStarted.connect(self._onQueueFileStarted)
+            self._worker.signals().fileProgressed.connect(self._onQueueFileProgressed)
+            self._worker.signals().fileFinished.connect(self._onQueueFileFinished)
+
         self._worker.signals().error.connect(self._onWorkerError)
         self._worker.signals().messaged.connect(self.appendOutput)
+        self._worker.signals().progressed.connect(self._onWorkerProgressed)
         self._worker.signals().finished.connect(self._onWorkerFinished)
 
+        self._resetFilesTree(filepaths if len(filepaths) > 1 else [])
+        self._resetProgress(True)
         self.clearOutput()
         self._is_importing = True
         self._toggleInput(False)
@@ -153,7 +324,17 @@ class ImportingWindow(QtWidgets.QWidget):
 
     def retranslateUi(self):
         self._filename_filter = ImportingWindow.tr('Any File (*)')
-        self._filepath_edit.setPlaceholderText(ImportingWindow.tr('Path to file...'))
+        self._filepath_edit.setPlaceholderText(ImportingWindow.tr('Path to file or directory...'))
+        self._verbose_check.setText(ImportingWindow.tr('Verbose'))
+        self._verbose_check.setToolTip(ImportingWindow.tr('Show a message for each document read'))
+        self._log_level_label.setText(ImportingWindow.tr('Show:'))
+        self._log_file_button.setToolTip(ImportingWindow.tr('Save messages to a log file'))
+        self._retranslateLogLevelCombo()
+        self._files_tree.setHeaderLabels([
+            ImportingWindow.tr('File'),
+            ImportingWindow.tr('Documents'),
+            ImportingWindow.tr('Status')
+        ])
         self.retranslateImportButton()
     
     def retranslateImportButton(self):
@@ -178,7 +359,8 @@ class ImportingWindow(QtWidgets.QWidget):
             ImportingWindow.tr('Confirmation'),
             ImportingWindow.tr(
                 'A file is currently being imported. Stopping the importing process '
-                'will result in all progress being lost. Do you want to stop it?'
+                'will result in all progress since the last checkpoint being lost. '
+                'Do you want to stop it?'
             ),
             QtWidgets.QMessageBox.StandardButton.Yes | QtWidgets.QMessageBox.StandardButton.No
         )
@@ -195,12 +377,53 @@ class ImportingWindow(QtWidgets.QWidget):
     ################################################################################
     def _toggleInput(self, enabled: bool):
         self._settings_button.setEnabled(enabled)
+        self._verbose_check.setEnabled(enabled)
         self._filepath_edit.setEnabled(enabled)
         self.retranslateImportButton()
 
+    def _resetFilesTree(self, filepaths: typing.Sequence[str]):
+        self._files_tree.clear()
+        self._file_items = {}
+
+        for filepath in filepaths:
+            item = QtWidgets.QTreeWidgetItem([os.path.basename(filepath), '0', ImportingWindow.tr('Waiting')])
+            item.setToolTip(0, filepath)
+            item.setTextAlignment(1, QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter)
+
+            self._files_tree.addTopLevelItem(item)
+            self._file_items[filepath] = item
+
+        self._files_tree.setVisible(len(filepaths) != 0)
+
+    def _resetProgress(self, visible: bool):
+        self._progress_bar.setRange(0, 0)
+        self._progress_bar.setVisible(visible)
+        self._progress_label.clear()
+        self._progress_label.setVisible(visible)
+
+    def _retranslateLogLevelCombo(self):
+        levels = (
+            (logging.DEBUG,   ImportingWindow.tr('All messages')),
+            (logging.INFO,    ImportingWindow.tr('Information')),
+            (logging.WARNING, ImportingWindow.tr('Warnings')),
+            (logging.ERROR,   ImportingWindow.tr('Errors'))
+        )
+
+        current_level = self._log_filter_model.minimumLevel()
+
+        self._log_level_combo.blockSignals(True)
+        self._log_level_combo.clear()
+
+        for level, text in levels:
+            self._log_level_combo.addItem(text, level)
+
+        self._log_level_combo.setCurrentIndex(max(self._log_level_combo.findData(current_level), 0))
+        self._log_level_combo.blockSignals(False)
+
     def _resetState(self):
         self._worker       = None
         self._is_importing = False
+        self._progress_bar.setVisible(False)
         self._toggleInput(True)
         self._import_btn.setEnabled(True)
 
@@ -213,18 +436,73 @@ class ImportingWindow(QtWidgets.QWidget):
 
     @QtCore.pyqtSlot()
     def _onBrowseFileAction(self):
-        result = QtWidgets.QFileDialog.getOpenFileName(
+        result = QtWidgets.QFileDialog.getOpenFileNames(
             self,
-            ImportingWindow.tr('Open File'),
+            ImportingWindow.tr('Open Files'),
             '',
             self._filename_filter
         )
         
-        filepath = result[0]
+        filepath = os.pathsep.join(result[0])
 
         self._filepath_edit.setText(filepath)
         self._import_btn.setEnabled(filepath != '')
 
+    @QtCore.pyqtSlot()
+    def _onBrowseDirectoryAction(self):
+        dirpath = QtWidgets.QFileDialog.getExistingDirectory(self, ImportingWindow.tr('Open Directory'))
+
+        self._filepath_edit.setText(dirpath)
+        self._import_btn.setEnabled(dirpath != '')
+
+    @QtCore.pyqtSlot(int)
+    def _onLogLevelComboIndexChanged(self, index: int):
+        self._log_filter_model.setMinimumLevel(self._log_level_combo.itemData(index))
+
+    @QtCore.pyqtSlot(bool)
+    def _onLogFileButtonClicked(self, checked: bool):
+        path = ''
+
+        if checked:
+            path, _ = QtWidgets.QFileDialog.getSaveFileName(
+                self,
+                ImportingWindow.tr('Save Log File'),
+                '',
+                ImportingWindow.tr('Log Files (*.log);;Any File (*)')
+            )
+
+        try:
+            self.setLogFilePath(path)
+        except OSError as exc:
+            self.setLogFilePath('')
+
+            QtWidgets.QMessageBox.critical(self, ImportingWindow.tr('Save Log File'), str(exc))
+
+    @QtCore.pyqtSlot(str)
+    def _onQueueFileStarted(self, filepath: str):
+        self._file_items[filepath].setText(2, ImportingWindow.tr('Importing'))
+
+    @QtCore.pyqtSlot(str, int, float)
+    def _onQueueFileProgressed(self, filepath: str, count: int, throughput: float):
+        self._file_items[filepath].setText(1, str(count))
+
+    @QtCore.pyqtSlot(importing.WorkerProgress)
+    def _onWorkerProgressed(self, progress: importing.WorkerProgress):
+        if progress.bytes_total > 0 and progress.bytes_read > 0:
+            self._progress_bar.setRange(0, 1000)
+            self._progress_bar.setValue(int(1000 * min(progress.bytes_read / progress.bytes_total, 1.0)))
+
+        text = ImportingWindow.tr('{0} documents ({1:.1f} documents/s)').format(progress.read_count, progress.rate())
+
+        if progress.current != '':
+            text += ' - ' + progress.current
+
+        self._progress_label.setText(text)
+
+    @QtCore.pyqtSlot(str, bool)
+    def _onQueueFileFinished(self, filepath: str, completed: bool):
+        self._file_items[filepath].setText(2, ImportingWindow.tr('Completed') if completed else ImportingWindow.tr('Failed'))
+
     @QtCore.pyqtSlot()
     def _onImportButtonClicked(self):
         if self.isImporting():
@@ -234,12 +512,15 @@ class ImportingWindow(QtWidgets.QWidget):
 
     @QtCore.pyqtSlot(type, BaseException, str)
     def _onWorkerError(self, exc_type: typing.Type[BaseException], exc_value: BaseException, exc_tb: str):
+        self.appendOutput(exc_tb, logging.ERROR)
+
         QtWidgets.QMessageBox.critical(
             self,
             exc_type.__name__,
             str(exc_value) + '\n\n' + exc_tb
         )
 
+        self._log_model.flushLogFile()
         self._resetState()
         self.importingError.emit(exc_type, exc_value, exc_tb)
         self.importingFinished.emit(False)
@@ -253,5 +534,6 @@ class ImportingWindow(QtWidgets.QWidget):
                 ImportingWindow.tr('Importing completed with success.')
             )
 
+        self._log_model.flushLogFile()
         self._resetState()
         self.importingFinished.emit(completed)
\ No newline at end of file
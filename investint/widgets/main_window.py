@@ -3,8 +3,8 @@ import os
 import pyqt5_fugueicons as fugue
 import sqlalchemy       as sa
 import typing
-from PyQt5     import QtCore, QtWidgets
-from investint import database, widgets, _version
+from PyQt5     import QtCore, QtGui, QtWidgets
+from investint import database, models, widgets, _version
 
 __all__ = [
     'MainWindow'
@@ -16,6 +16,11 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self._engine: typing.Optional[sa.engine.Engine] = None
 
+        self._snapshot_cache = models.CompanySnapshotCache(os.path.join(
+            QtCore.QStandardPaths.writableLocation(QtCore.QStandardPaths.StandardLocation.CacheLocation),
+            'snapshots'
+        ))
+
         self._initTranslators()
         self._initWidgets()
         self._initActions()
@@ -69,6 +74,10 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self._open_recently_actions = []
 
+        self._snapshot_cache_action = QtWidgets.QAction()
+        self._snapshot_cache_action.setCheckable(True)
+        self._snapshot_cache_action.toggled.connect(self._onSnapshotCacheActionToggled)
+
         self._import_fca_action = QtWidgets.QAction()
         self._import_fca_action.setIcon(fugue.icon('building'))
         self._import_fca_action.triggered.connect(
@@ -117,6 +126,8 @@ class MainWindow(QtWidgets.QMainWindow):
         self._file_menu.addSeparator()
         self._file_menu.addAction(self._save_db_as_action)
         self._file_menu.addSeparator()
+        self._file_menu.addAction(self._snapshot_cache_action)
+        self._file_menu.addSeparator()
         self._file_menu.addMenu(self._import_menu)
         self._file_menu.addSeparator()
         self._file_menu.addAction(self._exit_action)
@@ -168,6 +179,9 @@ class MainWindow(QtWidgets.QMainWindow):
         win.setMinimumSize(600, 300)
         win.importingStarted.connect(functools.partial(self.menuBar().setEnabled, False))
         win.importingStarted.connect(functools.partial(self.centralWidget().setEnabled, False))
+        # Clear cached query results before the company widget selects them again.
+        win.importingFinished.connect(models.QueryCache.globalInstance().clear)
+        win.importingFinished.connect(self._snapshot_cache.clear)
         win.importingFinished.connect(self._company_widget.refresh)
         win.importingFinished.connect(functools.partial(self.menuBar().setEnabled, True))
         win.importingFinished.connect(functools.partial(self.centralWidget().setEnabled, True))
@@ -215,9 +229,14 @@ class MainWindow(QtWidgets.QMainWindow):
         if self._engine is engine:
             return
 
-        database.metadata.create_all(engine)
+        # Save the company being shown while its database is still bound.
+        self._company_widget.saveSnapshot()
+        self._snapshot_cache.setEngine(engine)
+
+        database.createSchema(engine)
         database.Session.remove()
         database.Session.configure(bind=engine)
+        models.QueryCache.globalInstance().clear()
 
         self._engine = engine
         self._company_widget.refresh()
@@ -253,10 +272,7 @@ class MainWindow(QtWidgets.QMainWindow):
             # case, ignore it and proceed to back them up.
             pass
 
-        src_conn = src_engine.raw_connection()
-        dst_conn = dst_engine.raw_connection()
-
-        src_conn.backup(dst_conn.connection)
+        database.backupDatabase(src_engine, dst_engine)
 
         self.setEngine(dst_engine)
 
@@ -309,6 +325,8 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self._open_recently_menu.addActions(self._open_recently_actions)
 
+        self._snapshot_cache_action.setChecked(self._settings.value('companySnapshotCache', False, bool))
+
     def retranslateUi(self):
         self.retranslateWindowTitle()
 
@@ -329,6 +347,9 @@ class MainWindow(QtWidgets.QMainWindow):
         self._save_db_as_action.setText(self.tr('&Save as...'))
         self._save_db_as_action.setStatusTip(self.tr('Save open database to a file'))
 
+        self._snapshot_cache_action.setText(self.tr('Cache Companies on Disk'))
+        self._snapshot_cache_action.setStatusTip(self.tr('Store data of companies on disk to show them faster next time'))
+
         self._exit_action.setText(self.tr('&Exit'))
         self._exit_action.setStatusTip(self.tr('Exit the application'))
 
@@ -389,14 +410,25 @@ class MainWindow(QtWidgets.QMainWindow):
             locale_name = locale.name() # en_US, pt_BR, ...
 
             self._app_translator.load(locale_name, self._translations_path)
+            models.DisplayTextCache.setLocale(locale)
             
             self.retranslateUi()
         
         super().changeEvent(event)
 
+    def closeEvent(self, event: QtGui.QCloseEvent) -> None:
+        self._company_widget.saveSnapshot()
+
+        super().closeEvent(event)
+
     ################################################################################
     # Private slots
     ################################################################################
+    @QtCore.pyqtSlot(bool)
+    def _onSnapshotCacheActionToggled(self, checked: bool):
+        self._company_widget.setSnapshotCache(self._snapshot_cache if checked else None)
+        self._settings.setValue('companySnapshotCache', checked)
+
     def _onRecentlyOpenActionTriggered(self, file_path: str):
         if not os.path.exists(file_path):
             QtWidgets.QMessageBox.information(
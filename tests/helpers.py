@@ -0,0 +1,62 @@
+import cvm
+import datetime
+from investint.models import PublicCompany, Document, Statement, Account, DMPLAccount
+
+def createCompany() -> PublicCompany:
+    return PublicCompany(
+        cnpj                       = '191',
+        corporate_name             = 'Company',
+        establishment_date         = datetime.date(2000, 1, 1),
+        cvm_code                   = '1',
+        industry                   = list(cvm.Industry)[0],
+        registration_date          = datetime.date(2000, 1, 1),
+        registration_status        = list(cvm.RegistrationStatus)[0],
+        registration_status_date   = datetime.date(2000, 1, 1),
+        registration_category      = list(cvm.RegistrationCategory)[0],
+        registration_category_date = datetime.date(2000, 1, 1),
+        fiscal_year_closing_day    = 31,
+        fiscal_year_closing_month  = 12
+    )
+
+def createDocument(document_id: int, company_id: int, version: int) -> Document:
+    bpa = Statement(
+        statement_type  = cvm.StatementType.BPA,
+        balance_type    = cvm.BalanceType.CONSOLIDATED,
+        period_end_date = datetime.date(2020, 12, 31),
+        accounts        = [
+            Account(code='1',    name='Ativo Total',      quantity=100 * version, is_fixed=True),
+            Account(code='1.01', name='Ativo Circulante', quantity=60 * version,  is_fixed=True)
+        ]
+    )
+
+    dmpl = Statement(
+        statement_type    = cvm.StatementType.DMPL,
+        balance_type      = cvm.BalanceType.INDIVIDUAL,
+        period_start_date = datetime.date(2020, 1, 1),
+        period_end_date   = datetime.date(2020, 12, 31),
+        accounts          = [
+            DMPLAccount(
+                code                                = '5.01',
+                name                                = 'Saldos Iniciais',
+                is_fixed                            = True,
+                share_capital                       = 1,
+                capital_reserve_and_treasury_shares = 2,
+                profit_reserves                     = 3,
+                unappropriated_retained_earnings    = 4,
+                other_comprehensive_income          = 5,
+                controlling_interest                = 6,
+                non_controlling_interest            = None,
+                consolidated_equity                 = None
+            )
+        ]
+    )
+
+    return Document(
+        id             = document_id,
+        company_id     = company_id,
+        type           = cvm.DocumentType.DFP,
+        version        = version,
+        reference_date = datetime.date(2020, 12, 31),
+        receipt_date   = datetime.date(2021, 3, 1),
+        statements     = [bpa, dmpl]
+    )
\ No newline at end of file
@@ -0,0 +1,152 @@
+import os
+import time
+import unittest
+from PyQt5            import QtCore
+from PyQt5.QtTest     import QAbstractItemModelTester
+from investint.models import AccountTreeModel, BaseAccount
+
+def createWideModel(sibling_count: int) -> AccountTreeModel:
+    """Returns a model whose account '1' has `sibling_count` children, each of which has a child."""
+
+    accounts = [('1', 'Root', {2020: 0})]
+
+    for i in range(1, sibling_count + 1):
+        accounts.append((f'1.{i}',   'Child',      {2020: i}))
+        accounts.append((f'1.{i}.1', 'Grandchild', {2020: i}))
+
+    model = AccountTreeModel()
+    model.setAccounts([2020], accounts)
+    model.fetchAll()
+
+    return model
+
+def parentLookupTime(model: AccountTreeModel) -> float:
+    """Returns the least time taken to look up the parent of a grandchild of account '1'."""
+
+    root_index = model.index(0, 0)
+    indexes    = [model.index(0, 0, model.index(row, 0, root_index)) for row in range(model.rowCount(root_index))]
+    times      = []
+
+    for _ in range(3):
+        start_time = time.perf_counter()
+
+        for index in indexes:
+            model.parent(index)
+
+        times.append((time.perf_counter() - start_time) / len(indexes))
+
+    return min(times)
+
+class TestAccountTreeModel(unittest.TestCase):
+    def codes(self, model: AccountTreeModel, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> list:
+        codes = []
+
+        # Children are created as views expand their parent.
+        model.fetchMore(parent)
+
+        for row in range(model.rowCount(parent)):
+            index = model.index(row, 0, parent)
+            codes.append((model.data(index), self.codes(model, index)))
+
+        return codes
+
+    def testSetAccounts(self):
+        model  = AccountTreeModel()
+        resets = []
+        model.modelReset.connect(lambda: resets.append(model.columnCount()))
+
+        model.setAccounts([2020, 2021], [
+            ('1.02',    'B',  {2020: 20, 2021: 21}),
+            ('1.01.10', 'AB', {2021: 1}),
+            ('2',       'C',  {2020: 3}),
+            ('1',       'T',  {2020: 1, 2021: 2}),
+            ('1.01',    'A',  {}),
+            ('1.01.9',  'AA', {2020: 5})
+        ])
+
+        self.assertEqual(resets, [4])
+        self.assertEqual(self.codes(model), [
+            ('1', [
+                ('1.01', [('1.01.9', []), ('1.01.10', [])]),
+                ('1.02', [])
+            ]),
+            ('2', [])
+        ])
+
+        b_index = model.index(1, 0, model.index(0, 0))
+
+        self.assertEqual(model.numericColumnData(1), 2021)
+        self.assertEqual(model.text(b_index.siblingAtColumn(1)), 'B')
+        self.assertEqual(model.text(model.index(0, 3, model.index(0, 0, model.index(0, 0)))), '')
+        self.assertEqual(model.quantity(b_index, 0), 20)
+        self.assertEqual(list(model.quantities(model.index(1, 0))), [3, AccountTreeModel.missing_quantity])
+        self.assertIsNone(model.quantity(model.index(1, 0), 1))
+
+    def testModelTester(self):
+        model    = createWideModel(1000)
+        messages = []
+
+        def handleMessage(msg_type, context, msg):
+            if msg_type != QtCore.QtDebugMsg:
+                messages.append(msg)
+
+        # Collect the failures reported by the tester rather than aborting the test run.
+        QtCore.qInstallMessageHandler(handleMessage)
+
+        try:
+            # Checks that `index()`, `parent()` and `rowCount()` agree for every item.
+            QAbstractItemModelTester(model, QAbstractItemModelTester.FailureReportingMode.Warning)
+        finally:
+            QtCore.qInstallMessageHandler(None)
+
+        self.assertEqual(messages, [])
+
+    @unittest.skipUnless(os.environ.get('INVESTINT_BENCHMARK'), 'set INVESTINT_BENCHMARK to run benchmarks')
+    def testParentLookupTime(self):
+        # Looking up the parent shouldn't take longer among 8 times as many siblings.
+        for sibling_count in (500, 4000):
+            lookup_time = parentLookupTime(createWideModel(sibling_count))
+
+            print(f'\nparent() among {sibling_count} siblings: {lookup_time * 1e6:.3f} us')
+
+    def testFetchMore(self):
+        model = AccountTreeModel()
+        model.setAccounts([2020], [('1', 'A', {}), ('1.01', 'B', {}), ('1.01.01', 'C', {2020: 5}), ('2', 'D', {})])
+
+        a_index = model.index(0, 0)
+
+        self.assertEqual(model.rowCount(), 2)
+        self.assertEqual(model.rowCount(a_index), 0)
+        self.assertTrue(model.hasChildren(a_index))
+        self.assertTrue(model.canFetchMore(a_index))
+        self.assertFalse(model.hasChildren(model.index(1, 0)))
+
+        inserted = []
+        model.rowsInserted.connect(lambda parent, first, last: inserted.append((model.data(parent), first, last)))
+        model.fetchMore(a_index)
+
+        self.assertEqual(inserted, [('1', 0, 0)])
+        self.assertFalse(model.canFetchMore(a_index))
+
+        b_index = model.index(0, 0, a_index)
+        model.fetchMore(b_index)
+
+        self.assertEqual(model.quantity(model.index(0, 0, b_index), 0), 5)
+
+    def testSetOrderedAccounts(self):
+        codes = ['1.02', '1.01.10', '2', '1', '1.01', '1.01.9']
+        codes.sort(key=BaseAccount.sortKeyOf)
+
+        self.assertEqual(codes, ['1', '1.01', '1.01.9', '1.01.10', '1.02', '2'])
+
+        model = AccountTreeModel()
+        model.setOrderedAccounts([2020], [(code, BaseAccount.parentCodeOf(code), code, {2020: i}) for i, code in enumerate(codes)])
+
+        self.assertEqual(self.codes(model), [
+            ('1', [
+                ('1.01', [('1.01.9', []), ('1.01.10', [])]),
+                ('1.02', [])
+            ]),
+            ('2', [])
+        ])
+        self.assertEqual(model.quantity(model.index(1, 0), 0), 5)
\ No newline at end of file
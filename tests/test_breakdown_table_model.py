@@ -1,6 +1,7 @@
+import datetime
 import unittest
 from PyQt5            import QtCore
-from investint.models import BreakdownTableModel
+from investint.models import BreakdownTableModel, DisplayTextCache
 
 class TestBreakdownTableModel(unittest.TestCase):
     def testRowCount(self):
@@ -78,6 +79,14 @@ class TestBreakdownTableModel(unittest.TestCase):
         self.assertEqual(model.number('b', 1), 50)
         self.assertEqual(model.number('c', 1), 60)
 
+    def testIntegerNumber(self):
+        model = BreakdownTableModel(['a', 'b'])
+        model.append(2010, {'a': 5000000000, 'b': 2.5})
+
+        self.assertIs(type(model.number('a', 0)), int)
+        self.assertIs(type(model.number('b', 0)), float)
+        self.assertEqual(model.numberText(0, 0), DisplayTextCache.locale().toString(5000000000))
+
     def testHorizontalAnalysis(self):
         model = BreakdownTableModel(['a', 'b', 'c'])
         model.setHorizontalAnalysisEnabled(True)
@@ -104,4 +113,84 @@ class TestBreakdownTableModel(unittest.TestCase):
         
         self.assertEqual(model.data(model.index(model.rowFromName('a'), 1)), '300.00%')
         self.assertEqual(model.data(model.index(model.rowFromName('b'), 1)), '150.00%')
-        self.assertEqual(model.data(model.index(model.rowFromName('c'), 1)), '100.00%')
\ No newline at end of file
+        self.assertEqual(model.data(model.index(model.rowFromName('c'), 1)), '100.00%')
+
+    def testToggleHorizontalAnalysis(self):
+        model = BreakdownTableModel(['a', 'b', 'c'])
+        model.append(2010, {'a': 10, 'b': 0})
+        model.append(2011, {'a': 40, 'b': 5, 'c': 3})
+        model.setHorizontalAnalysisEnabled(True)
+        model.append(2012, {'a': 20, 'c': 6})
+
+        self.assertEqual(model.columnCount(), 5)
+        self.assertEqual(model.columnFromData(2012), 4)
+        self.assertEqual([model.number('a', column) for column in range(5)], [10, 3, 40, -0.5, 20])
+        self.assertEqual([model.number('b', column) for column in range(5)], [0, 0, 5, None, None])
+        self.assertEqual([model.number('c', column) for column in range(5)], [None, None, 3, 1, 6])
+
+        model.setHorizontalAnalysisEnabled(False)
+
+        self.assertEqual(model.columnCount(), 3)
+        self.assertEqual([model.number('a', column) for column in range(3)], [10, 40, 20])
+
+    def testVerticalAnalysis(self):
+        model = BreakdownTableModel(['a', 'b', 'total'])
+        model.append(2010, {'a': 10, 'b': 30, 'total': 40})
+        model.append(2011, {'a': 20, 'total': 0})
+        model.setVerticalAnalysisRow('total')
+        model.setVerticalAnalysisEnabled(True)
+
+        self.assertEqual(model.columnCount(), 4)
+        self.assertTrue(model.isVerticalAnalysisColumn(1))
+        self.assertEqual(model.columnFromData(2011), 2)
+        self.assertEqual([model.number(row, 1) for row in range(3)], [0.25, 0.75, 1])
+        self.assertEqual([model.number(row, 3) for row in range(3)], [None, None, None])
+
+    def testYearOverYearAnalysis(self):
+        model = BreakdownTableModel(['a'])
+        model.setYearOverYearAnalysisEnabled(True)
+
+        for quarter, number in enumerate([10, 20, 30, 40, 15, 20]):
+            model.append(datetime.date(2010 + quarter // 4, 3 * (quarter % 4) + 1, 1), {'a': number})
+
+        yoy_numbers = [model.number('a', column) for column in range(model.columnCount()) if model.isYearOverYearAnalysisColumn(column)]
+
+        self.assertEqual(yoy_numbers, [None, None, None, None, 0.5, 0])
+
+    def testToggleAnalysesKeepsColumns(self):
+        model = BreakdownTableModel(['a'])
+        model.append(2010, {'a': 10})
+        model.append(2011, {'a': 20})
+
+        model.setHorizontalAnalysisEnabled(True)
+        model.setVerticalAnalysisEnabled(True)
+        model.setYearOverYearAnalysisEnabled(True)
+        model.setHorizontalAnalysisEnabled(False)
+
+        self.assertEqual([model.columnName(column) for column in range(model.columnCount())], ['2010', 'VA %', 'YoY %', '2011', 'VA %', 'YoY %'])
+        self.assertEqual(model.number('a', 5), 1)
+
+    def testExtend(self):
+        model = BreakdownTableModel(['a', 'b'])
+        model.append(2010, {'a': 10})
+
+        inserted = []
+        model.columnsInserted.connect(lambda parent, first, last: inserted.append((first, last)))
+        model.extend([(2011, {'a': 20, 'b': 5}), (2012, {'b': 6})])
+
+        self.assertEqual(inserted, [(1, 2)])
+        self.assertEqual([model.number('a', column) for column in range(3)], [10, 20, None])
+        self.assertEqual([model.number('b', column) for column in range(3)], [None, 5, 6])
+
+    def testSetColumns(self):
+        model = BreakdownTableModel(['a'])
+        model.setHorizontalAnalysisEnabled(True)
+        model.append(2010, {'a': 10})
+
+        resets = []
+        model.modelReset.connect(lambda: resets.append(model.columnCount()))
+        model.setColumns([(2011, {'a': 20}), (2012, {'a': 30})])
+
+        self.assertEqual(resets, [3])
+        self.assertEqual(model.columnData(0), 2011)
+        self.assertEqual(model.number('a', 1), 0.5)
\ No newline at end of file
@@ -0,0 +1,87 @@
+import os
+import shutil
+import tempfile
+import unittest
+from investint           import database, models
+from investint.importing import DocumentBulkLoader
+from tests.helpers       import createCompany, createDocument
+
+class TestCompanySnapshotCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+        engine = database.createEngineFromFile(os.path.join(self.directory, 'db.sqlite3'))
+        engine.echo = False
+        database.createSchema(engine)
+        database.Session.configure(bind=engine)
+
+        self.session = database.Session()
+        self.company = createCompany()
+        self.session.add(self.company)
+        self.session.flush()
+        self.session.add(createDocument(1, self.company.id, version=1))
+        self.session.commit()
+
+        self.cache = models.CompanySnapshotCache(os.path.join(self.directory, 'snapshots'))
+        self.cache.setEngine(engine)
+
+    def tearDown(self):
+        database.Session.remove()
+        shutil.rmtree(self.directory)
+
+    def testSaveAndLoad(self):
+        entries = {('CompanyIndicatorModel', self.company.id): [(1, 2.5)]}
+
+        self.cache.save(self.company, entries)
+
+        self.assertEqual(self.cache.load(self.company), entries)
+
+    def testLoadStaleSnapshot(self):
+        self.cache.save(self.company, {'key': [1]})
+
+        self.session.add(createDocument(2, self.company.id, version=1))
+        self.session.commit()
+
+        self.assertEqual(self.cache.load(self.company), {})
+        self.assertEqual(os.listdir(os.path.dirname(self.cache._filepath(self.company))), [])
+
+    def testLoadRewrittenSnapshot(self):
+        self.cache.save(self.company, {'key': [1]})
+
+        # Import the same document again, with the same version.
+        loader = DocumentBulkLoader(self.session)
+        loader.add(createDocument(1, self.company.id, version=1))
+        loader.flush()
+        self.session.commit()
+
+        self.assertEqual(self.cache.load(self.company), {})
+
+    def testLoadWithoutDatabase(self):
+        stamp = self.cache.stamp(self.company)
+
+        self.cache.save(self.company, {'key': [1]}, stamp)
+        self.session.close()
+
+        with database.Session().get_bind().begin() as conn:
+            conn.exec_driver_sql('DROP TABLE statement')
+
+        self.assertEqual(self.cache.load(self.company), {})
+        self.assertEqual(self.cache.load(self.company, stamp), {'key': [1]})
+
+    def testClear(self):
+        self.cache.save(self.company, {'key': [1]})
+        self.cache.clear()
+
+        self.assertEqual(self.cache.load(self.company), {})
+        self.assertFalse(os.path.exists(os.path.dirname(self.cache._filepath(self.company))))
+
+        self.cache.save(self.company, {'key': [1]})
+
+        self.assertEqual(self.cache.load(self.company), {'key': [1]})
+
+    def testInMemoryDatabase(self):
+        self.cache.setEngine(database.createEngineInMemory())
+        self.cache.save(self.company, {'key': [1]})
+
+        self.assertFalse(self.cache.isEnabled())
+        self.assertEqual(self.cache.load(self.company), {})
\ No newline at end of file
@@ -0,0 +1,44 @@
+import unittest
+import sqlalchemy as sa
+from investint import database, models
+
+class TestDatabaseSchema(unittest.TestCase):
+    def indexNames(self, engine: sa.engine.Engine, table_name: str) -> set:
+        return {index['name'] for index in sa.inspect(engine).get_indexes(table_name)}
+
+    def testCreateIndexesOfExistingTables(self):
+        engine = sa.create_engine('sqlite://', future=True)
+
+        # Create tables as in a database created before the indexes existed.
+        with engine.begin() as conn:
+            for table in database.metadata.sorted_tables:
+                table.create(conn)
+
+                for index in table.indexes:
+                    index.drop(conn)
+
+        self.assertEqual(self.indexNames(engine, 'document'), set())
+
+        database.createSchema(engine)
+        database.createSchema(engine)
+
+        self.assertEqual(self.indexNames(engine, 'document'),     {'ix_document_company_id_type_reference_date'})
+        self.assertEqual(self.indexNames(engine, 'base_account'), {'ix_base_account_statement_id'})
+
+    def testCreateColumnsOfExistingTables(self):
+        engine = sa.create_engine('sqlite://', future=True)
+
+        # Create `base_account` as in a database created before its hierarchy columns existed.
+        with engine.begin() as conn:
+            conn.execute(sa.text('CREATE TABLE base_account (id INTEGER PRIMARY KEY, statement_id INTEGER, code VARCHAR(18) NOT NULL, name VARCHAR(100) NOT NULL, is_fixed BOOLEAN NOT NULL, type VARCHAR(10) NOT NULL)'))
+            conn.execute(sa.text("INSERT INTO base_account VALUES (1, NULL, '1.01', 'Ativo Circulante', 1, 'account')"))
+
+        database.createSchema(engine)
+        database.createSchema(engine)
+
+        column_names = {column['name'] for column in sa.inspect(engine).get_columns('base_account')}
+
+        self.assertTrue({'parent_code', 'depth', 'sort_key'} <= column_names)
+
+        with engine.connect() as conn:
+            self.assertEqual(conn.execute(sa.text('SELECT code, parent_code FROM base_account')).all(), [('1.01', None)])
\ No newline at end of file
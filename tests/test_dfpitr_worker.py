@@ -0,0 +1,103 @@
+import cvm
+import io
+import unittest
+from investint           import database, models
+from investint.importing import DfpItrWorker
+from tests.helpers       import createCompany, createDocument
+
+BPA_CON = (cvm.StatementType.BPA, cvm.BalanceType.CONSOLIDATED)
+DRE_CON = (cvm.StatementType.DRE, cvm.BalanceType.CONSOLIDATED)
+
+class TestDfpItrWorker(unittest.TestCase):
+    def testFilterMember(self):
+        data = (
+            b'CNPJ_CIA;DT_REFER;VL_CONTA\r\n'
+            b'00.000.000/0001-91;2020-12-31;1\r\n'
+            b'33.000.167/0001-01;2020-12-31;2\r\n'
+            b'00.000.000/0001-91;2020-12-31;3\r\n'
+            b'00.000.000/0001-911;2020-12-31;4\r\n'
+            b'00.000.000/0001-91;2020-12-31;5'
+        )
+
+        worker = DfpItrWorker(['191'], 'dfp.zip')
+        member = worker.filterMember('dfp_cia_aberta_BPA_con_2020.csv', io.BytesIO(data))
+
+        self.assertEqual(member.read().splitlines(), [
+            b'CNPJ_CIA;DT_REFER;VL_CONTA',
+            b'00.000.000/0001-91;2020-12-31;1',
+            b'00.000.000/0001-91;2020-12-31;3',
+            b'00.000.000/0001-91;2020-12-31;5'
+        ])
+
+    def testFilterMemberWithoutCnpjs(self):
+        member = io.BytesIO(b'CNPJ_CIA\n')
+        worker = DfpItrWorker([], 'dfp.zip')
+
+        self.assertIs(worker.filterMember('dfp_cia_aberta_2020.csv', member), member)
+
+    def testFilterMemberByStatementType(self):
+        worker = DfpItrWorker([], 'dfp.zip', statement_types=[(cvm.StatementType.DRE, cvm.BalanceType.CONSOLIDATED)])
+
+        read_names = [
+            name
+            for name in (
+                'dfp_cia_aberta_2020.csv',
+                'dfp_cia_aberta_BPA_con_2020.csv',
+                'dfp_cia_aberta_BPA_ind_2020.csv',
+                'dfp_cia_aberta_DRE_con_2020.csv',
+                'dfp_cia_aberta_DRE_ind_2020.csv',
+                'dfp_cia_aberta_DFC_MI_con_2020.csv'
+            )
+            if worker.filterMember(name, io.BytesIO()) is not None
+        ]
+
+        # BPA is read, but not imported, as the reader requires it.
+        self.assertEqual(read_names, [
+            'dfp_cia_aberta_2020.csv',
+            'dfp_cia_aberta_BPA_con_2020.csv',
+            'dfp_cia_aberta_DRE_con_2020.csv'
+        ])
+
+    def testIsImported(self):
+        worker = DfpItrWorker([], 'dfp.zip')
+        worker._company_ids       = {}
+        worker._document_versions = {1: 2}
+        worker._stored_types      = {1: {BPA_CON}}
+
+        self.assertTrue(worker.isImported(1, 2, [BPA_CON]))
+        self.assertFalse(worker.isImported(1, 2, [BPA_CON, DRE_CON]))
+        self.assertTrue(worker.isImported(1, 1, [DRE_CON]))
+        self.assertFalse(worker.isImported(1, 3, []))
+        self.assertFalse(worker.isImported(2, 1, []))
+
+    def testMergeDocument(self):
+        engine = database.createEngineInMemory()
+        database.metadata.create_all(engine)
+        database.Session.configure(bind=engine)
+
+        try:
+            session = database.Session()
+            company = createCompany()
+            session.add(company)
+            session.flush()
+            session.add(createDocument(1, company.id, version=1))
+            session.commit()
+
+            doc = createDocument(1, company.id, version=2)
+            doc.statements = [stmt for stmt in doc.statements if stmt.statement_type == cvm.StatementType.BPA]
+
+            worker = DfpItrWorker([], 'dfp.zip', statement_types=[BPA_CON])
+            worker.mergeDocument(doc)
+            worker.commit()
+
+            session.expire_all()
+            doc = session.get(models.Document, 1)
+
+            self.assertEqual(doc.version, 2)
+            self.assertEqual(sorted(stmt.statement_type.name for stmt in doc.statements), ['BPA', 'DMPL'])
+            self.assertEqual(
+                sorted(account.quantity for stmt in doc.statements for account in stmt.accounts if isinstance(account, models.Account)),
+                [120, 200]
+            )
+        finally:
+            database.Session.remove()
\ No newline at end of file
@@ -0,0 +1,46 @@
+import unittest
+from PyQt5            import QtCore
+from investint.models import BreakdownTableModel, DisplayTextCache
+
+class TestDisplayTextCache(unittest.TestCase):
+    def setUp(self):
+        self.model = BreakdownTableModel(['a'])
+        self.model.append(2010, {'a': 1234.5})
+        self.cache = DisplayTextCache(self.model)
+        self.calls = []
+
+    def tearDown(self):
+        DisplayTextCache.setLocale(QtCore.QLocale())
+
+    def text(self, row: int, column: int) -> str:
+        return self.cache.text((row, column), self.format, row, column)
+
+    def format(self, row: int, column: int) -> str:
+        self.calls.append((row, column))
+        return DisplayTextCache.locale().toString(self.model.number(row, column))
+
+    def testText(self):
+        DisplayTextCache.setLocale(QtCore.QLocale('en_US'))
+
+        self.assertEqual(self.text(0, 0), '1,234.5')
+        self.assertEqual(self.text(0, 0), '1,234.5')
+        self.assertEqual(self.calls, [(0, 0)])
+
+    def testClearOnDataChange(self):
+        self.text(0, 0)
+        self.model.append(2011, {'a': 1})
+
+        self.assertEqual(self.cache.count(), 0)
+
+    def testClearOnLocaleChange(self):
+        DisplayTextCache.setLocale(QtCore.QLocale('en_US'))
+        self.text(0, 0)
+
+        changed = []
+        self.model.dataChanged.connect(lambda top_left, bottom_right: changed.append((top_left.column(), bottom_right.column())))
+
+        DisplayTextCache.setLocale(QtCore.QLocale('pt_BR'))
+
+        # Emitted by both `self.cache` and the cache of `self.model`.
+        self.assertEqual(set(changed), {(0, 0)})
+        self.assertEqual(self.text(0, 0), '1.234,5')
\ No newline at end of file
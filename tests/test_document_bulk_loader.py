@@ -0,0 +1,96 @@
+import cvm
+import unittest
+import sqlalchemy     as sa
+import sqlalchemy.orm as sa_orm
+from investint           import database
+from investint.importing import DocumentBulkLoader
+from investint.models    import Document, Statement, Account, DMPLAccount
+from tests.helpers       import createCompany, createDocument
+
+class TestDocumentBulkLoader(unittest.TestCase):
+    def setUp(self):
+        engine = sa.create_engine('sqlite://', future=True)
+        database.metadata.create_all(engine)
+
+        self.session = sa_orm.Session(engine, future=True)
+        self.company = createCompany()
+
+        self.session.add(self.company)
+        self.session.flush()
+
+    def tearDown(self):
+        self.session.close()
+
+    def count(self, table: sa.Table) -> int:
+        return self.session.execute(sa.select(sa.func.count()).select_from(table)).scalar()
+
+    def testFlush(self):
+        loader = DocumentBulkLoader(self.session)
+        loader.add(createDocument(1, self.company.id, 1))
+        loader.add(createDocument(2, self.company.id, 1))
+
+        self.assertEqual(loader.pendingCount(), 2)
+
+        loader.flush()
+
+        self.assertEqual(loader.pendingCount(), 0)
+        self.assertEqual(self.count(Document.__table__), 2)
+        self.assertEqual(self.count(Statement.__table__), 4)
+        self.assertEqual(self.count(Account.__table__), 4)
+        self.assertEqual(self.count(DMPLAccount.__table__), 2)
+
+        doc = self.session.get(Document, 1)
+        bpa = next(stmt for stmt in doc.statements if stmt.statement_type == cvm.StatementType.BPA)
+
+        self.assertEqual(doc.company.cnpj, '191')
+        self.assertEqual(sorted(account.quantity for account in bpa.accounts), [60, 100])
+
+    def testBatchSize(self):
+        loader = DocumentBulkLoader(self.session, batch_size=2)
+        loader.add(createDocument(1, self.company.id, 1))
+        loader.add(createDocument(2, self.company.id, 1))
+        loader.add(createDocument(3, self.company.id, 1))
+
+        self.assertEqual(loader.pendingCount(), 1)
+        self.assertEqual(self.count(Document.__table__), 2)
+
+    def testReplaceExistingDocument(self):
+        loader = DocumentBulkLoader(self.session)
+        loader.add(createDocument(1, self.company.id, 1))
+        loader.flush()
+
+        loader.add(createDocument(1, self.company.id, 2))
+        loader.flush()
+
+        self.assertEqual(self.count(Document.__table__), 1)
+        self.assertEqual(self.count(Statement.__table__), 2)
+        self.assertEqual(self.count(Account.__table__), 2)
+        self.assertEqual(self.count(DMPLAccount.__table__), 1)
+
+        version = self.session.execute(sa.select(Document.version).where(Document.id == 1)).scalar()
+
+        self.assertEqual(version, 2)
+
+    def testReplaceStatementTypes(self):
+        loader = DocumentBulkLoader(self.session)
+        loader.add(createDocument(1, self.company.id, 1))
+        loader.flush()
+
+        doc = createDocument(1, self.company.id, 2)
+        doc.statements = [stmt for stmt in doc.statements if stmt.statement_type == cvm.StatementType.BPA]
+
+        loader.add(doc, frozenset({(cvm.StatementType.BPA, cvm.BalanceType.CONSOLIDATED)}))
+        loader.flush()
+
+        self.assertEqual(self.count(Document.__table__), 1)
+        self.assertEqual(self.count(Statement.__table__), 2)
+        self.assertEqual(self.count(Account.__table__), 2)
+        self.assertEqual(self.count(DMPLAccount.__table__), 1)
+
+        doc  = self.session.get(Document, 1)
+        bpa  = next(stmt for stmt in doc.statements if stmt.statement_type == cvm.StatementType.BPA)
+        dmpl = next(stmt for stmt in doc.statements if stmt.statement_type == cvm.StatementType.DMPL)
+
+        self.assertEqual(doc.version, 2)
+        self.assertEqual(sorted(account.quantity for account in bpa.accounts), [120, 200])
+        self.assertEqual(dmpl.document_version, 1)
\ No newline at end of file
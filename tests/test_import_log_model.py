@@ -0,0 +1,95 @@
+import logging
+import os
+import tempfile
+import unittest
+from investint.models import ImportLogModel, ImportLogFilterModel
+
+class TestImportLogModel(unittest.TestCase):
+    def lines(self, model) -> list:
+        return [model.index(row, 0).data() for row in range(model.rowCount())]
+
+    def testMaxLines(self):
+        model = ImportLogModel(max_lines=3)
+
+        for i in range(10):
+            model.append(str(i))
+
+        self.assertEqual(self.lines(model), ['7', '8', '9'])
+
+        model.append('a\nb', logging.WARNING)
+
+        self.assertEqual(self.lines(model), ['9', 'a', 'b'])
+        self.assertEqual(model.level(1), logging.WARNING)
+
+        model.setMaxLines(2)
+
+        self.assertEqual(self.lines(model), ['a', 'b'])
+
+        model.setMaxLines(4)
+        model.append('c')
+
+        self.assertEqual(self.lines(model), ['a', 'b', 'c'])
+
+    def testFilter(self):
+        model = ImportLogModel(max_lines=3)
+        model.append('debug', logging.DEBUG)
+        model.append('info', logging.INFO)
+
+        filter_model = ImportLogFilterModel()
+        filter_model.setSourceModel(model)
+        filter_model.setMinimumLevel(logging.INFO)
+
+        self.assertEqual(self.lines(filter_model), ['info'])
+
+        model.append('error', logging.ERROR)
+        model.append('debug', logging.DEBUG)
+
+        self.assertEqual(self.lines(filter_model), ['info', 'error'])
+
+        filter_model.setMinimumLevel(logging.DEBUG)
+
+        self.assertEqual(self.lines(filter_model), ['info', 'error', 'debug'])
+
+    def testFilterRemovedLines(self):
+        model = ImportLogModel(max_lines=20)
+
+        filter_model = ImportLogFilterModel()
+        filter_model.setSourceModel(model)
+        filter_model.setMinimumLevel(logging.INFO)
+
+        for i in range(50):
+            model.append(str(i), logging.INFO if i % 3 == 0 else logging.DEBUG)
+
+            expected = [line for row, line in enumerate(self.lines(model)) if model.level(row) >= logging.INFO]
+
+            self.assertEqual(self.lines(filter_model), expected)
+
+        # Lines are removed two at a time, a tenth of the maximum.
+        self.assertEqual(model.rowCount(), 20)
+        self.assertEqual(self.lines(model)[0], '30')
+
+        model.clear()
+
+        self.assertEqual(filter_model.rowCount(), 0)
+
+    def testLogFile(self):
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+
+        try:
+            model = ImportLogModel(max_lines=1)
+            model.setLogFilePath(path)
+
+            for i in range(5):
+                model.append(str(i), logging.WARNING)
+
+            model.setLogFilePath('')
+
+            with open(path, encoding='utf-8') as file:
+                lines = file.read().splitlines()
+
+            self.assertEqual(len(lines), 5)
+            self.assertTrue(all('WARNING' in line for line in lines))
+            self.assertTrue(lines[-1].endswith(' 4'))
+        finally:
+            os.remove(path)
@@ -0,0 +1,53 @@
+import functools
+import os
+import tempfile
+import typing
+import unittest
+from investint           import database
+from investint.importing import ImportQueue, SqlWorker
+
+class LineWorker(SqlWorker):
+    # Objects passed to `readOne()`, which is called on the thread running `ImportQueue.run()`.
+    received: typing.List[typing.Tuple[str, str]] = []
+
+    def readOne(self, obj: typing.Any):
+        LineWorker.received.append((self.filepath(), obj.strip()))
+
+class TestImportQueue(unittest.TestCase):
+    def setUp(self):
+        engine = database.createEngineInMemory()
+        database.metadata.create_all(engine)
+        database.Session.configure(bind=engine)
+
+        self.filepaths = []
+        LineWorker.received.clear()
+
+        for i in range(3):
+            fd, filepath = tempfile.mkstemp()
+
+            with os.fdopen(fd, 'w') as file:
+                file.write('\n'.join(str(i * 100 + j) for j in range(10)))
+
+            self.filepaths.append(filepath)
+
+    def tearDown(self):
+        database.Session.remove()
+
+        for filepath in self.filepaths:
+            os.remove(filepath)
+
+    def testRun(self):
+        factories = [functools.partial(LineWorker, filepath) for filepath in self.filepaths]
+        import_queue = ImportQueue(factories, process_count=2, chunk_size=3)
+
+        finished_files = []
+        results        = []
+        import_queue.signals().fileFinished.connect(lambda filepath, completed: finished_files.append(filepath))
+        import_queue.signals().finished.connect(results.append)
+        import_queue.run()
+
+        self.assertEqual(finished_files, self.filepaths)
+        self.assertEqual(results, [True])
+        self.assertEqual(LineWorker.received, [
+            (filepath, str(i * 100 + j)) for i, filepath in enumerate(self.filepaths) for j in range(10)
+        ])
@@ -0,0 +1,72 @@
+import unittest
+from PyQt5     import QtCore
+from investint import database, models
+
+class TestQueryCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Results are applied by queued signals, which need an application.
+        cls.app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+    def setUp(self):
+        engine = database.createEngineInMemory()
+        engine.echo = False
+        database.Session.configure(bind=engine)
+
+        self.cache = models.QueryCache(max_cost=5)
+
+    def tearDown(self):
+        database.Session.remove()
+
+    def testEvictLeastRecentlyUsed(self):
+        self.cache.put('a', [1, 2])
+        self.cache.put('b', [3, 4])
+        self.cache.get('a')
+        self.cache.put('c', [5, 6])
+
+        self.assertTrue(self.cache.contains('a'))
+        self.assertFalse(self.cache.contains('b'))
+        self.assertTrue(self.cache.contains('c'))
+        self.assertEqual(self.cache.totalCost(), 4)
+
+        # Too costly to be stored.
+        self.cache.put('d', list(range(6)))
+
+        self.assertFalse(self.cache.contains('d'))
+
+    def testLoad(self):
+        fetched = []
+        applied = []
+
+        def fetch(session):
+            fetched.append(session)
+            return [len(fetched)]
+
+        self.cache.load('key', fetch, applied.append)
+        self.cache.load('key', fetch, applied.append)
+
+        self.assertEqual(len(fetched), 1)
+        self.assertEqual(applied, [[1], [1]])
+
+        self.cache.clear()
+        self.cache.load('key', fetch, applied.append)
+
+        self.assertEqual(applied[-1], [2])
+
+    def testClearWhileLoading(self):
+        loader  = models.QueryLoader()
+        applied = []
+
+        self.cache.load('key', lambda session: ['stale'], applied.append, loader, 'model')
+        self.cache.clear()
+        loader.waitForDone()
+
+        # The result is applied, but not stored, as it may predate `clear()`.
+        self.assertEqual(applied, [['stale']])
+        self.assertFalse(self.cache.contains('key'))
+
+        self.cache.load('key', lambda session: ['fresh'], applied.append, loader, 'model')
+        loader.waitForDone()
+
+        self.assertEqual(applied[-1], ['fresh'])
+        self.assertTrue(self.cache.contains('key'))
@@ -0,0 +1,74 @@
+import threading
+import unittest
+import sqlalchemy as sa
+from PyQt5     import QtCore
+from investint import database, models
+
+class TestQueryLoader(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Results are applied by queued signals, which need an application.
+        cls.app = QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+    def setUp(self):
+        engine = database.createEngineInMemory()
+        engine.echo = False
+        database.Session.configure(bind=engine)
+
+        self.loader = models.QueryLoader()
+
+    def tearDown(self):
+        self.loader.waitForDone()
+        database.Session.remove()
+
+    def testLoad(self):
+        results = []
+        loading = []
+
+        self.loader.loadingChanged.connect(loading.append)
+        self.loader.load('key', lambda session: session.execute(sa.select(sa.literal(42))).scalar(), results.append)
+
+        self.assertTrue(self.loader.isLoading('key'))
+        self.assertTrue(self.loader.waitForDone(5000))
+        self.assertEqual(results, [42])
+        self.assertEqual(loading, [True, False])
+        self.assertFalse(self.loader.isLoading())
+
+    def testLoadCancelsPreviousLoad(self):
+        started = threading.Event()
+        release = threading.Event()
+        results = []
+
+        def fetchFirst(session):
+            started.set()
+            release.wait(5)
+            return 'first'
+
+        self.loader.load('key', fetchFirst, results.append)
+        started.wait(5)
+
+        self.loader.load('key',   lambda session: 'second', results.append)
+        self.loader.load('other', lambda session: 'other',  results.append)
+
+        release.set()
+
+        self.assertTrue(self.loader.waitForDone(5000))
+        self.assertEqual(sorted(results), ['other', 'second'])
+
+    def testFailedLoad(self):
+        results = []
+
+        def fetch(session):
+            raise RuntimeError('failed')
+
+        # Don't print the traceback logged by the loader.
+        QtCore.qInstallMessageHandler(lambda *args: None)
+
+        try:
+            self.loader.load('key', fetch, results.append)
+            self.assertTrue(self.loader.waitForDone(5000))
+        finally:
+            QtCore.qInstallMessageHandler(None)
+
+        self.assertEqual(results, [])
+        self.assertFalse(self.loader.isLoading())
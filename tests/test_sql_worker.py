@@ -0,0 +1,92 @@
+import os
+import tempfile
+import types
+import typing
+import unittest
+from investint           import database, models
+from investint.importing import SqlWorker
+
+class LineWorker(SqlWorker):
+    def __init__(self, filepath: str, failing_id: typing.Optional[int] = None) -> None:
+        super().__init__(filepath=filepath)
+
+        self.failing_id = failing_id
+        self.read_ids   = []
+
+    def reader(self, file: typing.IO) -> typing.Iterable[typing.Any]:
+        return (types.SimpleNamespace(id=int(line)) for line in file)
+
+    def readOne(self, obj: typing.Any):
+        if obj.id == self.failing_id:
+            raise RuntimeError('failed')
+
+        self.read_ids.append(obj.id)
+
+class AccountWorker(SqlWorker):
+    def reader(self, file: typing.IO) -> typing.Iterable[typing.Any]:
+        return (int(line) for line in file)
+
+    def readOne(self, obj: typing.Any):
+        account = self.session().query(models.Account).filter_by(code=str(obj)).one_or_none()
+
+        if account is None:
+            self.session().add(models.Account(code=str(obj), name='Account', is_fixed=True, quantity=obj))
+        else:
+            # Only odd accounts have their quantity changed.
+            account.quantity = obj + obj % 2
+
+        self.session().flush()
+
+class TestSqlWorker(unittest.TestCase):
+    def setUp(self):
+        engine = database.createEngineInMemory()
+        database.metadata.create_all(engine)
+        database.Session.configure(bind=engine)
+
+        fd, self.filepath = tempfile.mkstemp()
+
+        with os.fdopen(fd, 'w') as file:
+            file.write('\n'.join(str(i) for i in range(1, 11)))
+
+    def tearDown(self):
+        database.Session.remove()
+        os.remove(self.filepath)
+
+    def checkpoints(self) -> typing.List[models.ImportCheckpoint]:
+        return database.Session().query(models.ImportCheckpoint).all()
+
+    def testResumeFromCheckpoint(self):
+        worker = LineWorker(self.filepath, failing_id=8)
+        worker.setCommitInterval(3)
+        worker.run()
+
+        checkpoints = self.checkpoints()
+
+        self.assertEqual(len(checkpoints), 1)
+        self.assertEqual(checkpoints[0].read_count, 6)
+        self.assertEqual(checkpoints[0].last_document_id, 6)
+
+        worker = LineWorker(self.filepath)
+        worker.setCommitInterval(3)
+        worker.run()
+
+        self.assertEqual(worker.read_ids, [7, 8, 9, 10])
+        self.assertEqual(len(self.checkpoints()), 0)
+
+    def testNoCommitInterval(self):
+        worker = LineWorker(self.filepath, failing_id=8)
+        worker.run()
+
+        self.assertEqual(len(self.checkpoints()), 0)
+
+    def testRowCount(self):
+        worker = AccountWorker(self.filepath)
+        worker.run()
+
+        # Each account is a row of both `base_account` and `account`.
+        self.assertEqual(worker.rowCount(), 20)
+
+        worker = AccountWorker(self.filepath)
+        worker.run()
+
+        self.assertEqual(worker.rowCount(), 5)
\ No newline at end of file
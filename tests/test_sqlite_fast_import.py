@@ -0,0 +1,73 @@
+import datetime
+import os
+import shutil
+import tempfile
+import unittest
+import sqlalchemy as sa
+from investint import database, models
+
+class TestSqliteFastImport(unittest.TestCase):
+    def setUp(self):
+        self.dirpath = tempfile.mkdtemp()
+        self.engine  = database.createEngineFromFile(os.path.join(self.dirpath, 'db.sqlite3'))
+        self.engine.echo = False
+
+        database.createSchema(self.engine)
+
+        with self.engine.begin() as conn:
+            conn.execute(models.ImportCheckpoint.__table__.insert(), {
+                'archive_hash': 'a',
+                'read_count':   1,
+                'updated_at':   datetime.datetime.now()
+            })
+
+    def tearDown(self):
+        self.engine.dispose()
+        shutil.rmtree(self.dirpath)
+
+    def pragma(self, name: str, engine: sa.engine.Engine = None):
+        with (engine or self.engine).connect() as conn:
+            return conn.exec_driver_sql(f'PRAGMA {name}').scalar()
+
+    def indexNames(self, table_name: str) -> set:
+        return {index['name'] for index in sa.inspect(self.engine).get_indexes(table_name)}
+
+    def testStartAndStop(self):
+        fast_import = database.SqliteFastImport(self.engine)
+        fast_import.start()
+
+        self.assertIsNot(fast_import.engine(), self.engine)
+        self.assertEqual(self.pragma('journal_mode'), 'wal')
+        self.assertEqual(self.pragma('synchronous', fast_import.engine()), 1)
+        self.assertEqual(self.pragma('synchronous'), 2)
+        self.assertEqual(self.indexNames('base_account'), set())
+        self.assertIn('ix_base_account_statement_id', [index.name for index in fast_import.droppedIndexes()])
+
+        self.assertTrue(fast_import.stop())
+
+        self.assertIs(fast_import.engine(), self.engine)
+        self.assertEqual(self.pragma('journal_mode'), 'delete')
+        self.assertEqual(self.indexNames('base_account'), {'ix_base_account_statement_id'})
+        self.assertEqual(fast_import.droppedIndexes(), [])
+
+    def testStopWhileDatabaseIsUsed(self):
+        fast_import = database.SqliteFastImport(self.engine)
+        fast_import.start()
+
+        with self.engine.begin() as conn:
+            conn.execute(sa.select(models.ImportCheckpoint.__table__)).all()
+
+            self.assertFalse(fast_import.stop())
+
+        self.assertFalse(fast_import.isStarted())
+        self.assertEqual(fast_import.journalMode(), 'delete')
+        self.assertEqual(self.pragma('journal_mode'), 'wal')
+
+    def testInMemoryEngineIsIgnored(self):
+        engine = database.createEngineInMemory()
+        engine.echo = False
+
+        fast_import = database.SqliteFastImport(engine)
+        fast_import.start()
+
+        self.assertFalse(fast_import.isStarted())
@@ -0,0 +1,117 @@
+import cvm
+import os
+import shutil
+import tempfile
+import unittest
+import sqlalchemy     as sa
+import sqlalchemy.orm as sa_orm
+from investint           import database
+from investint.importing import DocumentBulkLoader, deleteReplacedRows
+from investint.models    import PublicCompany, Document, Statement, BaseAccount, Account
+from tests.helpers       import createCompany, createDocument
+
+class TestStagingDatabase(unittest.TestCase):
+    def setUp(self):
+        self.staging = database.StagingDatabase()
+        self.staging.engine().echo = False
+
+    def tearDown(self):
+        self.staging.dispose()
+
+    def stage(self, *documents: Document):
+        with sa_orm.Session(self.staging.engine(), future=True) as session:
+            loader = DocumentBulkLoader(session)
+
+            for doc in documents:
+                loader.add(doc)
+
+            loader.flush()
+            session.commit()
+
+    def testWriteReplacesDocuments(self):
+        engine = sa.create_engine('sqlite://', future=True)
+        database.metadata.create_all(engine)
+
+        with sa_orm.Session(engine, future=True) as session:
+            company = createCompany()
+            session.add(company)
+            session.flush()
+
+            session.add(createDocument(1, company.id, version=1))
+            session.add(createDocument(2, company.id, version=1))
+            session.commit()
+
+            company_id = company.id
+
+        self.stage(createDocument(2, company_id, version=2), createDocument(3, company_id, version=1))
+
+        # 2 documents, 4 statements, 6 base accounts, 4 accounts and 2 DMPL accounts.
+        self.assertEqual(self.staging.writeTo(engine), 18)
+
+        with sa_orm.Session(engine, future=True) as session:
+            versions = dict(session.execute(sa.select(Document.id, Document.version)).all())
+
+            self.assertEqual(versions, {1: 1, 2: 2, 3: 1})
+            self.assertEqual(session.execute(sa.select(sa.func.count()).select_from(Statement)).scalar(), 6)
+            self.assertEqual(session.execute(sa.select(sa.func.count()).select_from(BaseAccount)).scalar(), 9)
+
+            doc = session.get(Document, 2)
+
+            self.assertEqual(doc.company_id, company_id)
+            self.assertEqual(sorted(account.quantity for stmt in doc.statements for account in stmt.accounts if isinstance(account, Account)), [120, 200])
+
+            doc = session.get(Document, 1)
+
+            self.assertEqual(sorted(account.quantity for stmt in doc.statements for account in stmt.accounts if isinstance(account, Account)), [60, 100])
+
+    def testWriteReplacesStatementTypes(self):
+        engine = sa.create_engine('sqlite://', future=True)
+        database.metadata.create_all(engine)
+
+        with sa_orm.Session(engine, future=True) as session:
+            company = createCompany()
+            session.add(company)
+            session.flush()
+
+            session.add(createDocument(1, company.id, version=1))
+            session.commit()
+
+            company_id = company.id
+
+        doc = createDocument(1, company_id, version=2)
+        doc.statements = [stmt for stmt in doc.statements if stmt.statement_type == cvm.StatementType.BPA]
+
+        self.stage(doc)
+
+        statement_types = frozenset({(cvm.StatementType.BPA, cvm.BalanceType.CONSOLIDATED)})
+        replace         = lambda src_conn, dst_conn: deleteReplacedRows(dst_conn, [(1, False, False)], statement_types)
+
+        # 1 document, 1 statement, 2 base accounts and 2 accounts.
+        self.assertEqual(self.staging.writeTo(engine, replace), 6)
+
+        with sa_orm.Session(engine, future=True) as session:
+            doc = session.get(Document, 1)
+
+            self.assertEqual(doc.version, 2)
+            self.assertEqual(sorted(stmt.statement_type.name for stmt in doc.statements), ['BPA', 'DMPL'])
+            self.assertEqual(sorted(account.quantity for stmt in doc.statements for account in stmt.accounts if isinstance(account, Account)), [120, 200])
+
+    def testWriteToEmptyFile(self):
+        dirpath = tempfile.mkdtemp()
+        engine  = database.createEngineFromFile(os.path.join(dirpath, 'db.sqlite3'))
+        engine.echo = False
+
+        try:
+            database.metadata.create_all(engine)
+
+            with sa_orm.Session(self.staging.engine(), future=True) as session:
+                session.add(createCompany())
+                session.commit()
+
+            self.assertEqual(self.staging.writeTo(engine), 1)
+
+            with sa_orm.Session(engine, future=True) as session:
+                self.assertEqual(session.execute(sa.select(PublicCompany.cnpj)).scalars().all(), ['191'])
+        finally:
+            engine.dispose()
+            shutil.rmtree(dirpath)
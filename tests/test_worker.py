@@ -0,0 +1,49 @@
+import os
+import tempfile
+import typing
+import unittest
+from investint.importing import Worker
+
+class LineWorker(Worker):
+    def readOne(self, obj: typing.Any):
+        self.emitVerboseMessage('Reading ' + obj.strip())
+
+class TestWorker(unittest.TestCase):
+    def setUp(self):
+        fd, self.filepath = tempfile.mkstemp()
+
+        with os.fdopen(fd, 'w') as file:
+            file.write('\n'.join(str(i) for i in range(100)))
+
+    def tearDown(self):
+        os.remove(self.filepath)
+
+    def runWorker(self, worker: Worker) -> typing.Tuple[typing.List[str], typing.List]:
+        messages = []
+        progress = []
+
+        worker.signals().messaged.connect(lambda message, level: messages.append(message))
+        worker.signals().progressed.connect(progress.append)
+        worker.run()
+
+        return messages, progress
+
+    def testProgressIsCoalesced(self):
+        worker = LineWorker(self.filepath)
+        worker.setProgressInterval(3600)
+
+        messages, progress = self.runWorker(worker)
+
+        # Once upon the first object, and once before `finished`.
+        self.assertEqual(len(progress), 2)
+        self.assertEqual(progress[-1].read_count, 100)
+        self.assertEqual(progress[-1].bytes_total, os.path.getsize(self.filepath))
+        self.assertEqual(messages, [])
+
+    def testVerboseMessages(self):
+        worker = LineWorker(self.filepath)
+        worker.setVerbose(True)
+
+        messages, _ = self.runWorker(worker)
+
+        self.assertEqual(len(messages), 100)